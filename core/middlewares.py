@@ -0,0 +1,77 @@
+import logging
+
+from django.core.exceptions import ValidationError
+from request import settings as request_settings
+from request.middleware import RequestMiddleware
+from request.models import Request
+from request.router import Patterns
+from request.utils import request_is_ajax
+
+from core.services.analytics_sink_service import analytics_sink
+
+logger = logging.getLogger('request.security.middleware')
+
+
+class BufferedRequestMiddleware(RequestMiddleware):
+    """Same as django-request RequestMiddleware, but the Request row is written in batch by the
+    analytics sink instead of during the response"""
+
+    def process_response(self, request, response):
+        if not self.should_log(request, response):
+            return response
+
+        r = Request()
+        try:
+            r.from_http_request(request, response, commit=False)
+            r.full_clean()
+        except ValidationError as exc:
+            logger.warning(
+                'Bad request: %s',
+                str(exc),
+                exc_info=exc,
+                extra={'status_code': 400, 'request': request},
+            )
+        else:
+            anonymize_request(r)
+            analytics_sink.add(r)
+
+        return response
+
+    @staticmethod
+    def should_log(request, response) -> bool:
+        if request.method.lower() not in request_settings.VALID_METHOD_NAMES:
+            return False
+
+        if response.status_code < 400 and request_settings.ONLY_ERRORS:
+            return False
+
+        if Patterns(False, *request_settings.IGNORE_PATHS).resolve(request.path[1:]):
+            return False
+
+        if request_is_ajax(request) and request_settings.IGNORE_AJAX:
+            return False
+
+        if request.META.get('REMOTE_ADDR') in request_settings.IGNORE_IP:
+            return False
+
+        if Patterns(False, *request_settings.IGNORE_USER_AGENTS).resolve(
+                request.META.get('HTTP_USER_AGENT', '')):
+            return False
+
+        if getattr(request, 'user', False):
+            if request.user.get_username() in request_settings.IGNORE_USERNAME:
+                return False
+
+        return True
+
+
+def anonymize_request(r: Request):
+    """What Request.save does, which is skipped by bulk_create"""
+    if not request_settings.LOG_IP:
+        r.ip = request_settings.IP_DUMMY
+    elif request_settings.ANONYMOUS_IP:
+        parts = r.ip.split('.')[0:-1]
+        parts.append('1')
+        r.ip = '.'.join(parts)
+    if not request_settings.LOG_USER:
+        r.user = None
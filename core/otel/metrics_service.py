@@ -26,6 +26,16 @@ class MetricsService:
             description="Count of warnings in the application",
         )
 
+        self.analytics_written_counter = meter.create_counter(
+            "analytics.sink.written.count",
+            description="Number of analytics rows written by model",
+        )
+
+        self.analytics_dropped_counter = meter.create_counter(
+            "analytics.sink.dropped.count",
+            description="Number of analytics rows dropped by model and reason",
+        )
+
     def record_response_time(self, elapsed_time, db_time, url_name):
         attributes = {"url_name": url_name}
         self.response_count.add(1, attributes)
@@ -37,5 +47,16 @@ class MetricsService:
             "warning_name": warning_name,
         })
 
+    def increment_analytics_written_counter(self, model_name, count):
+        self.analytics_written_counter.add(count, {
+            "model": model_name,
+        })
+
+    def increment_analytics_dropped_counter(self, model_name, reason, count=1):
+        self.analytics_dropped_counter.add(count, {
+            "model": model_name,
+            "reason": reason,
+        })
+
 
 metrics_service = MetricsService()
@@ -0,0 +1,107 @@
+import atexit
+import queue
+import threading
+from collections import defaultdict
+
+from django.db import close_old_connections, models
+
+from core.otel.metrics_service import metrics_service
+from core.utils.log_utils import log_stack_trace
+
+ANALYTICS_QUEUE_MAX_SIZE = 10_000
+ANALYTICS_BATCH_SIZE = 500
+# Maximum delay before a hit is written to the database
+ANALYTICS_FLUSH_INTERVAL = 2.0
+
+
+class AnalyticsSink:
+    """Buffers analytics rows (request logs, search and autocomplete hits) and writes them
+    with bulk_create from a background thread, outside of the request path.
+    When the database can not keep up, new rows are dropped and counted, instead of
+    slowing down requests."""
+
+    def __init__(self, max_size: int = ANALYTICS_QUEUE_MAX_SIZE,
+                 batch_size: int = ANALYTICS_BATCH_SIZE,
+                 flush_interval: float = ANALYTICS_FLUSH_INTERVAL):
+        self.queue = queue.Queue(maxsize=max_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.thread = None
+        self.lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def add(self, instance: models.Model):
+        self.ensure_flusher_started()
+        try:
+            self.queue.put_nowait(instance)
+        except queue.Full:
+            metrics_service.increment_analytics_dropped_counter(type(instance).__name__,
+                                                                'overflow')
+
+    def ensure_flusher_started(self):
+        # The thread is started lazily, in each process (e.g. after gunicorn forks its workers)
+        if self.thread is not None and self.thread.is_alive():
+            return
+
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='analytics-sink',
+                                               daemon=True)
+                self.thread.start()
+
+    def get_batch(self) -> list[models.Model]:
+        try:
+            batch = [self.queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.get_batch()
+            if batch:
+                self.write_batch(batch)
+
+    def write_batch(self, batch: list[models.Model]):
+        instances_by_model = defaultdict(list)
+        for instance in batch:
+            instances_by_model[type(instance)].append(instance)
+
+        for model, instances in instances_by_model.items():
+            try:
+                model.objects.bulk_create(instances)
+                metrics_service.increment_analytics_written_counter(model.__name__,
+                                                                    len(instances))
+            except Exception:
+                log_stack_trace()
+                metrics_service.increment_analytics_dropped_counter(model.__name__, 'error',
+                                                                    len(instances))
+
+        # Like at the end of a request, the connection of this thread is closed when it is
+        # broken or too old
+        close_old_connections()
+
+    def flush(self):
+        """Writes remaining rows synchronously, e.g. when the process exits"""
+        while batch := self.get_batch_nowait():
+            self.write_batch(batch)
+
+    def get_batch_nowait(self) -> list[models.Model]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+
+analytics_sink = AnalyticsSink()
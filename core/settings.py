@@ -83,7 +83,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "request.middleware.RequestMiddleware",
+    "core.middlewares.BufferedRequestMiddleware",
     'simple_history.middleware.HistoryRequestMiddleware',
 ]
 
@@ -215,6 +215,30 @@ STORAGES = {
     }
 }
 
+# Cache
+# front_api responses are invalidated by indexing workers, so in production the cache must
+# be shared between processes: file (same host) or database (shared, after createcachetable)
+FRONT_API_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'front_api'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache',
+             os.path.join(BASE_DIR, 'local_cache', 'front_api')),
+    'database': ('django.core.cache.backends.db.DatabaseCache', 'front_api_cache'),
+}
+FRONT_API_CACHE_BACKEND, FRONT_API_CACHE_LOCATION = \
+    FRONT_API_CACHE_BACKENDS[os.getenv('FRONT_API_CACHE_BACKEND', 'file')]
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'front_api': {
+        'BACKEND': FRONT_API_CACHE_BACKEND,
+        'LOCATION': os.getenv('FRONT_API_CACHE_LOCATION') or FRONT_API_CACHE_LOCATION,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
 # Background task
 MAX_ATTEMPTS = 2
 MAX_RUN_TIME = 40 * 60  # 40 minutes
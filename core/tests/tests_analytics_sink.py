@@ -0,0 +1,90 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from core.services.analytics_sink_service import AnalyticsSink
+
+
+class FakeManager:
+    def __init__(self):
+        self.batches = []
+        self.fails = False
+
+    def bulk_create(self, instances):
+        if self.fails:
+            raise ValueError('database is down')
+
+        self.batches.append(instances)
+
+
+class FakeHit:
+    objects = FakeManager()
+
+
+@patch('core.services.analytics_sink_service.close_old_connections')
+@patch('core.services.analytics_sink_service.metrics_service')
+class TestAnalyticsSink(unittest.TestCase):
+    def setUp(self):
+        FakeHit.objects = FakeManager()
+
+    @staticmethod
+    def build_sink(**kwargs) -> AnalyticsSink:
+        with patch('atexit.register'):
+            return AnalyticsSink(**kwargs)
+
+    def test_batching(self, metrics_service, _close_old_connections):
+        sink = self.build_sink(batch_size=3, flush_interval=0.01)
+        hits = [FakeHit() for _ in range(7)]
+        for hit in hits:
+            sink.queue.put_nowait(hit)
+
+        self.assertEqual(sink.get_batch(), hits[:3])
+        sink.flush()
+        self.assertEqual(FakeHit.objects.batches, [hits[3:6], hits[6:]])
+        self.assertEqual(sink.get_batch(), [])
+        metrics_service.increment_analytics_written_counter.assert_called_with('FakeHit', 1)
+
+    def test_overflow_is_dropped(self, metrics_service, _close_old_connections):
+        sink = self.build_sink(max_size=2)
+        with patch.object(sink, 'ensure_flusher_started'):
+            for _ in range(3):
+                sink.add(FakeHit())
+
+        self.assertEqual(sink.queue.qsize(), 2)
+        metrics_service.increment_analytics_dropped_counter.assert_called_once_with(
+            'FakeHit', 'overflow')
+
+    def test_error_is_dropped(self, metrics_service, _close_old_connections):
+        sink = self.build_sink()
+        FakeHit.objects.fails = True
+        with patch('core.services.analytics_sink_service.log_stack_trace') as log_stack_trace:
+            sink.write_batch([FakeHit(), FakeHit()])
+
+        log_stack_trace.assert_called_once()
+        metrics_service.increment_analytics_dropped_counter.assert_called_once_with(
+            'FakeHit', 'error', 2)
+
+    def test_flush_on_exit(self, metrics_service, _close_old_connections):
+        with patch('atexit.register') as register:
+            sink = AnalyticsSink()
+        register.assert_called_once_with(sink.flush)
+
+        hit = FakeHit()
+        sink.queue.put_nowait(hit)
+        sink.flush()
+        self.assertEqual(FakeHit.objects.batches, [[hit]])
+
+    def test_background_thread(self, metrics_service, _close_old_connections):
+        sink = self.build_sink(flush_interval=0.01)
+        hit = FakeHit()
+        sink.add(hit)
+
+        deadline = time.time() + 5
+        while not FakeHit.objects.batches and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(FakeHit.objects.batches, [[hit]])
+        self.assertTrue(sink.thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,3 +16,38 @@ async def run_in_sync(func, *args):
     append_to_buffer(buffer_val)
 
     return result
+
+
+async def run_and_get_log(coroutine) -> tuple[any, BaseException | None, str]:
+    """Each asyncio task works on a copy of the log buffer, so we collect it explicitly"""
+    start_log_buffer()
+    result, exception = None, None
+    try:
+        result = await coroutine
+    except Exception as e:
+        exception = e
+    buffer_value, buffer_started_at = get_log_buffer()
+
+    return result, exception, buffer_value
+
+
+async def gather_with_log(*coroutines) -> list:
+    outcomes = await asyncio.gather(*map(run_and_get_log, coroutines))
+
+    for _, _, buffer_value in outcomes:
+        append_to_buffer(buffer_value)
+
+    for _, exception, _ in outcomes:
+        if exception is not None:
+            raise exception
+
+    return [result for result, _, _ in outcomes]
+
+
+def run_with_log(coroutine):
+    result, exception, buffer_value = asyncio.run(run_and_get_log(coroutine))
+    append_to_buffer(buffer_value)
+    if exception is not None:
+        raise exception
+
+    return result
@@ -0,0 +1,94 @@
+import glob
+import os
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from core.management.abstract_command import AbstractCommand
+from crawling.workflows.refine.fix_html import fix_html, fix_html_by_reparsing, \
+    get_tree_signature
+from crawling.workflows.crawl.extract_links import parse_content_links
+from crawling.workflows.crawl.extract_widgets import extract_widgets
+from crawling.workflows.refine.refine_content import refine_confession_content
+from crawling.workflows.scrape.download_refine_and_extract import get_extracted_html_list
+from crawling.workflows.scrape.parsed_page import ParsedPage
+
+HOME_URL = 'https://example.com/'
+
+
+def process_by_parsing_each_time(html: str):
+    get_extracted_html_list(html)
+    parse_content_links(html, HOME_URL, {'example.com'}, set(), {}, set())
+    extract_widgets(html)
+
+
+def process_parsed_page(html: str):
+    parsed_page = ParsedPage.from_html(html)
+    parsed_page.get_links(HOME_URL, {'example.com'}, set(), {}, set())
+    parsed_page.get_widgets()
+    parsed_page.get_extracted_html_list()
+
+
+def get_peak_memory(func, html_list: list[tuple[str, str]]) -> float:
+    tracemalloc.start()
+    peak = 0
+    for _, html in html_list:
+        tracemalloc.reset_peak()
+        func(html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    return peak / (1024 * 1024)
+
+
+class Command(AbstractCommand):
+    help = "Benchmark content refining on html files, e.g. crawling/tests/fixtures"
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='html files or directories')
+        parser.add_argument('-r', '--repeat', help='number of runs', type=int, default=1)
+
+    def handle(self, *args, **options):
+        html_list = []
+        for path in options['paths']:
+            file_paths = sorted(glob.glob(f'{path}/**/*.html', recursive=True)) \
+                if os.path.isdir(path) else [path]
+            for file_path in file_paths:
+                with open(file_path) as f:
+                    html_list.append((file_path, f.read()))
+        self.info(f'Benchmarking refining on {len(html_list)} html files')
+
+        for file_path, html in html_list:
+            expected_soup = fix_html_by_reparsing(BeautifulSoup(html, 'html.parser'))
+            soup = fix_html(BeautifulSoup(html, 'html.parser'))
+            if get_tree_signature(expected_soup) != get_tree_signature(soup):
+                self.error(f'fix_html differs from reparsing for {file_path}')
+
+        durations = {}
+        for name, func in [
+            ('parsing', lambda h: BeautifulSoup(h, 'html.parser')),
+            ('fix_html_by_reparsing', lambda h: fix_html_by_reparsing(
+                BeautifulSoup(h, 'html.parser'))),
+            ('fix_html', lambda h: fix_html(BeautifulSoup(h, 'html.parser'))),
+            ('refine_confession_content', refine_confession_content),
+            ('process_by_parsing_each_time', process_by_parsing_each_time),
+            ('process_parsed_page', process_parsed_page),
+        ]:
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                for _, html in html_list:
+                    func(html)
+            durations[name] = (time.perf_counter() - start) / options['repeat']
+            self.info(f'{name}: {durations[name]:.2f}s')
+
+        for func in [process_by_parsing_each_time, process_parsed_page]:
+            self.info(f'{func.__name__}: peak memory per page '
+                      f'{get_peak_memory(func, html_list):.1f}MB')
+
+        parsed_page_speedup = \
+            durations['process_by_parsing_each_time'] / durations['process_parsed_page']
+        self.success(f'Benchmark done, fix_html is '
+                     f'{durations["fix_html_by_reparsing"] / durations["fix_html"]:.1f}x faster '
+                     f'than reparsing, parsed page is {parsed_page_speedup:.1f}x faster '
+                     f'than parsing each time')
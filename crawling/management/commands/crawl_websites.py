@@ -9,6 +9,7 @@ from core.utils.log_utils import start_log_buffer
 from crawling.models import CrawlingModeration
 from registry.models.base_moderation_models import ModerationStatus
 from crawling.models import Log as CrawlingLog
+from crawling.services.crawling_schedule_service import get_websites_due_for_crawling
 from crawling.services.website_worker_service import handle_crawl_website
 from crawling.tasks import worker_crawl_website
 from registry.models import Website
@@ -34,6 +35,9 @@ class Command(AbstractCommand):
                             help='only websites with not validated home url moderation')
         parser.add_argument('--no-recent', action="store_true",
                             help='only websites that have not been crawled recently')
+        parser.add_argument('--scheduled', action="store_true",
+                            help='only websites whose next crawl date, given how often their '
+                                 'content changes, has come')
 
     def handle(self, *args, **options):
         if options['name']:
@@ -60,6 +64,8 @@ class Command(AbstractCommand):
                 .filter(Q(last_done_crawl__isnull=True)
                         | Q(last_done_crawl__lt=timezone.now() - timedelta(hours=14))) \
                 .order_by(F('last_done_crawl').asc(nulls_first=True)).all()
+        elif options['scheduled']:
+            websites = get_websites_due_for_crawling()
         else:
             websites = Website.objects.filter(is_active=True) \
                 .annotate(
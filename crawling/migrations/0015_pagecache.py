@@ -0,0 +1,37 @@
+# Generated by Django 5.2.13 on 2026-10-18 16:40
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawling', '0014_alter_crawlingmoderation_status_and_more'),
+        ('registry', '0012_alter_churchmoderation_status_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageCache',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('url', models.URLField(max_length=300)),
+                ('etag', models.CharField(blank=True, max_length=300, null=True)),
+                ('last_modified', models.CharField(blank=True, max_length=100, null=True)),
+                ('content_hash', models.CharField(max_length=32)),
+                ('extracted_html_list', models.JSONField(blank=True, null=True)),
+                ('extracted_at', models.DateTimeField()),
+                ('links', models.JSONField(blank=True, null=True)),
+                ('widgets', models.JSONField(default=list)),
+                ('context_hash', models.CharField(blank=True, max_length=32, null=True)),
+                ('website', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='page_caches', to='registry.website')),
+            ],
+            options={
+                'unique_together': {('website', 'url')},
+            },
+        ),
+    ]
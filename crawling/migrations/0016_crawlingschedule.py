@@ -0,0 +1,29 @@
+# Generated by Django 5.2.13 on 2026-10-18 17:30
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawling', '0015_pagecache'),
+        ('registry', '0012_alter_churchmoderation_status_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlingSchedule',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('change_rate', models.FloatField()),
+                ('nb_crawls', models.PositiveIntegerField(default=0)),
+                ('content_hash', models.CharField(blank=True, max_length=32, null=True)),
+                ('next_crawl_date', models.DateField(db_index=True)),
+                ('website', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='crawling_schedule', to='registry.website')),
+            ],
+        ),
+    ]
@@ -17,6 +17,23 @@ class Scraping(TimeStampMixin):
         unique_together = ('url', 'website')
 
 
+class PageCache(TimeStampMixin):
+    website = models.ForeignKey('registry.Website', on_delete=models.CASCADE,
+                                related_name='page_caches')
+    url = models.URLField(max_length=300)
+    etag = models.CharField(max_length=300, null=True, blank=True)
+    last_modified = models.CharField(max_length=100, null=True, blank=True)
+    content_hash = models.CharField(max_length=32)
+    extracted_html_list = models.JSONField(null=True, blank=True)
+    extracted_at = models.DateTimeField()
+    links = models.JSONField(null=True, blank=True)
+    widgets = models.JSONField(default=list)
+    context_hash = models.CharField(max_length=32, null=True, blank=True)
+
+    class Meta:
+        unique_together = ('website', 'url')
+
+
 class WebsiteForbiddenPath(TimeStampMixin):
     website = models.ForeignKey('registry.Website', on_delete=models.CASCADE,
                                 related_name='forbidden_paths')
@@ -48,6 +65,15 @@ class Log(TimeStampMixin):
     nb_success_links = models.PositiveSmallIntegerField(null=True, blank=True)
 
 
+class CrawlingSchedule(TimeStampMixin):
+    website = models.OneToOneField('registry.Website', on_delete=models.CASCADE,
+                                   related_name='crawling_schedule')
+    change_rate = models.FloatField()
+    nb_crawls = models.PositiveIntegerField(default=0)
+    content_hash = models.CharField(max_length=32, null=True, blank=True)
+    next_crawl_date = models.DateField(db_index=True)
+
+
 class CrawlingModeration(ModerationMixin):
     class Category(models.TextChoices):
         NO_RESPONSE = "no_resp"
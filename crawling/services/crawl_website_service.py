@@ -2,12 +2,14 @@ from core.utils.log_utils import info
 from crawling.models import CrawlingModeration
 from crawling.services.crawling_moderation_service import upsert_crawling_moderation, \
     get_crawling_moderation_category
+from crawling.services.page_cache_service import get_cached_page_by_url, replace_cached_pages
 from crawling.services.scrape_scraping_service import upsert_extracted_html_list, create_scraping
 from crawling.services.scraping_service import delete_scraping
 from crawling.services.widget_extraction_service import process_extracted_widgets
 from crawling.utils.url_utils import get_path, get_domain, have_similar_domain
-from crawling.workflows.crawl.download_and_search_urls import search_for_confession_pages, \
-    get_new_url_and_aliases, forbid_diocese_home_links, CrawlingResult, is_new_url_valid
+from crawling.workflows.crawl.download_and_search_urls import \
+    search_for_confession_pages_concurrently, get_new_url_and_aliases, forbid_diocese_home_links, \
+    CrawlingResult, is_new_url_valid
 from registry.models import Website, WebsiteModeration
 from registry.public_service import registry_add_website_moderation, \
     registry_remove_not_validated_moderation
@@ -108,9 +110,15 @@ def do_crawl_website(website: Website) -> CrawlingResult:
         print(f'Adding forbidden path {forbidden_path.path} for website {website.name}')
         forbidden_paths.add(forbidden_path.path)
 
+    # Confession pages found during previous crawling are visited first
+    known_confession_urls = {scraping.url for scraping in website.scrapings.all()}
+
     # Actually crawling website
-    return search_for_confession_pages(new_home_url, aliases_domains, forbidden_outer_paths,
-                                       path_redirection, forbidden_paths)
+    return search_for_confession_pages_concurrently(new_home_url, aliases_domains,
+                                                    forbidden_outer_paths, path_redirection,
+                                                    forbidden_paths,
+                                                    get_cached_page_by_url(website),
+                                                    known_confession_urls)
 
 
 def crawl_website(
@@ -126,6 +134,7 @@ def crawl_website(
 
     process_extracted_html(website, crawling_result)
     process_extracted_widgets(website, crawling_result.widgets)
+    replace_cached_pages(website, crawling_result.cached_pages)
 
     category = add_crawling_moderation(website, crawling_result)
     return category, crawling_result
@@ -0,0 +1,39 @@
+from django.db.models import Q, F, QuerySet
+
+from core.utils.log_utils import info
+from crawling.models import CrawlingSchedule
+from crawling.workflows.crawl.download_and_search_urls import CrawlingResult
+from crawling.workflows.crawl.recrawl_schedule import get_crawling_result_hash, \
+    get_new_change_rate, get_next_crawl_date
+from registry.models import Website
+from scheduling.utils.date_utils import get_current_day
+
+
+def update_crawling_schedule(website: Website, crawling_result: CrawlingResult):
+    content_hash = get_crawling_result_hash(crawling_result)
+    today = get_current_day()
+
+    try:
+        crawling_schedule = website.crawling_schedule
+        has_changed = content_hash != crawling_schedule.content_hash
+        change_rate = get_new_change_rate(crawling_schedule.change_rate, has_changed)
+    except CrawlingSchedule.DoesNotExist:
+        crawling_schedule = CrawlingSchedule(website=website)
+        change_rate = get_new_change_rate(None, None)
+
+    crawling_schedule.change_rate = change_rate
+    crawling_schedule.nb_crawls += 1
+    crawling_schedule.content_hash = content_hash
+    crawling_schedule.next_crawl_date = get_next_crawl_date(change_rate, today)
+    crawling_schedule.save()
+
+    info(f'Website {website.name} {website.uuid} has change rate {change_rate:.2f}, '
+         f'next crawl on {crawling_schedule.next_crawl_date}')
+
+
+def get_websites_due_for_crawling() -> QuerySet[Website]:
+    """Active websites never crawled, or whose next crawl date has come, most late first"""
+    return Website.objects.filter(is_active=True) \
+        .filter(Q(crawling_schedule__isnull=True)
+                | Q(crawling_schedule__next_crawl_date__lte=get_current_day())) \
+        .order_by(F('crawling_schedule__next_crawl_date').asc(nulls_first=True)).all()
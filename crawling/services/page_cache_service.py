@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from crawling.models import PageCache
+from crawling.workflows.download.download_content import PageValidators
+from crawling.workflows.scrape.page_cache import CachedPage
+from registry.models import Website
+
+# Even if a page does not change, we want to refresh its extraction from time to time,
+# e.g. when extraction code has changed
+PAGE_CACHE_MAX_AGE = timedelta(days=30)
+SCRAPED_PAGE_FIELDS = ['etag', 'last_modified', 'content_hash', 'extracted_html_list',
+                       'extracted_at', 'updated_at']
+CRAWLED_PAGE_FIELDS = SCRAPED_PAGE_FIELDS + ['links', 'widgets', 'context_hash']
+
+
+def to_cached_page(page_cache: PageCache) -> CachedPage:
+    return CachedPage(
+        url=page_cache.url,
+        validators=PageValidators(
+            etag=page_cache.etag,
+            last_modified=page_cache.last_modified,
+        ),
+        content_hash=page_cache.content_hash,
+        extracted_html_list=page_cache.extracted_html_list,
+        extracted_at=page_cache.extracted_at,
+        links=page_cache.links,
+        widgets=page_cache.widgets,
+        context_hash=page_cache.context_hash,
+    )
+
+
+def from_cached_page(website: Website, cached_page: CachedPage) -> PageCache:
+    return PageCache(
+        website=website,
+        url=cached_page.url,
+        etag=cached_page.validators.etag,
+        last_modified=cached_page.validators.last_modified,
+        content_hash=cached_page.content_hash,
+        extracted_html_list=cached_page.extracted_html_list,
+        extracted_at=cached_page.extracted_at or timezone.now(),
+        links=cached_page.links,
+        widgets=[widget.model_dump() for widget in cached_page.widgets],
+        context_hash=cached_page.context_hash,
+    )
+
+
+def get_cached_page_by_url(website: Website) -> dict[str, CachedPage]:
+    page_caches = website.page_caches.filter(
+        extracted_at__gte=timezone.now() - PAGE_CACHE_MAX_AGE).all()
+
+    return {page_cache.url: to_cached_page(page_cache) for page_cache in page_caches}
+
+
+def save_cached_pages(website: Website, cached_pages: list[CachedPage],
+                      update_fields: list[str]):
+    PageCache.objects.bulk_create(
+        [from_cached_page(website, cached_page) for cached_page in cached_pages],
+        update_conflicts=True,
+        unique_fields=['website', 'url'],
+        update_fields=update_fields,
+    )
+
+
+def save_scraped_pages(website: Website, cached_pages: list[CachedPage]):
+    """Scraping does not look for links and widgets. The ones found during the crawl are kept,
+    unless the content of the page has changed since, and they are outdated."""
+    save_cached_pages(website, [cached_page for cached_page in cached_pages
+                                if cached_page.links is not None], SCRAPED_PAGE_FIELDS)
+    save_cached_pages(website, [cached_page for cached_page in cached_pages
+                                if cached_page.links is None], CRAWLED_PAGE_FIELDS)
+
+
+def replace_cached_pages(website: Website, cached_pages: list[CachedPage]):
+    save_cached_pages(website, cached_pages, CRAWLED_PAGE_FIELDS)
+
+    # Pages that have not been reached during the crawl are not worth caching anymore
+    website.page_caches.exclude(url__in=[cached_page.url for cached_page in cached_pages]) \
+        .delete()
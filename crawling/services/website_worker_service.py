@@ -1,12 +1,15 @@
 from core.utils.log_utils import info, log_stack_trace
 from crawling.models import Log, CrawlingModeration
 from crawling.services.crawl_website_service import crawl_website
+from crawling.services.crawling_schedule_service import update_crawling_schedule
 from crawling.services.log_service import save_buffer
+from crawling.services.page_cache_service import get_cached_page_by_url, save_scraped_pages
 from crawling.services.scrape_scraping_service import upsert_extracted_html_list
 from crawling.services.scraping_service import delete_scraping
 from crawling.tasks import worker_crawl_website
 from crawling.workflows.crawl.download_and_search_urls import CrawlingTimeoutError
-from crawling.workflows.scrape.download_refine_and_extract import get_fresh_extracted_html_list
+from crawling.workflows.scrape.download_refine_and_extract import \
+    get_fresh_extracted_html_list_with_cache
 from registry.models import Website
 from scheduling.public_service import scheduling_init_scheduling
 
@@ -43,6 +46,7 @@ def handle_crawl_website(website: Website):
             info(crawling_result.error_detail)
 
     scheduling_init_scheduling(website)
+    update_crawling_schedule(website, crawling_result)
     save_buffer(website, Log.Type.CRAWLING,
                 error_detail=crawling_result.error_detail,
                 nb_visited_links=crawling_result.visited_links_count,
@@ -56,11 +60,16 @@ def handle_crawl_website(website: Website):
 def handle_scrape_page(website: Website):
     info(f'Starting to scrape website {website.name} {website.uuid}')
     needs_complete_recrawl = False
+    cached_page_by_url = get_cached_page_by_url(website)
+    cached_pages = []
 
     for scraping in website.scrapings.all():
         if website.enabled_for_crawling:
             # Actually do the scraping
-            extracted_html_list = get_fresh_extracted_html_list(scraping.url)
+            extracted_html_list, cached_page = get_fresh_extracted_html_list_with_cache(
+                scraping.url, cached_page_by_url.get(scraping.url))
+            if cached_page is not None:
+                cached_pages.append(cached_page)
         else:
             extracted_html_list = []
 
@@ -77,6 +86,8 @@ def handle_scrape_page(website: Website):
         upsert_extracted_html_list(scraping, extracted_html_list)
         info(f'Successfully scraped scraping {scraping.url} {scraping.uuid}')
 
+    save_scraped_pages(website, cached_pages)
+
     if needs_complete_recrawl:
         worker_crawl_website(str(website.uuid), None)
     else:
@@ -0,0 +1,169 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from crawling.workflows.crawl.crawling_frontier import CrawlingFrontier, get_link_score
+from crawling.workflows.crawl.download_and_search_urls import init_crawling_state, \
+    CrawlingTimeoutError, ConcurrentFrontier, crawl_pages_worker
+from crawling.workflows.download.download_content import DownloadedPage
+from crawling.workflows.scrape.page_cache import CachedPage
+
+HOME_URL = 'https://www.paroisse.fr/'
+ALIASES_DOMAINS = {'www.paroisse.fr'}
+
+
+def build_page(url: str, links: set[str], extracted_html_list: list[str] | None = None
+               ) -> CachedPage:
+    return CachedPage(url=url, content_hash=url, extracted_html_list=extracted_html_list,
+                      links=sorted(links))
+
+
+class TestCrawlingFrontier(unittest.TestCase):
+    def test_get_link_score(self):
+        self.assertEqual(get_link_score('https://www.paroisse.fr/sacrement-de-reconciliation'), 2)
+        self.assertEqual(get_link_score('https://www.paroisse.fr/confessions/'), 2)
+        self.assertEqual(get_link_score('https://www.paroisse.fr/confessions/horaires'), 1)
+        self.assertEqual(get_link_score('https://www.paroisse.fr/contact'), 0)
+
+    def test_priority(self):
+        frontier = CrawlingFrontier(known_links={'https://www.paroisse.fr/page-123'})
+        frontier.push('https://www.paroisse.fr/contact', depth=1)
+        frontier.push('https://www.paroisse.fr/a/b/horaires', depth=3)
+        frontier.push('https://www.paroisse.fr/horaires', depth=1)
+        frontier.push('https://www.paroisse.fr/confessions', depth=2)
+        frontier.push('https://www.paroisse.fr/page-123', depth=2)
+        frontier.push('https://www.paroisse.fr/horaires', depth=0)
+
+        self.assertEqual(len(frontier), 5)
+        self.assertTrue(frontier.has_high_score_link())
+        self.assertEqual([frontier.pop() for _ in range(len(frontier))], [
+            'https://www.paroisse.fr/page-123',
+            'https://www.paroisse.fr/confessions',
+            'https://www.paroisse.fr/horaires',
+            'https://www.paroisse.fr/a/b/horaires',
+            'https://www.paroisse.fr/contact',
+        ])
+        self.assertFalse(frontier.has_high_score_link())
+
+    def test_early_termination(self):
+        known_url = 'https://www.paroisse.fr/page-123'
+        state = init_crawling_state(HOME_URL, ALIASES_DOMAINS, set(), {}, set(), None,
+                                    {known_url, 'https://www.other.fr/confessions'})
+        self.assertEqual(state.links_to_visit.known_links, {known_url})
+
+        self.assertEqual(state.pop_link_to_visit(), HOME_URL)
+        state.add_page_result(build_page(HOME_URL, {
+            known_url,
+            'https://www.paroisse.fr/horaires',
+            'https://www.paroisse.fr/confession',
+        }))
+        self.assertEqual(state.pop_link_to_visit(), known_url)
+        state.add_page_result(build_page(known_url, set(), ['<p>Confessions le samedi</p>']))
+
+        # A new link looks like a confession page, it must be visited
+        self.assertTrue(state.has_link_to_visit())
+        self.assertEqual(state.pop_link_to_visit(), 'https://www.paroisse.fr/confession')
+        state.add_page_result(build_page('https://www.paroisse.fr/confession', set()))
+
+        self.assertFalse(state.has_link_to_visit())
+        self.assertEqual(len(state.links_to_visit), 1)
+        self.assertEqual(state.get_crawling_result().visited_links_count, 3)
+
+    def test_no_early_termination_when_known_page_is_gone(self):
+        known_url = 'https://www.paroisse.fr/page-123'
+        state = init_crawling_state(HOME_URL, ALIASES_DOMAINS, set(), {}, set(), None,
+                                    {known_url})
+        state.pop_link_to_visit()
+        state.add_page_result(build_page(HOME_URL, {'https://www.paroisse.fr/horaires'}))
+        state.pop_link_to_visit()
+        state.add_page_result(build_page(known_url, set()))
+
+        self.assertTrue(state.has_link_to_visit())
+
+    def test_no_early_termination_without_known_pages(self):
+        state = init_crawling_state(HOME_URL, ALIASES_DOMAINS, set(), {}, set(), None, None)
+        state.pop_link_to_visit()
+        state.add_page_result(build_page(HOME_URL, {'https://www.paroisse.fr/horaires'}))
+
+        self.assertTrue(state.has_link_to_visit())
+
+    def test_cached_links_with_other_path_redirection(self):
+        state = init_crawling_state(HOME_URL, ALIASES_DOMAINS, set(), {}, set(), None, None)
+        cached_page = build_page(HOME_URL, {'https://www.paroisse.fr/horaires'})
+        cached_page.context_hash = state.context_hash
+
+        state.cached_page_by_url = {HOME_URL: cached_page}
+        self.assertEqual(state.get_cached_page(HOME_URL), cached_page)
+
+        # Links found with another path redirection must be computed again
+        state = init_crawling_state(HOME_URL, ALIASES_DOMAINS, set(), {'/fr/': '/'}, set(),
+                                    {HOME_URL: cached_page}, None)
+        self.assertIsNone(state.get_cached_page(HOME_URL))
+
+
+CONFESSION_HTML = '<p>Confessions le samedi de 10h à 12h à l\'église</p>'
+WEBSITE_HTML_BY_URL = {
+    HOME_URL: '<a href="/horaires">Horaires</a><a href="/agenda">Agenda</a>',
+    'https://www.paroisse.fr/horaires': '<a href="/confessions">Confessions</a>',
+    'https://www.paroisse.fr/agenda': '<p>Messe le dimanche</p>',
+    'https://www.paroisse.fr/confessions': CONFESSION_HTML,
+}
+
+
+async def fake_download_page_async(url, client, validators=None) -> DownloadedPage | None:
+    # The home page is slow: other workers must wait for its links instead of stopping
+    await asyncio.sleep(0.05 if url == HOME_URL else 0)
+    html_content = WEBSITE_HTML_BY_URL.get(url)
+    if html_content is None:
+        return None
+
+    return DownloadedPage(content=html_content)
+
+
+async def run_directly(func, *args):
+    # Instead of run_in_sync, whose log buffer needs django settings
+    return func(*args)
+
+
+async def crawl_with_workers(frontier: ConcurrentFrontier, deadline: float,
+                             nb_workers: int = 3):
+    await asyncio.wait_for(asyncio.gather(*[
+        crawl_pages_worker(frontier, None, deadline, HOME_URL, ALIASES_DOMAINS, set(), {},
+                           set())
+        for _ in range(nb_workers)
+    ]), timeout=10)
+
+
+@patch('crawling.workflows.crawl.download_and_search_urls.download_page_async',
+       fake_download_page_async)
+@patch('crawling.workflows.crawl.download_and_search_urls.run_in_sync', run_directly)
+class TestConcurrentCrawling(unittest.TestCase):
+    @staticmethod
+    def build_frontier() -> ConcurrentFrontier:
+        return ConcurrentFrontier(
+            init_crawling_state(HOME_URL, ALIASES_DOMAINS, set(), {}, set(), None, None))
+
+    def test_workers_stop_when_no_link_is_left(self):
+        frontier = self.build_frontier()
+        asyncio.run(crawl_with_workers(frontier, time.time() + 10))
+
+        self.assertEqual(frontier.nb_pages_in_progress, 0)
+        crawling_result = frontier.state.get_crawling_result()
+        self.assertEqual(crawling_result.visited_links_count, len(WEBSITE_HTML_BY_URL))
+        self.assertEqual(list(crawling_result.confession_pages),
+                         ['https://www.paroisse.fr/confessions'])
+        self.assertIsNone(crawling_result.error_detail)
+
+    def test_crawling_timeout(self):
+        frontier = self.build_frontier()
+        with self.assertRaises(CrawlingTimeoutError):
+            asyncio.run(crawl_with_workers(frontier, time.time() - 1))
+
+        # The link is released, waiting workers are not blocked
+        self.assertEqual(frontier.nb_pages_in_progress, 0)
+        self.assertEqual(frontier.state.visited_links, {HOME_URL})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+import httpx
+
+from crawling.workflows.download.download_content import read_streamed_content, MAX_SIZE, \
+    count_bad_chars
+
+
+def get_text_by_reading_all(response: httpx.Response) -> str:
+    """Previous implementation, reading the whole body"""
+    text_auto = response.text
+    try:
+        text_cp1252 = response.content.decode("cp1252")
+    except UnicodeDecodeError:
+        return text_auto
+
+    if count_bad_chars(text_cp1252) < count_bad_chars(text_auto):
+        return text_cp1252
+
+    return text_auto
+
+
+class IteratorStream(httpx.SyncByteStream):
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+
+    def __iter__(self):
+        yield from self.chunks
+
+
+class TestDownloadContent(unittest.TestCase):
+    @staticmethod
+    def get_client(body: bytes, headers: dict[str, str], chunk_size: int = 7) -> httpx.Client:
+        def handler(request: httpx.Request) -> httpx.Response:
+            chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+            return httpx.Response(200, headers=headers, stream=IteratorStream(chunks))
+
+        return httpx.Client(transport=httpx.MockTransport(handler))
+
+    def read(self, body: bytes, headers: dict[str, str] | None = None):
+        with self.get_client(body, headers or {}) as client:
+            with client.stream('GET', 'https://www.paroisse.fr/') as r:
+                return read_streamed_content(r)
+
+    def test_text_encoding(self):
+        html = '<p>Confessions à l’église : mercredi 18h – 19h, « réconciliation »</p>'
+        for body, headers in [
+            (html.encode('utf-8'), {}),
+            (html.encode('utf-8'), {'Content-Type': 'text/html; charset=utf-8'}),
+            (html.encode('cp1252'), {}),
+            (html.encode('cp1252'), {'Content-Type': 'text/html; charset=utf-8'}),
+            (html.encode('latin-1', errors='replace'),
+             {'Content-Type': 'text/html; charset=iso-8859-1'}),
+            (b'\x81\x8d' + html.encode('utf-8'), {}),
+            (b'', {}),
+            (b'<p>', {}),
+        ]:
+            with self.subTest():
+                expected_text = get_text_by_reading_all(httpx.Response(200, headers=headers,
+                                                                       content=body))
+                streamed_content = self.read(body, headers)
+                self.assertFalse(streamed_content.is_pdf)
+                self.assertEqual(expected_text, streamed_content.get_text())
+
+    def test_pdf_signature(self):
+        body = b'%PDF-1.4\n' + b'0' * 100
+        streamed_content = self.read(body)
+        self.assertTrue(streamed_content.is_pdf)
+        self.assertEqual(b''.join(streamed_content.pdf_chunks), body)
+
+        streamed_content = self.read(b'0' * 100, {'Content-Type': 'application/pdf'})
+        self.assertTrue(streamed_content.is_pdf)
+
+    def test_too_large(self):
+        self.assertIsNone(self.read(b'0' * (MAX_SIZE + 1)))
+        self.assertIsNone(self.read(b'0', {'Content-Length': str(MAX_SIZE + 1)}))
+        self.assertIsNotNone(self.read(b'0' * MAX_SIZE))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import os
 import unittest
 
 from crawling.workflows.scrape.download_refine_and_extract import get_extracted_html_list
+from crawling.workflows.scrape.parsed_page import ParsedPage, PageAlreadyRefinedError
 from scheduling.utils.string_search import normalize_content, get_words
 from scheduling.workflows.pruning.extract.tag_line import is_schedule_description, \
     is_date_description
@@ -67,6 +68,20 @@ class MyTestCase(unittest.TestCase):
                     self.maxDiff = None
                     self.assertEqual(expected_confession_part, confession_part, msg=file_name)
 
+    def test_parsed_page(self):
+        tests_dir = os.path.dirname(os.path.realpath(__file__))
+        for file_name in self.get_paragraphs_fixtures():
+            with self.subTest():
+                with open(f'{tests_dir}/fixtures/extract/{file_name}.html') as f:
+                    content_html = f.read()
+
+                parsed_page = ParsedPage.from_html(content_html)
+                parsed_page.get_links('https://example.com/', {'example.com'}, set(), {}, set())
+                parsed_page.get_widgets()
+                self.assertEqual(get_extracted_html_list(content_html),
+                                 parsed_page.get_extracted_html_list(), msg=file_name)
+                self.assertRaises(PageAlreadyRefinedError, parsed_page.get_widgets)
+
     def test_get_words(self):
         content = 'Bonjour, les confessions sont à 13h le mardi.'
         expected_words = ['Bonjour', 'les', 'confessions', 'sont', 'à', '13h', 'le', 'mardi']
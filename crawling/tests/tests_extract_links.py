@@ -4,6 +4,7 @@ import unittest
 
 from crawling.workflows.crawl.extract_links import parse_content_links
 from crawling.workflows.download.download_content import get_domain
+from crawling.workflows.scrape.parsed_page import ParsedPage
 
 
 class TestExtractLinks(unittest.TestCase):
@@ -33,6 +34,12 @@ class TestExtractLinks(unittest.TestCase):
                 # print(json.dumps(list(links), indent=2))
                 self.assertSetEqual(links, set(expected_links), f'Failed for {file_name}')
 
+                parsed_page = ParsedPage.from_html(content)
+                links = parsed_page.get_links(home_url, {get_domain(home_url)},
+                                              set(forbidden_outer_paths), {}, set())
+                self.assertSetEqual(links, set(expected_links),
+                                    f'Failed for parsed page {file_name}')
+
 
 if __name__ == '__main__':
     unittest.main()
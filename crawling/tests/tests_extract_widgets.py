@@ -5,6 +5,7 @@ import unittest
 from pydantic import TypeAdapter
 
 from crawling.workflows.crawl.extract_widgets import BaseWidget, extract_widgets
+from crawling.workflows.scrape.parsed_page import ParsedPage
 
 
 class TestExtractLinks(unittest.TestCase):
@@ -30,6 +31,10 @@ class TestExtractLinks(unittest.TestCase):
                 # print(json.dumps(list(result), indent=2))
                 self.assertListEqual(result, expected_result, f'Failed for {file_name}')
 
+                result = ParsedPage.from_html(content).get_widgets()
+                self.assertListEqual(result, expected_result,
+                                     f'Failed for parsed page {file_name}')
+
 
 if __name__ == '__main__':
     unittest.main()
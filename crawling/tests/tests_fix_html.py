@@ -0,0 +1,69 @@
+import glob
+import os
+import unittest
+
+import bs4
+from bs4 import BeautifulSoup
+
+from crawling.workflows.refine.fix_html import fix_html, fix_html_by_reparsing, \
+    get_tree_signature, PrettifiedTreeBuilder, can_rebuild_prettified_tree, \
+    collapse_line_breaks, PRETTIFIED_TREE_BS4_VERSION
+
+
+class TestFixHtml(unittest.TestCase):
+    @staticmethod
+    def fix_html_fixtures():
+        tests_dir = os.path.dirname(os.path.realpath(__file__))
+        return sorted(glob.glob(f'{tests_dir}/fixtures/**/*.html', recursive=True))
+
+    def test_fix_html_is_same_as_reparsing(self):
+        for file_path in self.fix_html_fixtures():
+            with self.subTest(file_path=file_path):
+                with open(file_path) as f:
+                    html = f.read()
+
+                expected_soup = fix_html_by_reparsing(BeautifulSoup(html, 'html.parser'))
+                soup = fix_html(BeautifulSoup(html, 'html.parser'))
+                self.assertEqual(get_tree_signature(expected_soup), get_tree_signature(soup))
+
+                # Elements must be properly linked after rebuilding
+                self.assertEqual(list(expected_soup.strings), list(soup.strings))
+
+    def test_prettified_tree_builder_is_same_as_bs4_parsing(self):
+        # PrettifiedTreeBuilder mimics bs4 internals, this fails if bs4 behaves differently
+        nb_rebuilt_fixtures = 0
+        for file_path in self.fix_html_fixtures():
+            with self.subTest(file_path=file_path):
+                with open(file_path) as f:
+                    html = f.read()
+
+                soup = BeautifulSoup(html, 'html.parser')
+                if not can_rebuild_prettified_tree(soup):
+                    continue
+
+                expected_soup = BeautifulSoup(collapse_line_breaks(str(soup.prettify())),
+                                              'html.parser')
+                soup = PrettifiedTreeBuilder(soup).build()
+                self.assertEqual(get_tree_signature(expected_soup), get_tree_signature(soup))
+                self.assertEqual(list(expected_soup.strings), list(soup.strings))
+                nb_rebuilt_fixtures += 1
+
+        self.assertGreater(nb_rebuilt_fixtures, 0)
+
+    def test_bs4_version_is_pinned(self):
+        # Upgrading bs4 requires checking PrettifiedTreeBuilder against the new version
+        self.assertEqual(PRETTIFIED_TREE_BS4_VERSION, bs4.__version__)
+
+    def test_fix_html_with_broken_void_elements(self):
+        # html.parser does not close a self-closing <meta/> following an unclosed <meta>
+        html = '<head><meta charset="UTF-8"><meta name="a"/>\n<title>\nTitle\n  </title></head>' \
+               '<p>Confessions<br>\n</br>le <b>samedi</b> <!-- comment\n  --></p>'
+
+        expected_soup = fix_html_by_reparsing(BeautifulSoup(html, 'html.parser'))
+        soup = fix_html(BeautifulSoup(html, 'html.parser'))
+        self.assertEqual(get_tree_signature(expected_soup), get_tree_signature(soup))
+        self.assertEqual(expected_soup.prettify(), soup.prettify())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from crawling.workflows.download.http_client import HostLimiter, get_http_client
+
+
+class SetCookieHandler(BaseHTTPRequestHandler):
+    received_cookies = []
+
+    def do_GET(self):  # noqa: N802
+        self.received_cookies.append(self.headers.get('Cookie'))
+        self.send_response(200)
+        self.send_header('Set-Cookie', 'session=abc; Path=/')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpClient(unittest.TestCase):
+    def test_client_is_shared(self):
+        self.assertIs(get_http_client(), get_http_client())
+
+    def test_client_sends_no_cookie(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SetCookieHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f'http://127.0.0.1:{server.server_port}/'
+            get_http_client().get(url)
+            get_http_client().get(url)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(SetCookieHandler.received_cookies, [None, None])
+        self.assertEqual(len(get_http_client().cookies), 0)
+
+    def test_host_limiter(self):
+        host_limiter = HostLimiter(max_concurrent_requests=2, min_delay=0.01)
+        lock = threading.Lock()
+        in_progress_by_host = {'diocese.fr': 0, 'paroisse.fr': 0}
+        max_in_progress_by_host = {'diocese.fr': 0, 'paroisse.fr': 0}
+        start_times = []
+
+        def fake_request(url: str, host: str):
+            with host_limiter.slot(url):
+                with lock:
+                    if host == 'diocese.fr':
+                        start_times.append(time.monotonic())
+                    in_progress_by_host[host] += 1
+                    max_in_progress_by_host[host] = max(max_in_progress_by_host[host],
+                                                        in_progress_by_host[host])
+                time.sleep(0.03)
+                with lock:
+                    in_progress_by_host[host] -= 1
+
+        threads = [threading.Thread(target=fake_request,
+                                    args=(f'https://{host}/page-{i}', host))
+                   for i in range(6) for host in ['diocese.fr', 'paroisse.fr']]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max_in_progress_by_host, {'diocese.fr': 2, 'paroisse.fr': 2})
+        self.assertEqual(host_limiter.in_progress_by_host, {})
+        start_times.sort()
+        for previous_start, start in zip(start_times, start_times[1:]):
+            self.assertGreaterEqual(start - previous_start, 0.009)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from datetime import date
+
+from crawling.workflows.crawl.download_and_search_urls import CrawlingResult
+from crawling.workflows.crawl.recrawl_schedule import get_new_change_rate, \
+    get_next_crawl_date, get_crawling_result_hash, STABLE_CHANGE_RATE, INITIAL_CHANGE_RATE
+
+
+class TestRecrawlSchedule(unittest.TestCase):
+    def test_change_rate(self):
+        self.assertEqual(get_new_change_rate(None, None), INITIAL_CHANGE_RATE)
+
+        change_rate = INITIAL_CHANGE_RATE
+        for _ in range(5):
+            change_rate = get_new_change_rate(change_rate, False)
+        self.assertLess(change_rate, STABLE_CHANGE_RATE)
+
+        self.assertGreater(get_new_change_rate(change_rate, True), change_rate)
+
+    def test_crawling_result_hash(self):
+        crawling_result = CrawlingResult(confession_pages={
+            'https://www.paroisse.fr/confessions': ['<p>Confessions le samedi</p>'],
+            'https://www.paroisse.fr/horaires': ['<p>Messe le dimanche</p>'],
+        })
+        same_result = CrawlingResult(confession_pages=dict(
+            reversed(crawling_result.confession_pages.items())), visited_links_count=3)
+        other_result = CrawlingResult(confession_pages={
+            'https://www.paroisse.fr/confessions': ['<p>Confessions le vendredi</p>'],
+        })
+
+        self.assertEqual(get_crawling_result_hash(crawling_result),
+                         get_crawling_result_hash(same_result))
+        self.assertNotEqual(get_crawling_result_hash(crawling_result),
+                            get_crawling_result_hash(other_result))
+
+    def test_next_crawl_date(self):
+        # Outside of liturgical seasons
+        self.assertEqual(get_next_crawl_date(0.05, date(2025, 6, 2)), date(2025, 6, 9))
+        self.assertEqual(get_next_crawl_date(0.2, date(2025, 6, 2)), date(2025, 6, 5))
+        self.assertEqual(get_next_crawl_date(0.8, date(2025, 6, 2)), date(2025, 6, 4))
+
+        # A few days before Advent (2025-11-30)
+        self.assertEqual(get_next_crawl_date(0.8, date(2025, 11, 20)), date(2025, 11, 21))
+        self.assertEqual(get_next_crawl_date(0.05, date(2025, 11, 10)), date(2025, 11, 17))
+        self.assertEqual(get_next_crawl_date(0.05, date(2025, 11, 27)), date(2025, 11, 30))
+
+        # A few days before Lent (Ash Wednesday 2026-02-18)
+        self.assertEqual(get_next_crawl_date(0.8, date(2026, 2, 10)), date(2026, 2, 11))
+
+
+if __name__ == '__main__':
+    unittest.main()
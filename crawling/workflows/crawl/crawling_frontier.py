@@ -0,0 +1,68 @@
+import heapq
+import itertools
+from dataclasses import dataclass, field
+
+from crawling.utils.url_utils import get_path
+from crawling.workflows.crawl.extract_links import CONFESSIONS_OR_SCHEDULES_MATCHER, \
+    CONFESSIONS_MATCHER
+
+HIGH_LINK_SCORE = 2
+
+
+def get_link_score(link: str) -> int:
+    """2 if the last part of the path is about confessions, 1 if it is about schedules or
+    parish life, 0 if only the text of the link was relevant"""
+    last_part_of_path = get_path(link).rstrip('/').split('/')[-1]
+    if CONFESSIONS_MATCHER.matches(last_part_of_path):
+        return HIGH_LINK_SCORE
+
+    if CONFESSIONS_OR_SCHEDULES_MATCHER.matches(last_part_of_path):
+        return 1
+
+    return 0
+
+
+@dataclass
+class CrawlingFrontier:
+    """Links to visit, by priority: known confession pages and home first, then by score of
+    the link, then by depth (number of clicks from a seed)"""
+    known_links: set[str] = field(default_factory=set)
+    queue: list[tuple[int, int, int, int, str]] = field(default_factory=list)
+    queued_links: set[str] = field(default_factory=set)
+    depth_by_link: dict[str, int] = field(default_factory=dict)
+    high_score_links_count: int = 0
+    counter: itertools.count = field(default_factory=itertools.count)
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def __contains__(self, link: str) -> bool:
+        return link in self.queued_links
+
+    def push(self, link: str, depth: int, is_seed: bool = False):
+        if link in self.queued_links:
+            return
+
+        is_known = is_seed or link in self.known_links
+        score = get_link_score(link)
+        if score >= HIGH_LINK_SCORE:
+            self.high_score_links_count += 1
+
+        self.queued_links.add(link)
+        self.depth_by_link[link] = depth
+        # counter keeps insertion order between links of same priority
+        heapq.heappush(self.queue, (-int(is_known), -score, depth, next(self.counter), link))
+
+    def pop(self) -> str:
+        _, minus_score, _, _, link = heapq.heappop(self.queue)
+        self.queued_links.remove(link)
+        if -minus_score >= HIGH_LINK_SCORE:
+            self.high_score_links_count -= 1
+
+        return link
+
+    def get_depth(self, link: str) -> int:
+        return self.depth_by_link.get(link, 0)
+
+    def has_high_score_link(self) -> bool:
+        return self.high_score_links_count > 0
@@ -1,17 +1,27 @@
+import asyncio
 import time
+from dataclasses import dataclass, field
 
+import httpx
 from pydantic import BaseModel, Field
 
+from core.utils.async_utils import run_in_sync, gather_with_log, run_with_log
 from core.utils.ram_utils import print_memory_usage
-from crawling.utils.url_utils import get_clean_full_url, get_path, get_full_path
+from core.utils.log_utils import info
+from crawling.utils.url_utils import get_clean_full_url, get_path, get_full_path, get_domain
+from crawling.workflows.crawl.crawling_frontier import CrawlingFrontier
 from crawling.workflows.crawl.extract_links import parse_content_links, remove_http_https_duplicate
-from crawling.workflows.crawl.extract_widgets import extract_widgets, BaseWidget
+from crawling.workflows.crawl.extract_widgets import BaseWidget
 from crawling.workflows.download.download_content import get_content_from_url, get_url_aliases, \
-    DOWNLOAD_TIMEOUT
-from crawling.workflows.scrape.download_refine_and_extract import get_extracted_html_list
+    DOWNLOAD_TIMEOUT, download_page_async, DownloadedPage
+from crawling.workflows.download.http_client import build_async_http_client
+from crawling.workflows.scrape.page_cache import CachedPage, get_crawling_context_hash, \
+    get_validators, is_page_unchanged, refresh_cached_page, build_cached_page
+from crawling.workflows.scrape.parsed_page import ParsedPage
 from scheduling.utils.html_utils import split_lines
 
 MAX_VISITED_LINKS = 50
+MAX_CONCURRENT_PAGES = 6
 
 
 class CrawlingResult(BaseModel):
@@ -19,6 +29,7 @@ class CrawlingResult(BaseModel):
     visited_links_count: int = 0
     error_detail: str | None = None
     widgets: list[BaseWidget] = Field(default_factory=list)
+    cached_pages: list[CachedPage] = Field(default_factory=list)
 
 
 def forbid_diocese_home_links(diocese_url: str, aliases_domains: set[str],
@@ -72,69 +83,255 @@ class CrawlingTimeoutError(Exception):
     pass
 
 
-def search_for_confession_pages(home_url, aliases_domains: set[str],
-                                forbidden_outer_paths: set[str],
-                                path_redirection: dict[str, str],
-                                forbidden_paths: set[str]
-                                ) -> CrawlingResult:
-    deadline = time.time() + (1 + MAX_VISITED_LINKS) * (1 + DOWNLOAD_TIMEOUT)
+@dataclass
+class CrawlingState:
+    links_to_visit: CrawlingFrontier
+    visited_links: set[str] = field(default_factory=set)
+    extracted_html_seen: set[str] = field(default_factory=set)
+    content_by_url: dict[str, list[str]] = field(default_factory=dict)
+    all_widgets: list[BaseWidget] = field(default_factory=list)
+    cached_page_by_url: dict[str, CachedPage] = field(default_factory=dict)
+    context_hash: str | None = None
+    cached_pages: list[CachedPage] = field(default_factory=list)
+    known_links_with_content: set[str] = field(default_factory=set)
+
+    def has_found_known_pages(self) -> bool:
+        """True when all known confession pages have been visited again and still have
+        content, and no other link looks like a confession page"""
+        known_links = self.links_to_visit.known_links
+        return bool(known_links) \
+            and known_links <= self.known_links_with_content \
+            and not self.links_to_visit.has_high_score_link()
+
+    def has_link_to_visit(self) -> bool:
+        return len(self.links_to_visit) > 0 and len(self.visited_links) < MAX_VISITED_LINKS \
+            and not self.has_found_known_pages()
+
+    def pop_link_to_visit(self) -> str:
+        link = self.links_to_visit.pop()
+        self.visited_links.add(link)
+
+        return link
+
+    def get_cached_page(self, link: str) -> CachedPage | None:
+        cached_page = self.cached_page_by_url.get(link)
+        if cached_page is None or cached_page.links is None \
+                or cached_page.context_hash != self.context_hash:
+            # The links of this page have not been computed with the current crawling context
+            return None
+
+        return cached_page
+
+    def add_page_result(self, page: CachedPage):
+        self.cached_pages.append(page)
 
-    visited_links = set()
-    links_to_visit = {home_url}
-    extracted_html_seen = set()
+        # Looking if new confession part is found
+        extracted_html_list = page.extracted_html_list
+        if any(extracted_html not in self.extracted_html_seen
+               for extracted_html in extracted_html_list or []):
+            self.content_by_url[page.url] = extracted_html_list
+            self.extracted_html_seen.update(set(extracted_html_list))
+
+        if page.widgets:
+            print(f'found {len(page.widgets)} widgets for {page.url}: {page.widgets}')
+            self.all_widgets.extend(page.widgets)
+
+        if page.url in self.links_to_visit.known_links and extracted_html_list:
+            self.known_links_with_content.add(page.url)
+
+        depth = self.links_to_visit.get_depth(page.url) + 1
+        for new_link in page.links:
+            if new_link not in self.visited_links:
+                self.links_to_visit.push(new_link, depth)
+
+    def get_crawling_result(self) -> CrawlingResult:
+        error_detail = None
+        if len(self.visited_links) == MAX_VISITED_LINKS:
+            error_detail = f'Reached limit of {MAX_VISITED_LINKS} visited links.'
+        elif self.has_found_known_pages() and len(self.links_to_visit) > 0:
+            info(f'Found all known confession pages, stopping after '
+                 f'{len(self.visited_links)} visited links')
+
+        return CrawlingResult(
+            confession_pages=remove_http_https_duplicate(self.content_by_url),
+            visited_links_count=len(self.visited_links),
+            error_detail=error_detail,
+            widgets=self.all_widgets,
+            cached_pages=self.cached_pages,
+        )
+
+
+def get_crawling_deadline() -> float:
+    return time.time() + (1 + MAX_VISITED_LINKS) * (1 + DOWNLOAD_TIMEOUT)
+
+
+def process_page(link: str, downloaded_page: DownloadedPage | None,
+                 cached_page: CachedPage | None,
+                 context_hash: str, home_url: str, aliases_domains: set[str],
+                 forbidden_outer_paths: set[str],
+                 path_redirection: dict[str, str],
+                 forbidden_paths: set[str]
+                 ) -> CachedPage | None:
+    if downloaded_page is None:
+        return None
+
+    if is_page_unchanged(downloaded_page, cached_page):
+        return refresh_cached_page(cached_page, downloaded_page)
+
+    html_content = downloaded_page.content
+    if html_content is None:
+        return None
+
+    print_memory_usage()
+
+    # The html is parsed once, links and widgets are read before refining modifies it
+    parsed_page = ParsedPage.from_html(html_content)
+
+    # Looking for new links to visit
+    new_links = parsed_page.get_links(home_url, aliases_domains, forbidden_outer_paths,
+                                      path_redirection, forbidden_paths)
 
-    error_detail = None
+    # Looking for widgets
+    widgets = parsed_page.get_widgets()
 
-    content_by_url = {}
-    all_widgets = []
-    while len(links_to_visit) > 0 and len(visited_links) < MAX_VISITED_LINKS:
-        if deadline is not None and time.time() > deadline:
-            raise CrawlingTimeoutError()
+    extracted_html_list = parsed_page.get_extracted_html_list()
 
-        print_memory_usage()
+    return build_cached_page(link, downloaded_page, extracted_html_list,
+                             new_links, widgets, context_hash)
 
-        link = links_to_visit.pop()
-        visited_links.add(link)
 
-        html_content = get_content_from_url(link)
-        if html_content is None:
-            # something went wrong (e.g. 404), we just ignore this page
-            print(f'no content for {link}')
+def get_known_links(known_confession_urls: set[str] | None, aliases_domains: set[str],
+                    forbidden_paths: set[str]) -> set[str]:
+    """Previously found confession pages that are still part of the crawled website"""
+    known_links = set()
+    for url in known_confession_urls or set():
+        if get_domain(url) not in aliases_domains:
             continue
 
-        # Looking if new confession part is found
-        extracted_html_list = get_extracted_html_list(html_content)
-        if any(extracted_html not in extracted_html_seen
-               for extracted_html in extracted_html_list or []):
-            content_by_url[link] = extracted_html_list
-            extracted_html_seen.update(set(extracted_html_list))
-
-        # Looking for new links to visit
-        new_links = parse_content_links(html_content, home_url, aliases_domains,
-                                        forbidden_outer_paths, path_redirection,
-                                        forbidden_paths)
-
-        # Looking for widgets
-        widgets = extract_widgets(html_content)
-        if widgets:
-            print(f'found {len(widgets)} widgets for {link}: {widgets}')
-            all_widgets.extend(widgets)
-
-        for new_link in new_links:
-            if new_link not in visited_links:
-                links_to_visit.add(new_link)
-
-    if len(visited_links) == MAX_VISITED_LINKS:
-        error_detail = f'Reached limit of {MAX_VISITED_LINKS} visited links.'
-
-    return CrawlingResult(
-        confession_pages=remove_http_https_duplicate(content_by_url),
-        visited_links_count=len(visited_links),
-        error_detail=error_detail,
-        widgets=all_widgets,
+        if any(get_path(url).startswith(forbidden_path) for forbidden_path in forbidden_paths):
+            continue
+
+        known_links.add(url)
+
+    return known_links
+
+
+def init_crawling_state(home_url, aliases_domains: set[str],
+                        forbidden_outer_paths: set[str],
+                        path_redirection: dict[str, str],
+                        forbidden_paths: set[str],
+                        cached_page_by_url: dict[str, CachedPage] | None,
+                        known_confession_urls: set[str] | None) -> CrawlingState:
+    frontier = CrawlingFrontier(
+        known_links=get_known_links(known_confession_urls, aliases_domains, forbidden_paths))
+    frontier.push(home_url, depth=0, is_seed=True)
+    for known_link in sorted(frontier.known_links):
+        frontier.push(known_link, depth=0)
+
+    return CrawlingState(
+        links_to_visit=frontier,
+        cached_page_by_url=cached_page_by_url or {},
+        context_hash=get_crawling_context_hash(home_url, aliases_domains,
+                                               forbidden_outer_paths, path_redirection,
+                                               forbidden_paths),
     )
 
 
+#######################
+# CONCURRENT CRAWLING #
+#######################
+
+class ConcurrentFrontier:
+    """Hands links to visit to concurrent workers, until no worker can produce new ones"""
+
+    def __init__(self, state: CrawlingState):
+        self.state = state
+        self.nb_pages_in_progress = 0
+        self.condition = asyncio.Condition()
+
+    async def next_link(self) -> str | None:
+        async with self.condition:
+            # Pages in progress can bring new links, or links with a higher priority
+            while not self.state.has_link_to_visit() and self.nb_pages_in_progress > 0:
+                await self.condition.wait()
+
+            if not self.state.has_link_to_visit():
+                return None
+
+            self.nb_pages_in_progress += 1
+            return self.state.pop_link_to_visit()
+
+    async def release_link(self):
+        async with self.condition:
+            self.nb_pages_in_progress -= 1
+            self.condition.notify_all()
+
+
+async def crawl_pages_worker(frontier: ConcurrentFrontier, client: httpx.AsyncClient,
+                             deadline: float, home_url: str, aliases_domains: set[str],
+                             forbidden_outer_paths: set[str],
+                             path_redirection: dict[str, str],
+                             forbidden_paths: set[str]):
+    while (link := await frontier.next_link()) is not None:
+        try:
+            if time.time() > deadline:
+                raise CrawlingTimeoutError()
+
+            cached_page = frontier.state.get_cached_page(link)
+            # requests per host are limited for the whole process in download_page_async
+            downloaded_page = await download_page_async(link, client,
+                                                        get_validators(cached_page))
+            page = await run_in_sync(
+                process_page, link, downloaded_page, cached_page, frontier.state.context_hash,
+                home_url, aliases_domains, forbidden_outer_paths, path_redirection,
+                forbidden_paths)
+            if page is None:
+                # something went wrong (e.g. 404), we just ignore this page
+                print(f'no content for {link}')
+                continue
+
+            frontier.state.add_page_result(page)
+        finally:
+            await frontier.release_link()
+
+
+async def search_for_confession_pages_async(home_url, aliases_domains: set[str],
+                                            forbidden_outer_paths: set[str],
+                                            path_redirection: dict[str, str],
+                                            forbidden_paths: set[str],
+                                            cached_page_by_url: dict[str, CachedPage] | None,
+                                            known_confession_urls: set[str] | None
+                                            ) -> CrawlingResult:
+    deadline = get_crawling_deadline()
+    state = init_crawling_state(home_url, aliases_domains, forbidden_outer_paths,
+                                path_redirection, forbidden_paths, cached_page_by_url,
+                                known_confession_urls)
+    frontier = ConcurrentFrontier(state)
+
+    async with build_async_http_client(MAX_CONCURRENT_PAGES) as client:
+        await gather_with_log(*[
+            crawl_pages_worker(frontier, client, deadline,
+                               home_url, aliases_domains, forbidden_outer_paths,
+                               path_redirection, forbidden_paths)
+            for _ in range(MAX_CONCURRENT_PAGES)
+        ])
+
+    return state.get_crawling_result()
+
+
+def search_for_confession_pages_concurrently(
+        home_url, aliases_domains: set[str],
+        forbidden_outer_paths: set[str],
+        path_redirection: dict[str, str],
+        forbidden_paths: set[str],
+        cached_page_by_url: dict[str, CachedPage] | None = None,
+        known_confession_urls: set[str] | None = None
+) -> CrawlingResult:
+    return run_with_log(search_for_confession_pages_async(
+        home_url, aliases_domains, forbidden_outer_paths, path_redirection, forbidden_paths,
+        cached_page_by_url, known_confession_urls))
+
+
 if __name__ == '__main__':
     # home_url = 'https://www.eglise-saintgermaindespres.fr/'
     # home_url = 'https://www.saintjacquesduhautpas.com/'
@@ -144,9 +341,9 @@ if __name__ == '__main__':
     # home_url_ = 'https://www.espace-saint-ignace.fr/'
     # home_url_ = 'https://www.paroisse-st-martin-largentiere.fr'
     home_url_ = 'https://www.bayonnecentre.fr/'
-    confession_pages = search_for_confession_pages(home_url_,
-                                                   {'www.bayonnecentre.fr'},
-                                                   set(), {}, set())
+    confession_pages = search_for_confession_pages_concurrently(home_url_,
+                                                                {'www.bayonnecentre.fr'},
+                                                                set(), {}, set())
     for cr in confession_pages.confession_pages:
         print(f'url: {cr}')
         for paragraph in confession_pages.confession_pages[cr]:
@@ -6,7 +6,7 @@ from bs4 import element as el
 
 from scheduling.utils.date_utils import get_current_year
 from crawling.workflows.download.download_content import get_url_redirection
-from scheduling.utils.string_search import has_any_of_words
+from scheduling.utils.string_search import LexicalMatcher
 from crawling.utils.string_utils import remove_unsafe_chars
 from crawling.utils.url_utils import is_internal_link, get_clean_full_url, \
     replace_scheme_and_hostname, get_path
@@ -75,11 +75,27 @@ IGNORED_EXTENSIONS = [
 ]
 
 
+CONFESSIONS_OR_SCHEDULES_MATCHER = LexicalMatcher(CONFESSIONS_OR_SCHEDULES_MENTIONS)
+
+# Subset of mentions that are very likely to lead to a confession page
+CONFESSIONS_MENTIONS = [
+    'confession',
+    'confessions',
+    'confesser',
+    'reconciliation',
+    'reconcilier',
+    'penitence',
+    'pardon',
+]
+
+CONFESSIONS_MATCHER = LexicalMatcher(CONFESSIONS_MENTIONS)
+
+
 def might_be_confession_link(path, text):
     last_part_of_path = path.split('/')[-1] if '/' in path else path
 
-    if has_any_of_words(last_part_of_path, CONFESSIONS_OR_SCHEDULES_MENTIONS) \
-            or has_any_of_words(text, CONFESSIONS_OR_SCHEDULES_MENTIONS):
+    if CONFESSIONS_OR_SCHEDULES_MATCHER.matches(last_part_of_path) \
+            or CONFESSIONS_OR_SCHEDULES_MATCHER.matches(text):
         return True
 
     return False
@@ -173,6 +189,11 @@ def get_a_tags(element: el) -> list[el.Tag]:
     return a_tags
 
 
+def get_outermost_a_tags(soup: BeautifulSoup) -> list[el.Tag]:
+    """Same top-level elements as parsing with SoupStrainer('a'), from an already parsed soup"""
+    return [a_tag for a_tag in soup.find_all('a') if a_tag.find_parent('a') is None]
+
+
 def get_links(element: el, home_url: str, aliases_domains: set[str],
               forbidden_outer_paths: set[str],
               path_redirection: dict[str, str],
@@ -252,6 +273,14 @@ def parse_content_links(content, home_url: str, aliases_domains: set[str],
     return links
 
 
+def parse_soup_links(soup: BeautifulSoup, home_url: str, aliases_domains: set[str],
+                     forbidden_outer_paths: set[str], path_redirection: dict[str, str],
+                     forbidden_paths: set[str]
+                     ) -> set[str]:
+    return get_links(get_outermost_a_tags(soup), home_url, aliases_domains,
+                     forbidden_outer_paths, path_redirection, forbidden_paths)
+
+
 def remove_http_https_duplicate(extracted_html_list_by_link: dict[str, list[str]]
                                 ) -> dict[str, list[str]]:
     """If links appear twice in given list with different scheme, we keep only https"""
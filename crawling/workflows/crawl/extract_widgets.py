@@ -15,13 +15,23 @@ class ContactWidget(BaseModel, frozen=True):
 BaseWidget = OClocherWidget | ContactWidget
 
 
-def extract_oclocher_widgets(html: str) -> list[OClocherWidget]:
+def parse_html(html: str) -> BeautifulSoup | None:
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        return BeautifulSoup(html, 'html.parser')
     except Exception as e:
         print(e)
+        return None
+
+
+def extract_oclocher_widgets(html: str) -> list[OClocherWidget]:
+    soup = parse_html(html)
+    if soup is None:
         return []
 
+    return extract_oclocher_widgets_from_soup(soup)
+
+
+def extract_oclocher_widgets_from_soup(soup: BeautifulSoup) -> list[OClocherWidget]:
     widgets = []
 
     for iframes in soup.find_all('iframe'):
@@ -39,12 +49,14 @@ def extract_oclocher_widgets(html: str) -> list[OClocherWidget]:
 
 
 def extract_contact_widgets(html: str) -> list[ContactWidget]:
-    try:
-        soup = BeautifulSoup(html, 'html.parser')
-    except Exception as e:
-        print(e)
+    soup = parse_html(html)
+    if soup is None:
         return []
 
+    return extract_contact_widgets_from_soup(soup)
+
+
+def extract_contact_widgets_from_soup(soup: BeautifulSoup) -> list[ContactWidget]:
     widgets = []
 
     # look for mailto links in the page and extract the email addresses
@@ -64,5 +76,13 @@ def extract_contact_widgets(html: str) -> list[ContactWidget]:
     return list(set(widgets))  # remove duplicates
 
 
+def extract_widgets_from_soup(soup: BeautifulSoup) -> list[BaseWidget]:
+    return extract_oclocher_widgets_from_soup(soup) + extract_contact_widgets_from_soup(soup)
+
+
 def extract_widgets(html: str) -> list[BaseWidget]:
-    return extract_oclocher_widgets(html) + extract_contact_widgets(html)
+    soup = parse_html(html)
+    if soup is None:
+        return []
+
+    return extract_widgets_from_soup(soup)
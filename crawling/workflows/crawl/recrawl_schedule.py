@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+from crawling.workflows.crawl.download_and_search_urls import CrawlingResult
+from scheduling.public_workflow import scheduling_get_season_start_dates
+from scheduling.utils.hash_utils import hash_string_to_hex
+
+# Weight of the last crawl in the change rate (exponential moving average)
+CHANGE_RATE_SMOOTHING = 0.3
+# Before knowing anything about a website, we consider it changes every other crawl
+INITIAL_CHANGE_RATE = 0.5
+STABLE_CHANGE_RATE = 0.1
+VOLATILE_CHANGE_RATE = 0.4
+
+STABLE_RECRAWL_INTERVAL = timedelta(days=7)
+DEFAULT_RECRAWL_INTERVAL = timedelta(days=3)
+VOLATILE_RECRAWL_INTERVAL = timedelta(days=2)
+SEASON_RECRAWL_INTERVAL = timedelta(days=1)
+
+# Parishes publish their confession schedules for Lent or Advent a few weeks in advance
+DAYS_BEFORE_SEASON = 21
+DAYS_AFTER_SEASON_START = 7
+
+
+def get_crawling_result_hash(crawling_result: CrawlingResult) -> str:
+    content = '\n'.join(f'{url}\n' + '\n'.join(extracted_html_list)
+                        for url, extracted_html_list
+                        in sorted(crawling_result.confession_pages.items()))
+
+    return hash_string_to_hex(content)
+
+
+def get_new_change_rate(change_rate: float | None, has_changed: bool | None) -> float:
+    """has_changed is None for the first crawl, when there is nothing to compare with"""
+    if change_rate is None:
+        change_rate = INITIAL_CHANGE_RATE
+
+    if has_changed is None:
+        return change_rate
+
+    return (1 - CHANGE_RATE_SMOOTHING) * change_rate \
+        + CHANGE_RATE_SMOOTHING * float(has_changed)
+
+
+def get_season_start_dates(today: date) -> list[date]:
+    season_start_dates = []
+    for year in [today.year, today.year + 1]:
+        try:
+            season_start_dates.extend(scheduling_get_season_start_dates(year))
+        except ValueError:
+            # Easter day not known yet for this year
+            pass
+
+    return sorted(season_start_dates)
+
+
+def is_in_season_window(today: date, season_start_dates: list[date]) -> bool:
+    for season_start in season_start_dates:
+        if season_start - timedelta(days=DAYS_BEFORE_SEASON) <= today \
+                <= season_start + timedelta(days=DAYS_AFTER_SEASON_START):
+            return True
+
+    return False
+
+
+def get_recrawl_interval(change_rate: float, in_season_window: bool) -> timedelta:
+    if change_rate < STABLE_CHANGE_RATE:
+        return STABLE_RECRAWL_INTERVAL
+
+    if change_rate < VOLATILE_CHANGE_RATE:
+        return DEFAULT_RECRAWL_INTERVAL
+
+    if in_season_window:
+        return SEASON_RECRAWL_INTERVAL
+
+    return VOLATILE_RECRAWL_INTERVAL
+
+
+def get_next_crawl_date(change_rate: float, today: date) -> date:
+    season_start_dates = get_season_start_dates(today)
+    in_season_window = is_in_season_window(today, season_start_dates)
+    next_crawl_date = today + get_recrawl_interval(change_rate, in_season_window)
+
+    # Every website is crawled when a season starts, even the stable ones
+    for season_start in season_start_dates:
+        if today < season_start < next_crawl_date:
+            return season_start
+
+    return next_crawl_date
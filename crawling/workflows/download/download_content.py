@@ -1,11 +1,16 @@
+import codecs
+from dataclasses import dataclass, field
 from typing import Optional
 from urllib.parse import urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 from httpx import HTTPError, Response
+from pydantic import BaseModel, Field
 
+from core.utils.async_utils import run_in_sync
 from core.utils.log_utils import info
+from crawling.workflows.download.http_client import get_http_client, HOST_LIMITER
 from crawling.workflows.refine.pdf_utils import extract_text_from_pdf_bytes
 from crawling.utils.url_utils import get_domain, are_similar_urls, replace_scheme_and_hostname, \
     replace_http_with_https
@@ -18,6 +23,7 @@ TIMEOUT = httpx.Timeout(
     pool=DOWNLOAD_TIMEOUT / 8,
 )
 MAX_SIZE = 1_000_000
+PDF_SIGNATURE = b'%PDF-'
 
 
 def get_headers():
@@ -27,32 +33,6 @@ def get_headers():
     }
 
 
-def get_content_length(url):
-    info(f'getting content length from url {url}')
-
-    headers = get_headers()
-    try:
-        with httpx.Client() as client:
-            r = client.get(url, headers=headers, timeout=TIMEOUT)
-            r.raise_for_status()
-    except httpx.HTTPError as e:
-        info(e)
-        return None
-
-    content_length = r.headers.get('Content-Length')
-    if not content_length:
-        total_size = 0
-        for chunk in r.iter_bytes(chunk_size=8192):
-            total_size += len(chunk)
-            if total_size > MAX_SIZE:
-                info("File size exceeds limit. Download aborted.")
-                return None
-
-        return total_size
-
-    return int(content_length)
-
-
 def count_bad_chars(content: str) -> int:
     if not content:
         return 0
@@ -60,15 +40,13 @@ def count_bad_chars(content: str) -> int:
     return content.count('�')
 
 
-def get_text_with_right_encoding(response: Response) -> str:
+def choose_text_encoding(text_auto: str, text_cp1252: str | None) -> str:
     """
     Example of url with misleading encoding:
     https://www.paroisses-cote-de-jade.fr/horaires_des_messes_et_permanences_519.htm
     """
-    text_auto = response.text
-    try:
-        text_cp1252 = response.content.decode("cp1252")
-    except UnicodeDecodeError:
+    if text_cp1252 is None:
+        # content is not valid cp1252
         return text_auto
 
     if count_bad_chars(text_cp1252) < count_bad_chars(text_auto):
@@ -77,39 +55,211 @@ def get_text_with_right_encoding(response: Response) -> str:
     return text_auto
 
 
-def get_content_from_url(url: str) -> str | None:
-    # Handle heavy pdf files
-    if url.endswith('.pdf'):
-        content_length = get_content_length(url)
-        if content_length is None:
-            info(f'could not get content length from url {url}')
-            return None
-
-        if content_length > MAX_SIZE:
-            info(f'content length is {content_length}, too large (>1MB)')
-            return None
+class ContentTooLargeError(Exception):
+    pass
+
+
+def has_pdf_signature(first_bytes: bytes) -> bool:
+    return first_bytes.lstrip()[:len(PDF_SIGNATURE)] == PDF_SIGNATURE
+
+
+@dataclass
+class StreamedContent:
+    """Body of a response, consumed chunk by chunk as it arrives: html is decoded on the fly
+    (with both the declared encoding and cp1252), only pdf bytes are kept"""
+    encoding: str
+    is_pdf: bool | None = None
+    size: int = 0
+    head: bytes = b''
+    pdf_chunks: list[bytes] = field(default_factory=list)
+    text_parts: list[str] = field(default_factory=list)
+    cp1252_parts: list[str] | None = field(default_factory=list)
+    text_decoder: codecs.IncrementalDecoder | None = None
+    cp1252_decoder: codecs.IncrementalDecoder | None = None
+
+    def __post_init__(self):
+        self.text_decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        self.cp1252_decoder = codecs.getincrementaldecoder('cp1252')(errors='strict')
+
+    @classmethod
+    def from_response(cls, r: Response) -> 'StreamedContent':
+        content_length = r.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > MAX_SIZE:
+            raise ContentTooLargeError(f'content length is {content_length}')
+
+        return cls(encoding=r.encoding or 'utf-8', is_pdf=True if is_pdf(r) else None)
+
+    def feed(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > MAX_SIZE:
+            raise ContentTooLargeError(f'content size exceeds {MAX_SIZE}')
+
+        if self.is_pdf is None:
+            # We wait for enough bytes to look for the pdf signature
+            self.head += chunk
+            if len(self.head.lstrip()) < len(PDF_SIGNATURE):
+                return
+
+            chunk, self.head = self.head, b''
+            self.is_pdf = has_pdf_signature(chunk)
+
+        if self.is_pdf:
+            self.pdf_chunks.append(chunk)
         else:
-            info(f'content length is {content_length}')
+            self.decode(chunk)
+
+    def decode(self, chunk: bytes, final: bool = False):
+        self.text_parts.append(self.text_decoder.decode(chunk, final))
+        if self.cp1252_parts is not None:
+            try:
+                self.cp1252_parts.append(self.cp1252_decoder.decode(chunk, final))
+            except UnicodeDecodeError:
+                self.cp1252_parts = None
+
+    def finish(self):
+        if self.is_pdf is None:
+            self.is_pdf = has_pdf_signature(self.head)
+            if self.is_pdf:
+                self.pdf_chunks.append(self.head)
+            else:
+                self.decode(self.head)
+            self.head = b''
+
+        if not self.is_pdf:
+            self.decode(b'', final=True)
+
+    def get_text(self) -> str:
+        text_cp1252 = ''.join(self.cp1252_parts) if self.cp1252_parts is not None else None
+
+        return choose_text_encoding(''.join(self.text_parts), text_cp1252)
+
+    def get_content(self) -> str | None:
+        if self.is_pdf:
+            return extract_text_from_pdf_bytes(b''.join(self.pdf_chunks))
+
+        return self.get_text()
+
+
+def read_streamed_content(r: Response) -> StreamedContent | None:
+    if r.status_code != 200:
+        return None
+
+    try:
+        streamed_content = StreamedContent.from_response(r)
+        for chunk in r.iter_bytes():
+            streamed_content.feed(chunk)
+    except ContentTooLargeError as e:
+        info(f'{e}, too large (>1MB), download aborted')
+        return None
+
+    streamed_content.finish()
+    return streamed_content
 
-    info(f'getting content from url {url}')
 
+async def read_streamed_content_async(r: Response) -> StreamedContent | None:
+    if r.status_code != 200:
+        return None
+
+    try:
+        streamed_content = StreamedContent.from_response(r)
+        async for chunk in r.aiter_bytes():
+            streamed_content.feed(chunk)
+    except ContentTooLargeError as e:
+        info(f'{e}, too large (>1MB), download aborted')
+        return None
+
+    streamed_content.finish()
+    return streamed_content
+
+
+class PageValidators(BaseModel):
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class DownloadedPage(BaseModel):
+    content: str | None = None
+    validators: PageValidators = Field(default_factory=PageValidators)
+    is_not_modified: bool = False
+
+
+def get_conditional_headers(validators: PageValidators | None) -> dict[str, str]:
     headers = get_headers()
+    if validators is not None:
+        if validators.etag:
+            headers['If-None-Match'] = validators.etag
+        if validators.last_modified:
+            headers['If-Modified-Since'] = validators.last_modified
+
+    return headers
+
+
+def get_validators_from_response(r: Response) -> PageValidators:
+    return PageValidators(
+        etag=r.headers.get('ETag'),
+        last_modified=r.headers.get('Last-Modified'),
+    )
+
+
+def get_content_from_url(url: str) -> str | None:
+    downloaded_page = download_page(url)
+    if downloaded_page is None:
+        return None
+
+    return downloaded_page.content
+
+
+def download_page(url: str, validators: PageValidators | None = None) -> DownloadedPage | None:
+    info(f'getting content from url {url}')
+
+    headers = get_conditional_headers(validators)
     try:
-        with httpx.Client() as client:
-            r = client.get(url, headers=headers, timeout=TIMEOUT, follow_redirects=True)
+        with HOST_LIMITER.slot(url), get_http_client().stream(
+                'GET', url, headers=headers, timeout=TIMEOUT, follow_redirects=True) as r:
+            streamed_content = read_streamed_content(r)
     except HTTPError as e:
         info(e)
         return None
 
+    return get_downloaded_page_from_response(r, streamed_content)
+
+
+async def download_page_async(url: str, client: httpx.AsyncClient,
+                              validators: PageValidators | None = None
+                              ) -> DownloadedPage | None:
+    info(f'getting content from url {url}')
+
+    headers = get_conditional_headers(validators)
+    try:
+        async with HOST_LIMITER.slot_async(url), client.stream(
+                'GET', url, headers=headers, timeout=TIMEOUT, follow_redirects=True) as r:
+            streamed_content = await read_streamed_content_async(r)
+    except HTTPError as e:
+        info(e)
+        return None
+
+    # pdf extraction is CPU-bound, we do not block the event loop with it
+    return await run_in_sync(get_downloaded_page_from_response, r, streamed_content)
+
+
+def get_downloaded_page_from_response(r: Response, streamed_content: StreamedContent | None
+                                      ) -> DownloadedPage | None:
+    if r.status_code == 304:
+        info('page has not been modified')
+        return DownloadedPage(validators=get_validators_from_response(r), is_not_modified=True)
+
     if r.status_code != 200:
         info(f'got status code {r.status_code}')
+        return None
 
+    if streamed_content is None:
         return None
 
-    if is_pdf(r):
-        return extract_text_from_pdf_bytes(r.content)
+    content = streamed_content.get_content()
+    if content is None:
+        return None
 
-    return get_text_with_right_encoding(r)
+    return DownloadedPage(content=content, validators=get_validators_from_response(r))
 
 
 def get_meta_refresh_tag_content(soup: BeautifulSoup) -> Optional[str]:
@@ -153,8 +303,9 @@ def get_url_aliases(url, already_seen: set | None = None
 
     headers = get_headers()
     try:
-        with httpx.Client() as client:
-            r = client.get(url, headers=headers, follow_redirects=False, timeout=TIMEOUT)
+        with HOST_LIMITER.slot(url), get_http_client().stream(
+                'GET', url, headers=headers, follow_redirects=False, timeout=TIMEOUT) as r:
+            streamed_content = read_streamed_content(r)
     except HTTPError as e:
         attempt_with_https = replace_http_with_https(url)
         if attempt_with_https:
@@ -169,12 +320,12 @@ def get_url_aliases(url, already_seen: set | None = None
     if r.status_code in [301, 302] and 'location' in r.headers:
         redirect_url = r.headers['location']
     elif r.status_code == 200:
-        if is_pdf(r):
-            # We don't want to parse pdf files
+        if streamed_content is None or streamed_content.is_pdf:
+            # We don't want to parse pdf or too large files
             return aliases, None
 
         try:
-            soup = BeautifulSoup(r.text, 'html.parser')
+            soup = BeautifulSoup(streamed_content.get_text(), 'html.parser')
         except Exception as e:
             info(e)
             return aliases, str(e)
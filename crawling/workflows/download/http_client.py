@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, asynccontextmanager
+from dataclasses import dataclass, field
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from importlib.util import find_spec
+
+import httpx
+
+from crawling.utils.url_utils import get_domain
+
+# Many parishes websites are hosted by their diocese, and crawled by several workers at once
+MAX_CONCURRENT_REQUESTS_PER_HOST = 3
+MIN_DELAY_BETWEEN_REQUESTS_PER_HOST = 0.2
+HOST_SLOT_POLL_INTERVAL = 0.05
+
+LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=30,
+)
+# HTTP/2 needs the optional h2 package
+HTTP2_AVAILABLE = find_spec('h2') is not None
+
+
+###############
+# HOST LIMITS #
+###############
+
+@dataclass
+class HostLimiter:
+    """Limits the number of concurrent requests and the request rate per host, for all threads
+    and event loops of the process"""
+    max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS_PER_HOST
+    min_delay: float = MIN_DELAY_BETWEEN_REQUESTS_PER_HOST
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    in_progress_by_host: Counter = field(default_factory=Counter)
+    next_start_by_host: dict[str, float] = field(default_factory=dict)
+
+    def try_acquire(self, host: str) -> float:
+        """Returns 0 when a slot has been acquired, otherwise the delay before trying again"""
+        with self.lock:
+            if self.in_progress_by_host[host] >= self.max_concurrent_requests:
+                return HOST_SLOT_POLL_INTERVAL
+
+            now = time.monotonic()
+            next_start = self.next_start_by_host.get(host, now)
+            if now < next_start:
+                return next_start - now
+
+            self.in_progress_by_host[host] += 1
+            self.next_start_by_host[host] = now + self.min_delay
+
+            return 0
+
+    def release(self, host: str):
+        with self.lock:
+            self.in_progress_by_host[host] -= 1
+            if self.in_progress_by_host[host] <= 0:
+                del self.in_progress_by_host[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        host = get_domain(url)
+        while (delay := self.try_acquire(host)) > 0:
+            time.sleep(delay)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    @asynccontextmanager
+    async def slot_async(self, url: str):
+        host = get_domain(url)
+        while (delay := self.try_acquire(host)) > 0:
+            await asyncio.sleep(delay)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+
+HOST_LIMITER = HostLimiter()
+
+
+###########
+# CLIENTS #
+###########
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def build_cookieless_jar() -> CookieJar:
+    """A jar that stores no cookie: requests must not depend on the previous ones, e.g. a
+    session or consent cookie of a previous crawl must not change the served page"""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide client: connections (and their DNS resolution and TLS handshake) are kept
+    alive and reused by all threads"""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(limits=LIMITS, http2=HTTP2_AVAILABLE,
+                                       cookies=build_cookieless_jar())
+
+    return _client
+
+
+def build_async_http_client(max_connections: int) -> httpx.AsyncClient:
+    """Async clients are bound to their event loop, hence cannot be shared by the process"""
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=LIMITS.keepalive_expiry,
+    )
+
+    return httpx.AsyncClient(limits=limits, http2=HTTP2_AVAILABLE,
+                             cookies=build_cookieless_jar())
@@ -0,0 +1,249 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+import bs4
+from bs4 import BeautifulSoup, NavigableString, Comment, Doctype, Tag, PageElement
+
+PRETTIFY_LINE_BREAK_REGEX = re.compile(r'\n\s*')
+SAFE_ATTRIBUTE_NAME_REGEX = re.compile(r'[^\s"\'<>/=]+')
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+PRETTIFY_ENCODING = 'utf-8'
+# PrettifiedTreeBuilder mimics bs4 internals, it is only trusted with the pinned version
+PRETTIFIED_TREE_BS4_VERSION = '4.14.2'
+
+
+def collapse_line_breaks(text: str) -> str:
+    return PRETTIFY_LINE_BREAK_REGEX.sub(' ', text)
+
+
+#############
+# REPARSING #
+#############
+
+def fix_html_by_reparsing(soup: BeautifulSoup) -> BeautifulSoup:
+    try:
+        # This is hack to handle broken html
+        pretty_content = soup.prettify()
+        # Remove multiple consecutive spaces
+        pretty_content = collapse_line_breaks(pretty_content)
+        return BeautifulSoup(pretty_content, 'html.parser')
+    except RecursionError:
+        return soup
+
+
+##############
+# REBUILDING #
+##############
+
+def can_rebuild_prettified_tree(soup: BeautifulSoup) -> bool:
+    """Rebuilding only handles what html.parser can produce from a prettified document,
+    without whitespace-preserving tags (<pre>...) and exotic declarations"""
+    if bs4.__version__ != PRETTIFIED_TREE_BS4_VERSION:
+        return False
+
+    for element in soup.descendants:
+        if isinstance(element, Tag):
+            if element.name in soup.builder.preserve_whitespace_tags:
+                return False
+
+            if any(SAFE_ATTRIBUTE_NAME_REGEX.fullmatch(key) is None for key in element.attrs):
+                return False
+        elif type(element) not in (Comment, Doctype) and (element.PREFIX or element.SUFFIX):
+            return False
+
+    return True
+
+
+def get_prettified_attrs(tag: Tag) -> dict:
+    attrs = {}
+    # prettify outputs attributes in alphabetical order
+    for key, value in sorted(tag.attrs.items()):
+        if hasattr(value, 'substitute_encoding'):
+            # e.g. <meta charset>, whose value is replaced by the output encoding
+            value = type(value)(value.substitute_encoding(PRETTIFY_ENCODING))
+
+        if isinstance(value, str):
+            collapsed_value = collapse_line_breaks(value)
+            if collapsed_value != value:
+                value = collapsed_value if type(value) is str else type(value)(collapsed_value)
+
+        attrs[key] = value
+
+    return attrs
+
+
+@dataclass
+class PrettifiedTreeBuilder:
+    """Mimics what BeautifulSoup does when parsing prettified html with html.parser,
+    reusing the existing tags instead of serializing and parsing the whole document again.
+    This includes html.parser quirks, e.g. a void element (<meta>, <br>...) can end up
+    containing the following elements."""
+    soup: BeautifulSoup
+    open_tags: list[Tag] = field(default_factory=list)
+    contents_by_tag: dict[int, list[PageElement]] = field(default_factory=dict)
+    open_tag_counter: Counter = field(default_factory=Counter)
+    string_container_tags: list[Tag] = field(default_factory=list)
+    already_closed_empty_elements: list[str] = field(default_factory=list)
+    current_data: list[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.open_tags.append(self.soup)
+        self.contents_by_tag[id(self.soup)] = []
+
+    def get_current_tag(self) -> Tag:
+        return self.open_tags[-1]
+
+    def append_to_current_tag(self, element: PageElement):
+        self.contents_by_tag[id(self.get_current_tag())].append(element)
+
+    def end_data(self, string_class: type[NavigableString] | None = None):
+        if not self.current_data:
+            return
+
+        data = ''.join(self.current_data)
+        self.current_data = []
+
+        if not data.strip(ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+
+        if string_class is None:
+            string_class = NavigableString
+            if self.string_container_tags:
+                string_class = self.soup.builder.string_containers.get(
+                    self.string_container_tags[-1].name, string_class)
+
+        self.append_to_current_tag(string_class(data))
+
+    def push_tag(self, tag: Tag):
+        self.append_to_current_tag(tag)
+        self.contents_by_tag[id(tag)] = []
+        self.open_tags.append(tag)
+        self.open_tag_counter[tag.name] += 1
+        if tag.name in self.soup.builder.string_containers:
+            self.string_container_tags.append(tag)
+
+    def pop_tag(self):
+        tag = self.open_tags.pop()
+        self.open_tag_counter[tag.name] -= 1
+        if self.string_container_tags and self.string_container_tags[-1] is tag:
+            self.string_container_tags.pop()
+
+    def pop_to_tag(self, name: str):
+        while len(self.open_tags) > 1 and self.open_tag_counter[name]:
+            tag_name = self.get_current_tag().name
+            self.pop_tag()
+            if tag_name == name:
+                break
+
+    def handle_start_tag(self, tag: Tag, self_closing: bool):
+        self.end_data()
+        tag.attrs = get_prettified_attrs(tag)
+        self.push_tag(tag)
+        if tag.can_be_empty_element:
+            if self_closing:
+                self.handle_end_tag(tag.name)
+            else:
+                self.handle_end_tag(tag.name, check_already_closed=False)
+                self.already_closed_empty_elements.append(tag.name)
+
+    def handle_end_tag(self, name: str, check_already_closed: bool = True):
+        if check_already_closed and name in self.already_closed_empty_elements:
+            self.already_closed_empty_elements.remove(name)
+            return
+
+        self.end_data()
+        self.pop_to_tag(name)
+
+    def handle_string(self, element: NavigableString):
+        if isinstance(element, (Comment, Doctype)):
+            self.end_data()
+            self.current_data.append(collapse_line_breaks(element))
+            self.end_data(type(element))
+            self.current_data.append(' ')
+            return
+
+        # NavigableString are stripped by prettify, but ones in script or style are not escaped
+        text = collapse_line_breaks(element.strip())
+        if text:
+            self.current_data.append(text)
+            self.current_data.append(' ')
+
+    def build(self) -> BeautifulSoup:
+        elements = list(self.soup.descendants)
+        tags = [element for element in elements if isinstance(element, Tag)]
+
+        # Same as the event stream of prettify: each element is followed by a line break
+        closing_stack = []
+        for element in elements:
+            while closing_stack and element.parent is not closing_stack[-1]:
+                self.handle_end_tag(closing_stack.pop().name)
+                self.current_data.append(' ')
+
+            if isinstance(element, Tag):
+                if element.is_empty_element:
+                    self.handle_start_tag(element, self_closing=True)
+                else:
+                    self.handle_start_tag(element, self_closing=False)
+                    closing_stack.append(element)
+            else:
+                self.handle_string(element)
+                continue
+
+            self.current_data.append(' ')
+
+        while closing_stack:
+            self.handle_end_tag(closing_stack.pop().name)
+            self.current_data.append(' ')
+        self.end_data()
+
+        for tag in [self.soup] + tags:
+            set_contents(tag, self.contents_by_tag.get(id(tag), []))
+        relink_elements(self.soup)
+
+        return self.soup
+
+
+def set_contents(tag: Tag, contents: list[PageElement]):
+    for i, child in enumerate(contents):
+        child.parent = tag
+        child.previous_sibling = contents[i - 1] if i > 0 else None
+        child.next_sibling = contents[i + 1] if i + 1 < len(contents) else None
+    tag.contents = contents
+
+
+def relink_elements(soup: BeautifulSoup):
+    """Restore the document order links (next_element, previous_element)"""
+    previous = soup
+    iterators = [iter(soup.contents)]
+    while iterators:
+        element = next(iterators[-1], None)
+        if element is None:
+            iterators.pop()
+            continue
+
+        element.previous_element = previous
+        previous.next_element = element
+        previous = element
+        if isinstance(element, Tag):
+            iterators.append(iter(element.contents))
+    previous.next_element = None
+
+
+def get_tree_signature(soup: BeautifulSoup) -> list[tuple]:
+    """Flat description of a tree, to compare trees without the recursive Tag.__eq__"""
+    return [(type(element), element.name, element.attrs) if isinstance(element, Tag)
+            else (type(element), str(element))
+            for element in soup.descendants]
+
+
+########
+# MAIN #
+########
+
+def fix_html(soup: BeautifulSoup) -> BeautifulSoup:
+    """Normalizes broken html and whitespaces, as if the prettified html of soup was parsed"""
+    if not can_rebuild_prettified_tree(soup):
+        return fix_html_by_reparsing(soup)
+
+    return PrettifiedTreeBuilder(soup).build()
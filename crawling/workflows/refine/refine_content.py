@@ -6,6 +6,7 @@ from bs4 import BeautifulSoup, NavigableString, Comment, ProcessingInstruction,
 
 from crawling.utils.string_utils import is_below_byte_limit, remove_unsafe_chars
 from crawling.workflows.refine.detect_calendar import is_calendar_item
+from crawling.workflows.refine.fix_html import fix_html
 from scheduling.utils.html_utils import remove_spaces, stringify_html
 
 
@@ -13,35 +14,44 @@ from scheduling.utils.html_utils import remove_spaces, stringify_html
 # REMOVING THINGS #
 ###################
 
-def remove_img(soup: BeautifulSoup):
-    for s in soup.select('img'):
-        s.extract()
-
-    for s in soup.select('svg'):
+def remove_img_and_script(soup: BeautifulSoup):
+    # find_all walks the tree once, while a css select would walk it once per selector
+    for s in soup.find_all(['img', 'svg', 'script', 'style']):
         s.extract()
 
     return soup
 
 
-def remove_script(soup: BeautifulSoup):
-    for s in soup.select('script'):
-        s.extract()
+##################
+# TABLE CLEANING #
+##################
 
-    for s in soup.select('style'):
-        s.extract()
+def contains_word(element: Tag, word: str) -> bool:
+    """Equivalent to `word in element.prettify()`, for a word without any html special char,
+    but without serializing the whole element"""
+    for item in element.self_and_descendants:
+        if not isinstance(item, Tag):
+            if word in item:
+                return True
+            continue
 
-    return soup
+        if word in item.name:
+            return True
 
+        for key, value in item.attrs.items():
+            if isinstance(value, list):
+                value = ' '.join(value)
+            if word in key or (value is not None and word in str(value)):
+                return True
+
+    return False
 
-##################
-# TABLE CLEANING #
-##################
 
 def is_table(element):
     if element.name in [
         'table',
     ]:
-        if 'mailpoet' in element.prettify():
+        if contains_word(element, 'mailpoet'):
             # mailpoet is a newsletter framework that uses <table> for its structure
             # https://www.paroissesferreoletozanam.fr/?mailpoet_router=&endpoint=view_in_browser&action=view&data=WzExMSwiMmZkYjYyM2UzZTUwIiwwLDAsMTY3LDFd
             return False
@@ -105,6 +115,10 @@ def clear_table_formatting(element: BeautifulSoup):
 
 
 def rec_prettify(element: BeautifulSoup):
+    """Prettify and parse again until html.parser outputs the same html.
+    This reparsing is kept, unlike in fix_html: it only runs on a table or a calendar whose
+    text is below the byte limit, it converges after one or two parsings, and the fixpoint
+    keeps the line breaks inside strings that PrettifiedTreeBuilder collapses."""
     last_prettified_html = None
     prettified_html = element.prettify()
 
@@ -152,6 +166,17 @@ def flatten_string(text: str):
     return text
 
 
+def flatten_link(element: Tag) -> str:
+    """Same as flatten_string(element.prettify()) for a link cleared by clear_link_formatting,
+    i.e. containing only text, without the cost of pretty printing"""
+    link_html = element.decode()
+    # attribute values are escaped, so the opening tag ends at the first '>'
+    opening_tag_end = link_html.index('>') + 1
+    link_text = link_html[opening_tag_end:-len(f'</{element.name}>')]
+
+    return flatten_string(f'{link_html[:opening_tag_end]} {link_text} </{element.name}>')
+
+
 def clean_text(text: str):
     text = remove_unsafe_chars(text)
     text = text.replace("", "")
@@ -166,20 +191,17 @@ def clean_text(text: str):
     return text
 
 
-def contains_char_or_digits(text):
+CHAR_OR_DIGITS_REGEX = re.compile(f'[{string.ascii_letters}{string.digits}]')
+
+
+def line_is_suitable(text: str):
     # If text contains character NUL, it's a good hint that this line is not proper text
     if '\x00' in text:
         return False
 
-    char_or_digits = set(string.ascii_letters + string.digits)
-    for t in stringify_html(text):
-        if t in char_or_digits:
-            return True
-    return False
-
-
-def line_is_suitable(text: str):
-    return contains_char_or_digits(text) and is_below_byte_limit(stringify_html(text))
+    stringified_text = stringify_html(text)
+    return CHAR_OR_DIGITS_REGEX.search(stringified_text) is not None \
+        and is_below_byte_limit(stringified_text)
 
 
 def clean_paragraph(text: str):
@@ -273,7 +295,7 @@ def build_text(soup: BeautifulSoup) -> tuple[str, int]:
             continue
         elif is_link(element):
             clear_link_formatting(element)
-            cleaned_text = flatten_string(element.prettify())
+            cleaned_text = flatten_link(element)
             if not cleaned_text:
                 continue
 
@@ -301,21 +323,6 @@ def build_text(soup: BeautifulSoup) -> tuple[str, int]:
     return result_line, total_calendar_items
 
 
-##############
-# HTML FIXER #
-##############
-
-def fix_html(soup: BeautifulSoup) -> BeautifulSoup:
-    try:
-        # This is hack to handle broken html
-        pretty_content = soup.prettify()
-        # Remove multiple consecutive spaces
-        pretty_content = re.sub(r'\n\s*', ' ', pretty_content)
-        return BeautifulSoup(pretty_content, 'html.parser')
-    except RecursionError:
-        return soup
-
-
 ########
 # MAIN #
 ########
@@ -330,10 +337,14 @@ def refine_confession_content(content_html: str) -> str | None:
         print(e)
         return None
 
+    return refine_confession_soup(soup)
+
+
+def refine_confession_soup(soup: BeautifulSoup) -> str:
+    """Beware, soup is modified in place"""
     soup = fix_html(soup)
 
-    soup = remove_img(soup)
-    soup = remove_script(soup)
+    soup = remove_img_and_script(soup)
 
     text, _ = build_text(soup)
 
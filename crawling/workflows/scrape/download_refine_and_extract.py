@@ -1,5 +1,7 @@
-from crawling.workflows.download.download_content import get_content_from_url
+from crawling.workflows.download.download_content import get_content_from_url, download_page
 from crawling.workflows.refine.refine_content import refine_confession_content
+from crawling.workflows.scrape.page_cache import CachedPage, get_validators, is_page_unchanged, \
+    refresh_cached_page, build_cached_page
 from scheduling.public_workflow import scheduling_extract_refined_content, \
     scheduling_extract_v2_refined_content
 
@@ -28,6 +30,23 @@ def get_fresh_extracted_html_list(url) -> list[str] | None:
     return get_extracted_html_list(html_content)
 
 
+def get_fresh_extracted_html_list_with_cache(url: str, cached_page: CachedPage | None
+                                             ) -> tuple[list[str] | None, CachedPage | None]:
+    downloaded_page = download_page(url, get_validators(cached_page))
+    if downloaded_page is None:
+        return None, None
+
+    if is_page_unchanged(downloaded_page, cached_page):
+        return cached_page.extracted_html_list, refresh_cached_page(cached_page, downloaded_page)
+
+    if downloaded_page.content is None:
+        return None, None
+
+    extracted_html_list = get_extracted_html_list(downloaded_page.content)
+
+    return extracted_html_list, build_cached_page(url, downloaded_page, extracted_html_list)
+
+
 if __name__ == '__main__':
     url_ = ('https://www.bayonnecentre.fr/index.php/s-informer/la-reconciliation')
     extracted_html_list_ = get_fresh_extracted_html_list(url_)
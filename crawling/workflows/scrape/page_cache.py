@@ -0,0 +1,78 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from core.utils.log_utils import info
+from crawling.workflows.crawl.extract_widgets import BaseWidget
+from crawling.workflows.download.download_content import PageValidators, DownloadedPage
+from scheduling.utils.hash_utils import hash_string_to_hex
+
+
+class CachedPage(BaseModel):
+    url: str
+    validators: PageValidators = Field(default_factory=PageValidators)
+    content_hash: str
+    extracted_html_list: list[str] | None = None
+    extracted_at: datetime | None = None
+    # links and widgets are only set when the page has been processed during a crawl,
+    # with the crawling context (home url, forbidden paths...) of context_hash
+    links: list[str] | None = None
+    widgets: list[BaseWidget] = Field(default_factory=list)
+    context_hash: str | None = None
+
+
+def get_content_hash(html_content: str) -> str:
+    return hash_string_to_hex(html_content)
+
+
+def get_crawling_context_hash(home_url: str, aliases_domains: set[str],
+                              forbidden_outer_paths: set[str],
+                              path_redirection: dict[str, str],
+                              forbidden_paths: set[str]) -> str:
+    return hash_string_to_hex(str((home_url,
+                                   sorted(aliases_domains),
+                                   sorted(forbidden_outer_paths),
+                                   sorted(path_redirection.items()),
+                                   sorted(forbidden_paths))))
+
+
+def get_validators(cached_page: CachedPage | None) -> PageValidators | None:
+    if cached_page is None:
+        return None
+
+    return cached_page.validators
+
+
+def is_page_unchanged(downloaded_page: DownloadedPage, cached_page: CachedPage | None) -> bool:
+    if cached_page is None:
+        return False
+
+    if downloaded_page.is_not_modified:
+        return True
+
+    return get_content_hash(downloaded_page.content) == cached_page.content_hash
+
+
+def refresh_cached_page(cached_page: CachedPage, downloaded_page: DownloadedPage) -> CachedPage:
+    info(f'page {cached_page.url} has not changed, reusing previous extraction')
+    if downloaded_page.validators == PageValidators():
+        # A 304 response may not repeat the validators, we keep the previous ones
+        return cached_page
+
+    return cached_page.model_copy(update={'validators': downloaded_page.validators})
+
+
+def build_cached_page(url: str, downloaded_page: DownloadedPage,
+                      extracted_html_list: list[str] | None,
+                      links: set[str] | None = None,
+                      widgets: list[BaseWidget] | None = None,
+                      context_hash: str | None = None) -> CachedPage:
+    return CachedPage(
+        url=url,
+        validators=downloaded_page.validators,
+        content_hash=get_content_hash(downloaded_page.content),
+        extracted_html_list=extracted_html_list,
+        links=sorted(links) if links is not None else None,
+        widgets=widgets or [],
+        context_hash=context_hash,
+    )
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+
+from bs4 import BeautifulSoup
+
+from crawling.workflows.crawl.extract_links import parse_soup_links
+from crawling.workflows.crawl.extract_widgets import BaseWidget, extract_widgets_from_soup
+from crawling.workflows.refine.refine_content import refine_confession_soup
+from scheduling.public_workflow import scheduling_extract_refined_content
+
+
+class PageAlreadyRefinedError(Exception):
+    pass
+
+
+@dataclass
+class ParsedPage:
+    """Html of a downloaded page, parsed once and shared by links, widgets and content
+    extraction. Refining modifies the soup in place, hence it must be done last."""
+    soup: BeautifulSoup | None
+    is_refined: bool = False
+
+    @classmethod
+    def from_html(cls, html_content: str) -> 'ParsedPage':
+        try:
+            return cls(soup=BeautifulSoup(html_content, 'html.parser'))
+        except Exception as e:
+            print(e)
+            return cls(soup=None)
+
+    def get_soup(self) -> BeautifulSoup | None:
+        if self.is_refined:
+            raise PageAlreadyRefinedError()
+
+        return self.soup
+
+    def get_links(self, home_url: str, aliases_domains: set[str],
+                  forbidden_outer_paths: set[str], path_redirection: dict[str, str],
+                  forbidden_paths: set[str]) -> set[str]:
+        soup = self.get_soup()
+        if soup is None:
+            return set()
+
+        return parse_soup_links(soup, home_url, aliases_domains, forbidden_outer_paths,
+                                path_redirection, forbidden_paths)
+
+    def get_widgets(self) -> list[BaseWidget]:
+        soup = self.get_soup()
+        if soup is None:
+            return []
+
+        return extract_widgets_from_soup(soup)
+
+    def get_extracted_html_list(self) -> list[str] | None:
+        soup = self.get_soup()
+        if soup is None:
+            return None
+
+        self.is_refined = True
+        refined_content = refine_confession_soup(soup)
+        self.soup = None
+
+        return scheduling_extract_refined_content(refined_content)
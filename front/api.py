@@ -1,17 +1,82 @@
+import zlib
 from datetime import datetime
+from typing import Callable, Iterator
 from uuid import UUID
 
-from django.db.models import Exists, OuterRef
+from django.db.models import Case, Exists, JSONField, OuterRef, Prefetch, Q, QuerySet, \
+    When
+from django.http import StreamingHttpResponse
 from ninja import NinjaAPI, Schema, Field
 
 from registry.models import Church, ChurchModeration, Parish, Website
 from registry.models.base_moderation_models import ModerationStatus
 from scheduling.models import Scheduling, IndexEvent
 from scheduling.public_model import SourcedScheduleItem
-from scheduling.public_service import scheduling_retrieve_scheduling_elements
+from scheduling.public_service import scheduling_retrieve_scheduling_elements, \
+    scheduling_load_public_snapshot
 
 api = NinjaAPI(urls_namespace='main_api')
 
+MAX_LIMIT = 100
+# An export request must end before the gunicorn timeout, hence exports are chunked
+MAX_EXPORT_LIMIT = 5000
+EXPORT_CHUNK_SIZE = 500
+
+
+##############
+# PAGINATION #
+##############
+
+def paginate(query: QuerySet, limit: int, offset: int, after_updated_at: datetime | None,
+             after_uuid: UUID | None, max_limit: int = MAX_LIMIT) -> QuerySet:
+    """Pages are ordered by (updated_at, uuid). Giving the updated_at and uuid of the last
+    item of the previous page (keyset pagination) is as fast for the last page as for the first
+    one, unlike offset."""
+    limit = max(0, min(max_limit, limit))
+    query = query.order_by('updated_at', 'uuid')
+
+    if after_updated_at is not None:
+        keyset_filter = Q(updated_at__gt=after_updated_at)
+        if after_uuid is not None:
+            keyset_filter |= Q(updated_at=after_updated_at, uuid__gt=after_uuid)
+
+        return query.filter(keyset_filter)[:limit]
+
+    offset = max(0, offset)
+    return query[offset:offset + limit]
+
+
+##########
+# EXPORT #
+##########
+
+def iter_ndjson_gzip(query: QuerySet, to_schema: Callable[[any], Schema]) -> Iterator[bytes]:
+    # wbits for a gzip container
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    # iterator uses a server-side cursor, rows are never all in memory
+    for obj in query.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        compressed = compressor.compress(to_schema(obj).model_dump_json().encode() + b'\n')
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+
+def get_export_response(query: QuerySet, to_schema: Callable[[any], Schema], name: str,
+                        limit: int, after_updated_at: datetime | None, after_uuid: UUID | None
+                        ) -> StreamingHttpResponse:
+    """At most MAX_EXPORT_LIMIT items, ordered by (updated_at, uuid). The next chunk is
+    requested with the updated_at and uuid of the last line, until a chunk has less than
+    limit lines."""
+    query = paginate(query, limit, 0, after_updated_at, after_uuid, max_limit=MAX_EXPORT_LIMIT)
+    response = StreamingHttpResponse(
+        iter_ndjson_gzip(query, to_schema),
+        content_type='application/gzip',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{name}.ndjson.gz"'
+
+    return response
+
 
 ############
 # CHURCHES #
@@ -63,12 +128,7 @@ class ChurchOut(Schema):
         )
 
 
-@api.get("/churches", response=list[ChurchOut])
-def api_public_churches(request, limit: int = 10, offset: int = 0, updated_from: datetime = None
-                        ) -> list[ChurchOut]:
-    limit = max(0, min(100, limit))
-    offset = max(0, offset)
-
+def get_church_query(updated_from: datetime | None) -> QuerySet[Church]:
     church_query = Church.objects.annotate(
         has_validated_moderation=Exists(
             ChurchModeration.history.filter(church=OuterRef('pk'), history_user_id__isnull=False)
@@ -81,11 +141,29 @@ def api_public_churches(request, limit: int = 10, offset: int = 0, updated_from:
     )
     if updated_from:
         church_query = church_query.filter(updated_at__gte=updated_from)
-    churches = church_query.order_by('updated_at').all()[offset:offset + limit]
+
+    return church_query
+
+
+@api.get("/churches", response=list[ChurchOut])
+def api_public_churches(request, limit: int = 10, offset: int = 0, updated_from: datetime = None,
+                        after_updated_at: datetime = None, after_uuid: UUID = None
+                        ) -> list[ChurchOut]:
+    churches = paginate(get_church_query(updated_from), limit, offset, after_updated_at,
+                        after_uuid)
 
     return list(map(ChurchOut.from_church, churches))
 
 
+@api.get("/churches/export")
+def api_public_churches_export(request, limit: int = MAX_EXPORT_LIMIT,
+                               updated_from: datetime = None,
+                               after_updated_at: datetime = None, after_uuid: UUID = None):
+    """A chunk of churches, as gzipped NDJSON (one ChurchOut per line)"""
+    return get_export_response(get_church_query(updated_from), ChurchOut.from_church,
+                               'churches', limit, after_updated_at, after_uuid)
+
+
 ############
 # PARISHES #
 ############
@@ -104,26 +182,39 @@ class ParishOut(Schema):
             uuid=parish.uuid,
             name=parish.name,
             messesinfo_id=parish.messesinfo_community_id,
-            website_uuid=parish.website.uuid if parish.website else None,
+            website_uuid=parish.website_id,
             created_at=parish.created_at,
             updated_at=parish.updated_at,
         )
 
 
-@api.get("/parishes", response=list[ParishOut])
-def api_public_parishes(request, limit: int = 10, offset: int = 0, updated_from: datetime = None
-                        ) -> list[ParishOut]:
-    limit = max(0, min(100, limit))
-    offset = max(0, offset)
-
-    parish_query = Parish.objects
+def get_parish_query(updated_from: datetime | None) -> QuerySet[Parish]:
+    parish_query = Parish.objects.all()
     if updated_from:
         parish_query = parish_query.filter(updated_at__gte=updated_from)
-    parishes = parish_query.order_by('updated_at').all()[offset:offset + limit]
+
+    return parish_query
+
+
+@api.get("/parishes", response=list[ParishOut])
+def api_public_parishes(request, limit: int = 10, offset: int = 0, updated_from: datetime = None,
+                        after_updated_at: datetime = None, after_uuid: UUID = None
+                        ) -> list[ParishOut]:
+    parishes = paginate(get_parish_query(updated_from), limit, offset, after_updated_at,
+                        after_uuid)
 
     return list(map(ParishOut.from_parish, parishes))
 
 
+@api.get("/parishes/export")
+def api_public_parishes_export(request, limit: int = MAX_EXPORT_LIMIT,
+                               updated_from: datetime = None,
+                               after_updated_at: datetime = None, after_uuid: UUID = None):
+    """A chunk of parishes, as gzipped NDJSON (one ParishOut per line)"""
+    return get_export_response(get_parish_query(updated_from), ParishOut.from_parish,
+                               'parishes', limit, after_updated_at, after_uuid)
+
+
 ############
 # WEBSITES #
 ############
@@ -148,20 +239,33 @@ class WebsiteOut(Schema):
         )
 
 
-@api.get("/websites", response=list[WebsiteOut])
-def api_public_websites(request, limit: int = 10, offset: int = 0, updated_from: datetime = None
-                        ) -> list[WebsiteOut]:
-    limit = max(0, min(100, limit))
-    offset = max(0, offset)
-
-    website_query = Website.objects
+def get_website_query(updated_from: datetime | None) -> QuerySet[Website]:
+    website_query = Website.objects.all()
     if updated_from:
         website_query = website_query.filter(updated_at__gte=updated_from)
-    websites = website_query.order_by('updated_at').all()[offset:offset + limit]
+
+    return website_query
+
+
+@api.get("/websites", response=list[WebsiteOut])
+def api_public_websites(request, limit: int = 10, offset: int = 0, updated_from: datetime = None,
+                        after_updated_at: datetime = None, after_uuid: UUID = None
+                        ) -> list[WebsiteOut]:
+    websites = paginate(get_website_query(updated_from), limit, offset, after_updated_at,
+                        after_uuid)
 
     return list(map(WebsiteOut.from_website, websites))
 
 
+@api.get("/websites/export")
+def api_public_websites_export(request, limit: int = MAX_EXPORT_LIMIT,
+                               updated_from: datetime = None,
+                               after_updated_at: datetime = None, after_uuid: UUID = None):
+    """A chunk of websites, as gzipped NDJSON (one WebsiteOut per line)"""
+    return get_export_response(get_website_query(updated_from), WebsiteOut.from_website,
+                               'websites', limit, after_updated_at, after_uuid)
+
+
 ###############
 # SCHEDULINGS #
 ###############
@@ -230,6 +334,24 @@ class SchedulingOut(Schema):
 
     @classmethod
     def from_scheduling(cls, scheduling: Scheduling):
+        public_snapshot = scheduling_load_public_snapshot(scheduling)
+        if public_snapshot is not None:
+            return cls(
+                uuid=scheduling.uuid,
+                created_at=scheduling.created_at,
+                updated_at=scheduling.updated_at,
+                website_uuid=scheduling.website_id,
+                **public_snapshot,
+            )
+
+        # Deferred fields would be read with one query each
+        scheduling.sourced_schedules_list = scheduling.sourced_schedules_list_without_snapshot
+        scheduling.church_uuid_by_id = scheduling.church_uuid_by_id_without_snapshot
+
+        return cls.from_scheduling_elements(scheduling)
+
+    @classmethod
+    def from_scheduling_elements(cls, scheduling: Scheduling):
         # Events
         index_events_by_church_uuid = {}
         for index_event in scheduling.index_events.all():
@@ -268,16 +390,43 @@ class SchedulingOut(Schema):
         )
 
 
-@api.get("/schedulings", response=list[SchedulingOut])
-def api_public_schedulings(request, limit: int = 10, offset: int = 0, updated_from: datetime = None
-                           ) -> list[SchedulingOut]:
-    limit = max(0, min(100, limit))
-    offset = max(0, offset)
-
-    scheduling_query = Scheduling.objects.filter(status=Scheduling.Status.INDEXED)
+def get_scheduling_query(updated_from: datetime | None) -> QuerySet[Scheduling]:
+    # Only the public snapshot is needed, a page of schedulings is read with one query.
+    # Schedulings without snapshot are built from their elements and index events, which are
+    # only read for them, with the same query and one prefetch query.
+    without_snapshot = Q(public_snapshot__isnull=True)
+    index_events_without_snapshot = Prefetch(
+        'index_events',
+        queryset=IndexEvent.objects.filter(scheduling__public_snapshot__isnull=True),
+    )
+    scheduling_query = Scheduling.objects.filter(status=Scheduling.Status.INDEXED)\
+        .defer('sourced_schedules_list', 'church_uuid_by_id')\
+        .annotate(sourced_schedules_list_without_snapshot=Case(
+            When(without_snapshot, then='sourced_schedules_list'), output_field=JSONField()))\
+        .annotate(church_uuid_by_id_without_snapshot=Case(
+            When(without_snapshot, then='church_uuid_by_id'), output_field=JSONField()))\
+        .prefetch_related(index_events_without_snapshot)
     if updated_from:
         scheduling_query = scheduling_query.filter(updated_at__gte=updated_from)
-    schedulings = scheduling_query.order_by('updated_at').all()[offset:offset + limit]\
-        .prefetch_related('index_events')
+
+    return scheduling_query
+
+
+@api.get("/schedulings", response=list[SchedulingOut])
+def api_public_schedulings(request, limit: int = 10, offset: int = 0, updated_from: datetime = None,
+                           after_updated_at: datetime = None, after_uuid: UUID = None
+                           ) -> list[SchedulingOut]:
+    schedulings = paginate(get_scheduling_query(updated_from), limit, offset, after_updated_at,
+                           after_uuid)
 
     return list(map(SchedulingOut.from_scheduling, schedulings))
+
+
+@api.get("/schedulings/export")
+def api_public_schedulings_export(request, limit: int = MAX_EXPORT_LIMIT,
+                                  updated_from: datetime = None,
+                                  after_updated_at: datetime = None, after_uuid: UUID = None):
+    """A chunk of indexed schedulings, as gzipped NDJSON (one SchedulingOut per line)"""
+    return get_export_response(get_scheduling_query(updated_from),
+                               SchedulingOut.from_scheduling, 'schedulings', limit,
+                               after_updated_at, after_uuid)
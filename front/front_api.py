@@ -1,12 +1,13 @@
 from datetime import datetime, date
 from enum import Enum
-from typing import Literal
+from typing import Literal, Callable, Any
 from uuid import UUID
 
-from django.http import Http404
+from django.http import Http404, HttpRequest, HttpResponse
 from ninja import NinjaAPI, Schema
 
 from attaching.public_service import attaching_get_image_public_url
+from core.services.analytics_sink_service import analytics_sink
 from front.models import Report, AutocompleteHit
 from front.services.card.report_service import save_report
 from front.services.card.scraping_url_service import get_scraping_parsing_urls
@@ -14,9 +15,13 @@ from front.services.card.sources_service import get_website_parsings_and_pruning
     WebsiteParsingsAndPrunings
 from front.services.search.aggregation_service import get_search_results
 from front.services.search.autocomplete_service import get_aggregated_response, AutocompleteResult
+from front.services.search.map_service import MapPayload, get_map_payload, get_center, \
+    get_events_by_website
+from front.services.search.response_cache_service import build_response_key, \
+    get_or_set_cached_content, normalize_box, normalize_coordinate
 from front.services.search.search_service import TimeFilter, AggregationItem, BoundingBox, \
     get_dioceses_bounding_box, get_churches_by_uuid, get_churches_by_diocese, \
-    get_popular_churches, SearchResult
+    get_popular_churches, SearchResult, DEFAULT_SEARCH_BOX
 from registry.models import Church, Website, Diocese
 from scheduling.models import IndexEvent
 from scheduling.public_model import SourcedScheduleItem, BaseSource, ParsingSource, OClocherSource
@@ -242,6 +247,10 @@ class SearchResultOut(Schema):
     churches: list[ChurchOut]
     aggregations: list[AggregationOut]
 
+    @staticmethod
+    def get_website_uuids(search_result: SearchResult) -> set[UUID]:
+        return {church.parish.website.uuid for church in search_result.churches}
+
     @classmethod
     def from_result(cls,
                     search_result: SearchResult,
@@ -318,6 +327,27 @@ class ErrorSchema(Schema):
     detail: str
 
 
+#########
+# CACHE #
+#########
+
+# Dioceses bounding boxes only change when churches are added or moved
+DIOCESES_CACHE_TIMEOUT = 60 * 60
+
+
+def cached_response(request: HttpRequest, key: str,
+                    get_data: Callable[[], tuple[Any, set[UUID]]],
+                    **kwargs) -> HttpResponse:
+    """get_data returns the response data, and the uuids of the websites it depends on"""
+    def get_content() -> tuple[bytes, set[UUID]]:
+        data, website_uuids = get_data()
+        return api.renderer.render(request, data, response_status=200), website_uuids
+
+    content = get_or_set_cached_content(key, get_content, **kwargs)
+
+    return HttpResponse(content, content_type=api.get_content_type())
+
+
 #############
 # ENDPOINTS #
 #############
@@ -338,10 +368,70 @@ def api_front_search(request,
         hour_min=hour_min,
         hour_max=hour_max,
     )
-    search_result, aggregations = \
-        get_search_results(latitude, longitude, min_lat, min_lng, max_lat, max_lng, time_filter)
+    latitude, longitude = normalize_coordinate(latitude), normalize_coordinate(longitude)
+    min_lat, min_lng, max_lat, max_lng = normalize_box(min_lat, min_lng, max_lat, max_lng)
+
+    def get_data():
+        search_result, aggregations = get_search_results(latitude, longitude,
+                                                         min_lat, min_lng, max_lat, max_lng,
+                                                         time_filter)
+        return SearchResultOut.from_result(search_result, aggregations).model_dump(), \
+            SearchResultOut.get_website_uuids(search_result)
+
+    key = build_response_key('search', latitude=latitude, longitude=longitude,
+                             min_lat=min_lat, min_lng=min_lng, max_lat=max_lat, max_lng=max_lng,
+                             time_filter=time_filter)
+    return cached_response(request, key, get_data)
+
+
+@api.get("/map", response=MapPayload)
+def api_front_map(request,
+                  latitude: float | None = None,
+                  longitude: float | None = None,
+                  min_lat: float | None = None,
+                  min_lng: float | None = None,
+                  max_lat: float | None = None,
+                  max_lng: float | None = None,
+                  date_filter: date | None = None,
+                  hour_min: int = 0, hour_max: int = 24 * 60 - 1
+                  ) -> MapPayload:
+    """Same search as /search, as markers of the search map"""
+    time_filter = TimeFilter(
+        day_filter=date_filter,
+        hour_min=hour_min,
+        hour_max=hour_max,
+    )
+    latitude, longitude = normalize_coordinate(latitude), normalize_coordinate(longitude)
+    min_lat, min_lng, max_lat, max_lng = normalize_box(min_lat, min_lng, max_lat, max_lng)
+
+    def get_data():
+        search_result, _ = get_search_results(latitude, longitude,
+                                              min_lat, min_lng, max_lat, max_lng,
+                                              time_filter)
+        bounds = None
+        if min_lat and min_lng and max_lat and max_lng:
+            bounds = (min_lat, max_lat, min_lng, max_lng)
+            center = [(min_lat + max_lat) / 2, (min_lng + max_lng) / 2]
+        elif latitude and longitude:
+            center = [latitude, longitude]
+        elif search_result.churches:
+            center = get_center(search_result.churches)
+        else:
+            default_min_lat, default_max_lat, default_min_lng, default_max_lng = \
+                DEFAULT_SEARCH_BOX
+            center = [(default_min_lat + default_max_lat) / 2,
+                      (default_min_lng + default_max_lng) / 2]
+
+        events_by_website = get_events_by_website(search_result, date_filter is not None)
+        map_payload = get_map_payload(center, search_result.churches, bounds,
+                                      events_by_website, is_around_me=False)
+
+        return map_payload.model_dump(), SearchResultOut.get_website_uuids(search_result)
 
-    return SearchResultOut.from_result(search_result, aggregations)
+    key = build_response_key('map', latitude=latitude, longitude=longitude,
+                             min_lat=min_lat, min_lng=min_lng, max_lat=max_lat, max_lng=max_lng,
+                             time_filter=time_filter)
+    return cached_response(request, key, get_data)
 
 
 @api.get("/search/home", response=SearchResultOut)
@@ -358,10 +448,19 @@ def api_front_search_home(request,
         hour_min=hour_min,
         hour_max=hour_max,
     )
-    search_result = get_popular_churches(min_lat, min_lng, max_lat, max_lng, time_filter)
-    aggregations = []
+    min_lat, min_lng, max_lat, max_lng = normalize_box(min_lat, min_lng, max_lat, max_lng)
 
-    return SearchResultOut.from_result(search_result, aggregations)
+    def get_data():
+        search_result = get_popular_churches(min_lat, min_lng, max_lat, max_lng, time_filter)
+        aggregations = []
+
+        return SearchResultOut.from_result(search_result, aggregations).model_dump(), \
+            SearchResultOut.get_website_uuids(search_result)
+
+    key = build_response_key('search_home',
+                             min_lat=min_lat, min_lng=min_lng, max_lat=max_lat, max_lng=max_lng,
+                             time_filter=time_filter)
+    return cached_response(request, key, get_data)
 
 
 @api.get("/search/diocese/{diocese_uuid}", response={200: SearchResultOut, 404: ErrorSchema})
@@ -375,15 +474,22 @@ def api_front_search_diocese(request,
         hour_min=hour_min,
         hour_max=hour_max,
     )
-    try:
-        diocese = Diocese.objects.get(uuid=diocese_uuid)
-    except Diocese.DoesNotExist:
-        raise Http404(f'Diocese with uuid {diocese_uuid} not found')
 
-    search_result = get_churches_by_diocese(diocese, time_filter)
-    aggregations = []
+    def get_data():
+        try:
+            diocese = Diocese.objects.get(uuid=diocese_uuid)
+        except Diocese.DoesNotExist:
+            raise Http404(f'Diocese with uuid {diocese_uuid} not found')
 
-    return SearchResultOut.from_result(search_result, aggregations)
+        search_result = get_churches_by_diocese(diocese, time_filter)
+        aggregations = []
+
+        return SearchResultOut.from_result(search_result, aggregations).model_dump(), \
+            SearchResultOut.get_website_uuids(search_result)
+
+    key = build_response_key('search_diocese', diocese_uuid=diocese_uuid,
+                             time_filter=time_filter)
+    return cached_response(request, key, get_data)
 
 
 @api.get("/church/{church_uuid}", response={200: ChurchDetails, 404: ErrorSchema})
@@ -398,6 +504,15 @@ def api_front_church_details(request, church_uuid: UUID,
         hour_max=hour_max,
     )
 
+    def get_data():
+        church_details = get_church_details(church_uuid, time_filter)
+        return church_details.model_dump(), {church_details.website.uuid}
+
+    key = build_response_key('church', church_uuid=church_uuid, time_filter=time_filter)
+    return cached_response(request, key, get_data)
+
+
+def get_church_details(church_uuid: UUID, time_filter: TimeFilter) -> ChurchDetails:
     search_result = get_churches_by_uuid(church_uuid, time_filter)
     churches = list(search_result.churches)
 
@@ -481,15 +596,19 @@ def api_front_post_autocomplete_hit(request,
         item_longitude=autocomplete_hit_in.item.longitude,
         item_uuid=autocomplete_hit_in.item.uuid,
     )
-    autocomplete_hit.save()
+    analytics_sink.add(autocomplete_hit)
     return autocomplete_hit_in
 
 
 @api.get("/dioceses", response={200: list[DioceseOut], 404: ErrorSchema})
 def api_front_get_dioceses(request) -> list[DioceseOut]:
-    dioceses_and_box = get_dioceses_bounding_box()
-    return [DioceseOut.from_diocese_and_box(diocese, bounding_box)
-            for diocese, bounding_box in dioceses_and_box]
+    def get_data():
+        dioceses_and_box = get_dioceses_bounding_box()
+        return [DioceseOut.from_diocese_and_box(diocese, bounding_box).model_dump()
+                for diocese, bounding_box in dioceses_and_box], set()
+
+    return cached_response(request, build_response_key('dioceses'), get_data,
+                           timeout=DIOCESES_CACHE_TIMEOUT)
 
 
 @api.post("/reports", response={200: ReportOut, 404: ErrorSchema})
@@ -0,0 +1,92 @@
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Exists
+from django.test import Client
+
+from core.management.abstract_command import AbstractCommand
+from front.services.search.search_service import DEFAULT_SEARCH_BOX, TimeFilter, \
+    build_base_church_query, build_event_subquery, build_has_event_condition, filter_in_box
+
+# name: (min_lat, max_lat, min_lng, max_lng)
+SEARCH_BOXES = {
+    'france': DEFAULT_SEARCH_BOX,
+    'paris': [48.80, 48.92, 2.22, 2.47],
+    'lyon': [45.70, 45.81, 4.77, 4.90],
+}
+# name: (latitude, longitude)
+SEARCH_CENTERS = {
+    'paris': (48.853, 2.349),
+    'lyon': (45.760, 4.835),
+}
+
+
+def get_time_filters() -> dict[str, dict]:
+    return {
+        'no filter': {},
+        'today': {'date_filter': date.today().isoformat()},
+        'in a week': {'date_filter': (date.today() + timedelta(days=7)).isoformat()},
+        'evening': {'hour_min': 18 * 60},
+    }
+
+
+class Command(AbstractCommand):
+    help = "Benchmark /front/api/search on typical boxes, centers and time filters"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-r', '--repeat', help='number of runs', type=int, default=3)
+
+    def handle(self, *args, **options):
+        self.check_has_event_condition()
+
+        allowed_hosts = [host for host in settings.ALLOWED_HOSTS if host != '*']
+        client = Client(HTTP_HOST=allowed_hosts[0] if allowed_hosts else 'testserver')
+
+        queries = []
+        for time_filter_name, time_params in get_time_filters().items():
+            for box_name, (min_lat, max_lat, min_lng, max_lng) in SEARCH_BOXES.items():
+                queries.append((f'box {box_name}, {time_filter_name}', {
+                    'min_lat': min_lat, 'max_lat': max_lat,
+                    'min_lng': min_lng, 'max_lng': max_lng,
+                } | time_params))
+            for center_name, (latitude, longitude) in SEARCH_CENTERS.items():
+                queries.append((f'around {center_name}, {time_filter_name}', {
+                    'latitude': latitude, 'longitude': longitude,
+                } | time_params))
+
+        total_duration = 0
+        for name, params in queries:
+            durations = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                response = client.get('/front/api/search', params)
+                durations.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    self.error(f'{name}: got status {response.status_code}')
+                    break
+
+            duration = min(durations)
+            total_duration += duration
+            self.info(f'{name}: {duration * 1000:.0f}ms, '
+                      f'{len(response.json()["churches"])} churches')
+
+        self.success(f'Benchmark done, {len(queries)} searches in {total_duration:.2f}s')
+
+    def check_has_event_condition(self):
+        """ChurchAvailability must give the same churches as looking up IndexEvent"""
+        min_lat, max_lat, min_lng, max_lng = DEFAULT_SEARCH_BOX
+        church_query = filter_in_box(build_base_church_query(), min_lat, min_lng, max_lat, max_lng)
+        for time_filter_name, time_params in get_time_filters().items():
+            time_filter = TimeFilter(
+                day_filter=time_params.get('date_filter'),
+                hour_min=time_params.get('hour_min', 0),
+                hour_max=time_params.get('hour_max', 24 * 60 - 1),
+            )
+            expected_uuids = set(church_query.filter(Exists(build_event_subquery(time_filter)))
+                                 .values_list('uuid', flat=True))
+            uuids = set(church_query.filter(build_has_event_condition(time_filter))
+                        .values_list('uuid', flat=True))
+            if uuids != expected_uuids:
+                self.error(f'{time_filter_name}: {len(uuids ^ expected_uuids)} churches differ, '
+                           f'run refresh_church_availabilities')
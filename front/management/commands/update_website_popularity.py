@@ -5,7 +5,11 @@ from front.services.search.popularity_service import update_popularity_of_websit
 class Command(AbstractCommand):
     help = "Update popularity of websites based on recent hits"
 
+    def add_arguments(self, parser):
+        parser.add_argument('-i', '--incremental', action="store_true",
+                            help='only aggregate requests since last run')
+
     def handle(self, *args, **options):
         self.info(f'Starting computing popularity of websites')
-        update_popularity_of_websites()
+        update_popularity_of_websites(incremental=options['incremental'])
         self.success(f'Finished computing popularity of websites')
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.13 on 2026-10-18 10:12
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('front', '0011_autocompletehit'),
+        ('registry', '0013_website_updated_at_uuid_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebsiteDailyHits',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('day', models.DateField()),
+                ('nb_hits', models.PositiveIntegerField()),
+                ('website', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_hits', to='registry.website')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='websitedailyhits_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('website', 'day'), name='unique_website_day')],
+            },
+        ),
+    ]
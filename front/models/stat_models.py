@@ -22,3 +22,20 @@ class AutocompleteHit(TimeStampMixin):
     item_latitude = models.FloatField(null=True)
     item_longitude = models.FloatField(null=True)
     item_uuid = models.CharField(max_length=255, null=True)
+
+
+class WebsiteDailyHits(TimeStampMixin):
+    """Number of page views of a website (and of its churches) per day, aggregated from
+    requests so that popularity can be updated incrementally"""
+    website = models.ForeignKey('registry.Website', on_delete=models.CASCADE,
+                                related_name='daily_hits')
+    day = models.DateField()
+    nb_hits = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['website', 'day'], name='unique_website_day'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='websitedailyhits_day_idx'),
+        ]
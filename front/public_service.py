@@ -1,6 +1,7 @@
 from uuid import UUID
 
 from front.services.card.church_color_service import get_church_color_by_uuid
+from front.services.search.response_cache_service import invalidate_website_responses
 from registry.models import Church
 from scheduling.public_model import SourcedSchedulesList
 
@@ -8,3 +9,7 @@ from scheduling.public_model import SourcedSchedulesList
 def front_get_church_color_by_uuid(sourced_schedules_list: SourcedSchedulesList,
                                    church_by_id: dict[int, Church]) -> dict[UUID, str]:
     return get_church_color_by_uuid(sourced_schedules_list, church_by_id)
+
+
+def front_invalidate_website_responses(website_uuid: UUID):
+    invalidate_website_responses(website_uuid)
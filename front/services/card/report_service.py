@@ -2,6 +2,7 @@ from django.http import HttpResponse, HttpResponseBadRequest, HttpRequest
 
 from core.utils.discord_utils import send_discord_alert, DiscordChanel
 from front.models import Report, ReportModeration
+from front.services.search.response_cache_service import invalidate_website_responses
 from registry.models import Website
 from core.services.admin_email_service import send_email_to_admin
 from front.utils.web_utils import get_user_user_agent_and_ip
@@ -26,6 +27,8 @@ def save_report(request: HttpRequest, report: Report):
     report.ip_address_hash = ip_address_hash
     report.user = user
     report.save()
+    # Reports are displayed in church details
+    invalidate_website_responses(report.website.uuid)
 
     if not user:
         add_necessary_moderation_for_report(report)
@@ -1,15 +1,16 @@
-import json
 import os
 from datetime import date, datetime
 from statistics import mean
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Optional
 from uuid import UUID
 
 from django.contrib.gis.geos import Point
 from django.utils.translation import gettext as _
-from folium import Map, Icon, Popup, Marker
+from folium import Map, Icon, Marker
+from pydantic import BaseModel
 
-from front.services.card.website_events_service import WebsiteEvents
+from front.services.card.website_events_service import WebsiteEvents, get_website_events
+from front.services.search.search_service import SearchResult
 from registry.models import Church
 from scheduling.utils.date_utils import format_datetime_with_locale
 
@@ -36,9 +37,33 @@ def get_latitude_longitude(point):
     return [point.coords[1], point.coords[0]]
 
 
+class MapPopup(BaseModel):
+    name: str
+    lines: list[str]
+    website_uuid: str
+
+
+class MapMarker(BaseModel):
+    latitude: float
+    longitude: float
+    icon: str
+    color: str
+    tooltip: str
+    church_uuid: str | None = None
+    popup: MapPopup | None = None
+
+
+class MapPayload(BaseModel):
+    """Everything the search map needs, rendered by Leaflet in the browser"""
+    center: list[float]
+    bounds: list[list[float]] | None
+    link_wording: str
+    markers: list[MapMarker]
+
+
 def get_popup_and_color(church: Church,
-                        website_events: WebsiteEvents
-                        ) -> Tuple[str, str]:
+                        website_events: WebsiteEvents | None
+                        ) -> Tuple[MapPopup, str]:
     next_event = website_events.next_event_in_church(church) \
         if website_events else None
     if next_event is not None:
@@ -46,77 +71,93 @@ def get_popup_and_color(church: Church,
         date_str = format_datetime_with_locale(start, "%A %d %B", 'fr_FR.UTF-8')
         year_str = f" {start.year}" \
             if start.year != date.today().year else ''
-        wording = f'{_("NextEvent")}<br>le {date_str.lower()}{year_str} à {start:%H:%M}'
+        lines = [_("NextEvent"), f'le {date_str.lower()}{year_str} à {start:%H:%M}']
         color = 'darkblue'
-    elif website_events.confession_exists:
-        wording = _("ConfessionsExist")
+    elif website_events and website_events.confession_exists:
+        lines = [_("ConfessionsExist")]
         color = 'blue'
     else:
-        wording = _("NoConfessionFound")
+        lines = [_("NoConfessionFound")]
         color = 'lightgray'
 
-    link_wording = _("JumpBelow")
-    popup_html = f"""
-        <b>{church.name}</b><br>
-        {wording}<br>
-        <a href="#{church.parish.website.uuid}" target="_parent">{link_wording}</a>
-    """
+    popup = MapPopup(
+        name=church.name,
+        lines=lines,
+        website_uuid=str(church.parish.website.uuid),
+    )
 
-    return popup_html, color
+    return popup, color
 
 
-def prepare_map(center, churches: List[Church], bounds,
-                events_by_website: dict[UUID, WebsiteEvents],
-                is_around_me: bool
-                ) -> Tuple[Map, Dict[UUID, str]]:
-    # Create Map Object
-    jawg_api_key = os.environ['JAWG_API_KEY']
-    folium_map = Map(
-        location=center,
-        tiles="https://tile.jawg.io/jawg-sunny/{z}/{x}/{y}{r}.png?"
-              f"access-token={jawg_api_key}",
-        attr='<a href="https://jawg.io" title="Tiles Courtesy of Jawg Maps" target="_blank">'
-             '&copy; <b>Jawg</b>Maps</a> &copy; <a href="https://www.openstreetmap.org/copyright">'
-             'OpenStreetMap</a> contributors',
-    )
+def get_events_by_website(search_result: SearchResult, unique_day: bool
+                          ) -> dict[UUID, WebsiteEvents]:
+    index_events_by_website = {}
+    for index_event in search_result.index_events:
+        index_events_by_website.setdefault(index_event.church.parish.website.uuid, [])\
+            .append(index_event)
 
-    if is_around_me:
-        marker = Marker(center,
-                        tooltip='Votre position',
-                        icon=Icon(icon='crosshairs', prefix='fa', color='lightred'))
-        marker.add_to(folium_map)
+    events_by_website = {}
+    for church in search_result.churches:
+        website_uuid = church.parish.website.uuid
+        if website_uuid not in events_by_website:
+            events_by_website[website_uuid] = get_website_events(
+                index_events_by_website.get(website_uuid, []),
+                search_result.events_truncated_by_website_uuid[website_uuid],
+                unique_day
+            )
 
-    # We save marker_names, they will be displayed in template and used in javascript
-    church_marker_names_by_website = {}
+    return events_by_website
 
-    for church in churches:
-        website_uuid = church.parish.website.uuid
-        website_events = events_by_website.get(website_uuid, None)
 
-        tootltip_text = f'{church.name}'
-        popup_html, color = get_popup_and_color(church, website_events)
-        marker = Marker(get_latitude_longitude(church.location),
-                        tooltip=tootltip_text,
-                        popup=Popup(html=popup_html, max_width=None),
-                        icon=Icon(icon='cross', prefix='fa', color=color))
-        church_marker_names_by_website\
-            .setdefault(website_uuid, {})[str(church.uuid)] = marker.get_name()
-        marker.add_to(folium_map)
+def get_map_payload(center, churches: List[Church], bounds,
+                    events_by_website: dict[UUID, WebsiteEvents],
+                    is_around_me: bool
+                    ) -> MapPayload:
+    markers = []
+    if is_around_me:
+        markers.append(MapMarker(
+            latitude=center[0],
+            longitude=center[1],
+            icon='crosshairs',
+            color='lightred',
+            tooltip='Votre position',
+        ))
 
+    for church in churches:
+        website_events = events_by_website.get(church.parish.website.uuid, None)
+        popup, color = get_popup_and_color(church, website_events)
+        latitude, longitude = get_latitude_longitude(church.location)
+        markers.append(MapMarker(
+            latitude=latitude,
+            longitude=longitude,
+            icon='cross',
+            color=color,
+            tooltip=church.name,
+            church_uuid=str(church.uuid),
+            popup=popup,
+        ))
+
+    map_bounds = None
     if bounds or len(churches) > 0:
         if bounds:
             min_lat, max_lat, min_long, max_long = bounds
         else:
             min_lat, max_lat, min_long, max_long = get_bounds(churches)
-        folium_map.fit_bounds([[min_lat, min_long],
-                               [max_lat, max_long]])
+        map_bounds = [[min_lat, min_long], [max_lat, max_long]]
+
+    return MapPayload(
+        center=center,
+        bounds=map_bounds,
+        link_wording=_("JumpBelow"),
+        markers=markers,
+    )
 
-    church_marker_names_json_by_website = {
-        website_uuid: json.dumps(marker_names)
-        for website_uuid, marker_names in church_marker_names_by_website.items()
-    }
 
-    return folium_map, church_marker_names_json_by_website
+def get_map_tiles_url() -> str:
+    jawg_api_key = os.environ['JAWG_API_KEY']
+
+    return ("https://tile.jawg.io/jawg-sunny/{z}/{x}/{y}{r}.png?"
+            f"access-token={jawg_api_key}")
 
 
 def get_map_with_single_location(location: Point) -> Map:
@@ -1,91 +1,188 @@
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 from uuid import UUID
 
-from django.db.models import Q
-from django.utils.timezone import make_aware
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q, Max, Sum
+from django.utils import timezone
 from request.models import Request
 
-from registry.models import Website, Church
+from front.models import WebsiteDailyHits
+from registry.models import Website, Parish, Church
 from scheduling.models import IndexEvent
 
-
-def update_popularity_of_websites():
-    now_minus_14_days = datetime.now() - timedelta(days=14)
-    all_website_requests = Request.objects.filter(
-        Q(path__startswith='/paroisse/')
-        | Q(path__startswith='/website_churches/')
-        | Q(path__startswith='/website_sources/')
-        | Q(path__startswith='/website_events/'),
-        time__gt=make_aware(now_minus_14_days)).all()
-
-    count_by_website_uuids = {}
-    for request in all_website_requests:
-        request_path = request.path
-        website_uuid = request_path.split('/')[2]
-        try:
-            website_uuid = UUID(website_uuid)
-        except ValueError:
-            print(f'Invalid UUID: {website_uuid}')
-            continue
-
-        count_by_website_uuids[website_uuid] = count_by_website_uuids.get(website_uuid, 0) + 1
-
-    all_church_requests = Request.objects.filter(
-        path__startswith='/front/api/church/',
-        time__gt=make_aware(now_minus_14_days)).all()
-
-    count_by_church_uuids = {}
-    for request in all_church_requests:
-        request_path = request.path
-        church_uuid = request_path.split('/')[4]
-        try:
-            church_uuid = UUID(church_uuid)
-        except ValueError:
-            print(f'Invalid UUID: {church_uuid}')
-            continue
-
-        count_by_church_uuids[church_uuid] = count_by_website_uuids.get(church_uuid, 0) + 1
-
-    for church_uuid, count in count_by_church_uuids.items():
-        try:
-            church = Church.objects.get(uuid=church_uuid)
-        except Church.DoesNotExist:
-            print(f'Church not found: {church_uuid}')
-            continue
-
-        website_uuid = church.parish.website_id
-        count_by_website_uuids[website_uuid] = count_by_website_uuids.get(website_uuid, 0) + count
-
-    count_by_diocese = {}
-    for website_uuid, count in count_by_website_uuids.items():
-        try:
-            website = Website.objects.get(uuid=website_uuid)
-        except Website.DoesNotExist:
-            print(f'Website not found: {website_uuid}')
+POPULARITY_WINDOW_DAYS = 14
+WEBSITE_PATH_PATTERNS = ['/paroisse/%', '/website_churches/%', '/website_sources/%',
+                         '/website_events/%']
+CHURCH_PATH_PATTERN = '/front/api/church/%'
+UUID_REGEX = '^[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}$'
+# nb_recent_hits is a PositiveSmallIntegerField
+MAX_NB_RECENT_HITS = 32767
+UPDATE_BATCH_SIZE = 1000
+
+
+def update_popularity_of_websites(incremental: bool = False):
+    first_day_of_window = timezone.localdate() - timedelta(days=POPULARITY_WINDOW_DAYS - 1)
+    first_day_to_aggregate = get_first_day_to_aggregate(first_day_of_window, incremental)
+    print(f'Aggregating hits since {first_day_to_aggregate}')
+    nb_daily_hits = aggregate_daily_hits(first_day_to_aggregate, first_day_of_window)
+    print(f'Aggregated {nb_daily_hits} daily hits')
+
+    count_by_website_uuid = get_count_by_website_uuid(first_day_of_window)
+    best_website_uuids = get_best_website_uuids(count_by_website_uuid)
+
+    nb_updated_websites = update_websites(count_by_website_uuid, best_website_uuids)
+    print(f'Updated popularity of {nb_updated_websites} websites')
+
+
+#############
+# AGGREGATE #
+#############
+
+def get_first_day_to_aggregate(first_day_of_window: date, incremental: bool) -> date:
+    if not incremental:
+        return first_day_of_window
+
+    last_aggregated_day = WebsiteDailyHits.objects.aggregate(last_day=Max('day'))['last_day']
+    if last_aggregated_day is None or last_aggregated_day < first_day_of_window:
+        return first_day_of_window
+
+    # last aggregated day was not over during previous run, hence it is aggregated again
+    return last_aggregated_day
+
+
+def aggregate_daily_hits(first_day_to_aggregate: date, first_day_of_window: date) -> int:
+    """Counts hits per website and per day, since first_day_to_aggregate, with a single
+    grouped query. Requests of church pages are counted for the website of the church."""
+    since = timezone.make_aware(datetime.combine(first_day_to_aggregate, datetime.min.time()))
+    query = f"""
+        INSERT INTO {WebsiteDailyHits._meta.db_table}
+            (uuid, created_at, updated_at, website_id, day, nb_hits)
+        SELECT gen_random_uuid(), now(), now(), website_id, day, count(*)
+        FROM (
+            SELECT r.day, COALESCE(w.uuid, p.website_id) AS website_id
+            FROM (
+                SELECT (time AT TIME ZONE %(time_zone)s)::date AS day,
+                       path LIKE %(church_pattern)s AS is_church,
+                       CASE WHEN split_part(path, '/', path_uuid_position) ~* %(uuid_regex)s
+                            THEN split_part(path, '/', path_uuid_position)::uuid
+                       END AS path_uuid
+                FROM (
+                    SELECT time, path,
+                           CASE WHEN path LIKE %(church_pattern)s THEN 5 ELSE 3 END
+                               AS path_uuid_position
+                    FROM {Request._meta.db_table}
+                    WHERE time >= %(since)s
+                      AND (path LIKE ANY(%(website_patterns)s) OR path LIKE %(church_pattern)s)
+                ) AS request
+            ) AS r
+            LEFT JOIN {Website._meta.db_table} AS w
+                ON NOT r.is_church AND w.uuid = r.path_uuid
+            LEFT JOIN {Church._meta.db_table} AS c
+                ON r.is_church AND c.uuid = r.path_uuid
+            LEFT JOIN {Parish._meta.db_table} AS p
+                ON p.uuid = c.parish_id
+        ) AS hit
+        WHERE website_id IS NOT NULL
+        GROUP BY website_id, day
+    """
+    params = {
+        'time_zone': settings.TIME_ZONE,
+        'church_pattern': CHURCH_PATH_PATTERN,
+        'website_patterns': WEBSITE_PATH_PATTERNS,
+        'uuid_regex': UUID_REGEX,
+        'since': since,
+    }
+
+    with transaction.atomic():
+        WebsiteDailyHits.objects.filter(
+            Q(day__gte=first_day_to_aggregate) | Q(day__lt=first_day_of_window)
+        ).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.rowcount
+
+
+def get_count_by_website_uuid(first_day_of_window: date) -> dict[UUID, int]:
+    return {
+        website_uuid: nb_hits
+        for website_uuid, nb_hits in WebsiteDailyHits.objects
+        .filter(day__gte=first_day_of_window)
+        .values('website_id')
+        .annotate(nb_hits=Sum('nb_hits'))
+        .values_list('website_id', 'nb_hits')
+    }
+
+
+########
+# BEST #
+########
+
+def get_best_website_uuids(count_by_website_uuid: dict[UUID, int]) -> set[UUID]:
+    """For each diocese, the most visited website, preferably among websites with events"""
+    diocese_uuid_by_website_uuid = {}
+    for website_uuid, diocese_uuid in Parish.objects \
+            .filter(website_id__in=count_by_website_uuid.keys()) \
+            .order_by('created_at') \
+            .values_list('website_id', 'diocese_id'):
+        diocese_uuid_by_website_uuid.setdefault(website_uuid, diocese_uuid)
+
+    website_uuids_with_events = set(
+        IndexEvent.objects
+        .filter(church__parish__website_id__in=count_by_website_uuid.keys())
+        .values_list('church__parish__website_id', flat=True)
+        .distinct()
+    )
+
+    best_website_uuid_by_diocese_uuid = {}
+    for website_uuid, count in count_by_website_uuid.items():
+        diocese_uuid = diocese_uuid_by_website_uuid.get(website_uuid, None)
+        if diocese_uuid is None:
             continue
 
-        diocese = website.get_diocese()
-        count_by_diocese.setdefault(diocese, {})[website] = count
-        if count != website.nb_recent_hits:
-            website.nb_recent_hits = count
-            website.save()
-
-    print('Computing best website for each diocese')
-    for diocese, count_by_website in count_by_diocese.items():
-        best_website = get_best_website_for_diocese(count_by_website)
-        print(f'Best website for {diocese.name}: {best_website} '
-              f'with count {count_by_website[best_website]}')
-        if not best_website.is_best_diocese_hit:
-            best_website.is_best_diocese_hit = True
-            best_website.save()
-        print('Setting is_best_diocese_hit to False for other websites')
-        Website.objects.filter(is_best_diocese_hit=True).exclude(uuid=best_website.uuid)\
-            .update(is_best_diocese_hit=False)
-
-
-def get_best_website_for_diocese(count_by_website: dict[Website, int], ) -> Website:
-    for website, count in sorted(count_by_website.items(), key=lambda item: item[1], reverse=True):
-        if IndexEvent.objects.filter(church__parish__website=website).exists():
-            return website
-
-    return max(count_by_website, key=count_by_website.get)
+        best_website_uuid = best_website_uuid_by_diocese_uuid.get(diocese_uuid, None)
+        if best_website_uuid is None or (
+                (website_uuid in website_uuids_with_events, count)
+                > (best_website_uuid in website_uuids_with_events,
+                   count_by_website_uuid[best_website_uuid])):
+            best_website_uuid_by_diocese_uuid[diocese_uuid] = website_uuid
+
+    return set(best_website_uuid_by_diocese_uuid.values())
+
+
+##########
+# UPDATE #
+##########
+
+def update_websites(count_by_website_uuid: dict[UUID, int], best_website_uuids: set[UUID]
+                    ) -> int:
+    """Only websites whose popularity has changed are updated, by batches"""
+    rows_to_update = []
+    for website_uuid, nb_recent_hits, is_best_diocese_hit in Website.objects.filter(
+            Q(nb_recent_hits__gt=0)
+            | Q(is_best_diocese_hit=True)
+            | Q(uuid__in=count_by_website_uuid.keys())
+    ).values_list('uuid', 'nb_recent_hits', 'is_best_diocese_hit'):
+        new_nb_recent_hits = min(count_by_website_uuid.get(website_uuid, 0), MAX_NB_RECENT_HITS)
+        new_is_best_diocese_hit = website_uuid in best_website_uuids
+        if (new_nb_recent_hits, new_is_best_diocese_hit) \
+                != (nb_recent_hits, is_best_diocese_hit):
+            rows_to_update.append((website_uuid, new_nb_recent_hits, new_is_best_diocese_hit))
+
+    for i in range(0, len(rows_to_update), UPDATE_BATCH_SIZE):
+        bulk_update_websites(rows_to_update[i:i + UPDATE_BATCH_SIZE])
+
+    return len(rows_to_update)
+
+
+def bulk_update_websites(rows: list[tuple[UUID, int, bool]]):
+    values = ', '.join(['(%s::uuid, %s::smallint, %s::boolean)'] * len(rows))
+    query = f"""
+        UPDATE {Website._meta.db_table} AS w
+        SET nb_recent_hits = v.nb_recent_hits,
+            is_best_diocese_hit = v.is_best_diocese_hit
+        FROM (VALUES {values}) AS v (uuid, nb_recent_hits, is_best_diocese_hit)
+        WHERE w.uuid = v.uuid
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(query, [value for row in rows for value in row])
@@ -0,0 +1,125 @@
+import math
+from datetime import date
+from typing import Callable
+from uuid import UUID, uuid4
+
+from django.core.cache import caches, BaseCache
+
+from scheduling.utils.hash_utils import hash_dict_to_hex
+
+RESPONSE_CACHE_ALIAS = 'front_api'
+# Events end during the day, and aggregations are not invalidated per website
+RESPONSE_CACHE_TIMEOUT = 10 * 60
+# 3 decimals is ~100m, which can not be seen on a map showing several churches
+BOX_DECIMALS = 3
+GENERATION_KEY = 'website_versions_generation'
+
+
+def get_response_cache() -> BaseCache:
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+#################
+# NORMALIZATION #
+#################
+
+def round_down(value: float) -> float:
+    factor = 10 ** BOX_DECIMALS
+    return math.floor(value * factor) / factor
+
+
+def round_up(value: float) -> float:
+    factor = 10 ** BOX_DECIMALS
+    return math.ceil(value * factor) / factor
+
+
+def normalize_box(min_lat: float | None, min_lng: float | None,
+                  max_lat: float | None, max_lng: float | None) -> tuple:
+    """Close boxes share the same cache entry, the box is widened so that it still contains
+    the requested one"""
+    if min_lat is None or min_lng is None or max_lat is None or max_lng is None:
+        return min_lat, min_lng, max_lat, max_lng
+
+    return round_down(min_lat), round_down(min_lng), round_up(max_lat), round_up(max_lng)
+
+
+def normalize_coordinate(value: float | None) -> float | None:
+    if value is None:
+        return None
+
+    return round(value, BOX_DECIMALS)
+
+
+def build_response_key(name: str, **params) -> str:
+    # Time filters are relative to the current day
+    params['today'] = date.today()
+
+    return f'{name}:{hash_dict_to_hex(params)}'
+
+
+####################
+# WEBSITE VERSIONS #
+####################
+
+def get_website_version_key(website_uuid: UUID | str) -> str:
+    return f'website_version:{website_uuid}'
+
+
+def get_website_versions(website_uuids: set[UUID | str]) -> dict[str, str]:
+    cache = get_response_cache()
+    uuid_by_key = {get_website_version_key(website_uuid): str(website_uuid)
+                   for website_uuid in website_uuids}
+    versions = cache.get_many(uuid_by_key.keys())
+
+    missing_keys = [key for key in uuid_by_key if key not in versions]
+    if missing_keys:
+        # A version that has been evicted must not match the ones of cached responses
+        for key in missing_keys:
+            cache.add(key, uuid4().hex, None)
+        versions |= cache.get_many(missing_keys)
+
+    return {uuid_by_key[key]: version for key, version in versions.items()}
+
+
+def get_generation() -> str:
+    """Changes on each invalidation, whatever the website"""
+    cache = get_response_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid4().hex, None)
+        generation = cache.get(GENERATION_KEY)
+
+    return generation
+
+
+def invalidate_website_responses(website_uuid: UUID):
+    cache = get_response_cache()
+    cache.set(get_website_version_key(website_uuid), uuid4().hex, None)
+    cache.set(GENERATION_KEY, uuid4().hex, None)
+
+
+########
+# MAIN #
+########
+
+def get_or_set_cached_content(key: str,
+                              get_content: Callable[[], tuple[bytes, set[UUID]]],
+                              timeout: int = RESPONSE_CACHE_TIMEOUT) -> bytes:
+    """get_content returns the content and the uuids of websites it depends on.
+    The content is cached until one of these websites is invalidated. It is not cached when
+    a website has been invalidated while it was computed, since it may be outdated."""
+    cache = get_response_cache()
+    cached_response = cache.get(key)
+    if cached_response is not None:
+        content, website_versions = cached_response
+        if get_website_versions(set(website_versions)) == website_versions:
+            return content
+
+    # An invalidation while content is computed would give the new version to outdated content
+    generation = get_generation()
+    content, website_uuids = get_content()
+    website_versions = get_website_versions(website_uuids)
+    if get_generation() == generation:
+        cache.set(key, (content, website_versions), timeout)
+
+    return content
@@ -1,19 +1,19 @@
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Literal
 from uuid import UUID
 
 from django.contrib.gis.db.models import Collect, Extent
 from django.contrib.gis.db.models.functions import Distance, Centroid
 from django.contrib.gis.geos import Point, Polygon
-from django.db.models import QuerySet, OuterRef, Subquery, Exists, Q, \
-    Count, Case, When
+from django.db.models import QuerySet, OuterRef, Exists, Q, \
+    Count, Case, When, ExpressionWrapper, BooleanField, F
 from django.utils.timezone import make_aware
 from pydantic import BaseModel
 
 from front.utils.city_utils import get_municipality_name
 from registry.models import Church, Website, Diocese
-from scheduling.models import IndexEvent
+from scheduling.models import IndexEvent, ChurchAvailability
 from scheduling.utils.date_utils import time_from_minutes
 
 MAX_CHURCHES_IN_RESULTS = 50
@@ -31,10 +31,12 @@ class TimeFilter(BaseModel):
     hour_max: int | None
     legacy_search: bool = False
 
+    def has_hour_filter(self):
+        return (self.hour_min is not None and self.hour_min != 0) \
+            or (self.hour_max is not None and self.hour_max != 24 * 60 - 1)
+
     def is_null(self):
-        return self.day_filter is None \
-            and (self.hour_min is None or self.hour_min == 0) \
-            and (self.hour_max is None or self.hour_max == 24 * 60 - 1)
+        return self.day_filter is None and not self.has_hour_filter()
 
 
 @dataclass
@@ -56,20 +58,58 @@ def build_event_subquery(time_filter: TimeFilter):
     return event_query
 
 
+def build_availability_subquery(time_filter: TimeFilter):
+    availability_query = ChurchAvailability.objects.filter(
+        church_id=OuterRef('pk'),
+        last_indexed_end_tz_datetime__gte=make_aware(datetime.now()),
+    )
+    if time_filter.day_filter:
+        availability_query = availability_query.filter(
+            event_days__contains=[time_filter.day_filter])
+
+    return availability_query
+
+
+def is_availability_exact(time_filter: TimeFilter) -> bool:
+    """ChurchAvailability does not know about hours, nor which events of a given day are over.
+    Days are local to the church, so tomorrow can already be over in far timezones."""
+    if time_filter.has_hour_filter():
+        return False
+
+    return time_filter.day_filter is None \
+        or time_filter.day_filter > date.today() + timedelta(days=1)
+
+
+def build_has_event_condition(time_filter: TimeFilter) -> Q:
+    has_event = Q(Exists(build_availability_subquery(time_filter)))
+    if not is_availability_exact(time_filter):
+        # IndexEvent are only looked up for churches having an event on that day
+        has_event &= Q(Exists(build_event_subquery(time_filter)))
+
+    return has_event
+
+
+def annotate_has_event(church_query: QuerySet[Church],
+                       time_filter: TimeFilter) -> QuerySet[Church]:
+    return church_query.annotate(has_event=ExpressionWrapper(
+        build_has_event_condition(time_filter), output_field=BooleanField()))
+
+
 def build_base_church_query() -> QuerySet[Church]:
     return Church.objects.filter(is_active=True, parish__website__is_active=True)
 
 
 def build_church_query(time_filter: TimeFilter) -> QuerySet[Church]:
-    event_query = build_event_subquery(time_filter).order_by(
-        'day',
-        'start_time'
-    ).values('uuid')
-
     church_query = build_base_church_query().select_related('parish__website')
     if time_filter.legacy_search:
         church_query = church_query.prefetch_related('parish__website__reports')
-    church_query = church_query.annotate(next_event_uuid=Subquery(event_query[:1])) \
+    # Next event is read from ChurchAvailability, through a join on its unique church key
+    church_query = church_query.annotate(
+        last_indexed_end_tz_datetime=F('availability__last_indexed_end_tz_datetime'),
+        next_event_uuid=F('availability__next_event_uuid'),
+        next_event_indexed_end_tz_datetime=F(
+            'availability__next_event_indexed_end_tz_datetime'),
+    ) \
         .only("name",
               "address",
               "city",
@@ -83,7 +123,7 @@ def build_church_query(time_filter: TimeFilter) -> QuerySet[Church]:
               )
 
     if not time_filter.is_null():
-        church_query = church_query.filter(next_event_uuid__isnull=False)
+        church_query = church_query.filter(build_has_event_condition(time_filter))
 
     return church_query
 
@@ -120,7 +160,8 @@ def truncate_results(church_query: QuerySet[Church],
     if not time_filter.legacy_search:
         church_by_uuid = {church.uuid: church for church in churches}
         events = fetch_events(church_by_uuid, time_filter)
-        all_churches_have_events = all(church.next_event_uuid is not None for church in churches)
+        all_churches_have_events = all(has_next_event(church, time_filter)
+                                       for church in churches)
         events_truncated_by_website_uuid = {church.parish.website.uuid: False
                                             for church in churches}
     else:
@@ -145,13 +186,13 @@ def truncate_results(church_query: QuerySet[Church],
             else:
                 non_truncated_churches.append(church)
 
-            if church.next_event_uuid is None:
+            if not has_next_event(church, time_filter):
                 all_churches_have_events = False
 
         non_truncated_church_by_uuid = {church.uuid: church for church in non_truncated_churches}
         truncated_church_by_uuid = {church.uuid: church for church in truncated_churches}
         events = fetch_events(non_truncated_church_by_uuid, time_filter) \
-            + fetch_next_event(truncated_church_by_uuid)
+            + fetch_next_event(truncated_church_by_uuid, time_filter)
 
     return SearchResult(
         index_events=events,
@@ -170,10 +211,42 @@ def fetch_events(church_by_uuid: dict[UUID, Church],
     return list(events)
 
 
-def fetch_next_event(church_by_uuid: dict[UUID, Church]) -> list[IndexEvent]:
-    events_uuid = [church.next_event_uuid for church in church_by_uuid.values()
-                   if church.next_event_uuid]
-    events = IndexEvent.objects.filter(uuid__in=events_uuid)
+def has_next_event(church: Church, time_filter: TimeFilter) -> bool:
+    if not time_filter.is_null():
+        # Churches have been filtered on having an event matching the time filter
+        return True
+
+    return church.last_indexed_end_tz_datetime is not None \
+        and church.last_indexed_end_tz_datetime >= make_aware(datetime.now())
+
+
+def is_stored_next_event_exact(church: Church, time_filter: TimeFilter) -> bool:
+    """Next event stored in ChurchAvailability ignores time filters, and can be over"""
+    return time_filter.is_null() \
+        and church.next_event_indexed_end_tz_datetime is not None \
+        and church.next_event_indexed_end_tz_datetime >= make_aware(datetime.now())
+
+
+def fetch_next_event(church_by_uuid: dict[UUID, Church],
+                     time_filter: TimeFilter) -> list[IndexEvent]:
+    stored_event_uuids = []
+    church_uuids_to_look_up = []
+    for church in church_by_uuid.values():
+        if is_stored_next_event_exact(church, time_filter):
+            stored_event_uuids.append(church.next_event_uuid)
+        elif has_next_event(church, time_filter):
+            church_uuids_to_look_up.append(church.uuid)
+
+    event_condition = Q(uuid__in=stored_event_uuids)
+    if church_uuids_to_look_up:
+        # Next event of each remaining church, in a single query
+        next_event_query = add_event_filters(
+            IndexEvent.objects.filter(church_id__in=church_uuids_to_look_up), time_filter) \
+            .order_by('church_id', 'day', 'start_time') \
+            .distinct('church_id') \
+            .values('uuid')
+        event_condition |= Q(uuid__in=next_event_query)
+    events = IndexEvent.objects.filter(event_condition)
 
     for event in events:
         event.church = church_by_uuid.get(event.church_id)
@@ -207,9 +280,9 @@ def get_churches_around(center, time_filter: TimeFilter,
 
 def get_churches_in_box(min_lat, min_long, max_lat, max_long, time_filter: TimeFilter
                         ) -> SearchResult:
-    church_query = filter_in_box(build_church_query(time_filter),
-                                 min_lat, min_long, max_lat, max_long)\
-        .annotate(has_event=Exists(build_event_subquery(time_filter)))\
+    church_query = annotate_has_event(filter_in_box(build_church_query(time_filter),
+                                                    min_lat, min_long, max_lat, max_long),
+                                      time_filter)\
         .order_by(
         '-has_event',
         '-parish__website__nb_recent_hits'
@@ -242,8 +315,7 @@ def get_churches_by_diocese(
         diocese: Diocese,
         time_filter: TimeFilter,
 ) -> SearchResult:
-    event_query = build_event_subquery(time_filter)
-    church_query = build_church_query(time_filter).annotate(has_event=Exists(event_query))\
+    church_query = annotate_has_event(build_church_query(time_filter), time_filter)\
         .filter(parish__diocese=diocese)\
         .order_by(
         '-has_event',
@@ -255,10 +327,9 @@ def get_churches_by_diocese(
 
 def get_popular_churches(min_lat, min_long, max_lat, max_long, time_filter: TimeFilter,
                          ) -> SearchResult:
-    event_query = build_event_subquery(time_filter)
-    church_query = filter_in_box(build_church_query(time_filter),
-                                 min_lat, min_long, max_lat, max_long)\
-        .annotate(has_event=Exists(event_query))\
+    church_query = annotate_has_event(filter_in_box(build_church_query(time_filter),
+                                                    min_lat, min_long, max_lat, max_long),
+                                      time_filter)\
         .order_by(
         '-has_event',
         '-parish__website__is_best_diocese_hit',
@@ -296,9 +367,7 @@ def get_count_per_area(
     church_query = filter_in_box(build_base_church_query(), min_lat, min_long, max_lat, max_long)
 
     if not time_filter.is_null():
-        church_query = church_query \
-            .annotate(has_event=Exists(build_event_subquery(time_filter))) \
-            .filter(has_event=True)
+        church_query = church_query.filter(build_has_event_condition(time_filter))
 
     church_query = church_query \
         .values(*set(area_name_keys + identifier_keys)) \
@@ -310,7 +379,7 @@ def get_count_per_area(
     if time_filter.is_null():
         church_query = church_query \
             .annotate(church_with_event_count=Count(Case(
-                When(Exists(build_event_subquery(time_filter)), then='uuid'),
+                When(build_has_event_condition(time_filter), then='uuid'),
                 default=None,
             )))
 
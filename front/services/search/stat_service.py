@@ -1,3 +1,4 @@
+from core.services.analytics_sink_service import analytics_sink
 from front.models import SearchHit
 from front.utils.web_utils import get_user_user_agent_and_ip
 
@@ -12,4 +13,4 @@ def new_search_hit(request, nb_websites):
         user_agent=user_agent,
         ip_address_hash=ip_address_hash,
     )
-    search_hit.save()
+    analytics_sink.add(search_hit)
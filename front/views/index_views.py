@@ -19,7 +19,8 @@ from front.services.card.website_moderations_service import get_all_website_mode
 from front.services.card.website_schedules_service import get_website_schedules
 from front.services.search.autocomplete_service import get_aggregated_response
 from front.services.search.filter_service import get_filter_days
-from front.services.search.map_service import prepare_map, get_center, get_cities_label
+from front.services.search.map_service import get_map_payload, get_center, get_cities_label, \
+    get_map_tiles_url, get_events_by_website
 from front.services.search.search_service import TimeFilter, get_churches_in_box, \
     get_churches_by_website, get_churches_around, get_churches_by_diocese, get_popular_churches, \
     fetch_events, DEFAULT_SEARCH_BOX, SearchResult
@@ -61,43 +62,11 @@ def render_map(request, center,
         church_uuids_json_by_website[website_uuid] = \
             json.dumps([str(church.uuid) for church in churches_list])
 
-    index_events_by_website = {}
-    for index_event in search_result.index_events:
-        index_events_by_website.setdefault(index_event.church.parish.website.uuid, [])\
-            .append(index_event)
+    events_by_website = get_events_by_website(search_result, time_filter.day_filter is not None)
 
-    events_by_website = {}
-    for website in websites:
-        events_by_website[website.uuid] = get_website_events(
-            index_events_by_website.get(website.uuid, []),
-            search_result.events_truncated_by_website_uuid[website.uuid],
-            time_filter.day_filter is not None
-        )
-
-    # We prepare the map
-    folium_map, church_marker_names_json_by_website = prepare_map(
-        center, search_result.churches, bounds, events_by_website, is_around_me)
-
-    # Get HTML Representation of Map Object
-    map_html = folium_map._repr_html_()
-
-    # Hack 1: we add an id to iframe of map since we need to get the element in javascript
-    # Hack 2: we add the name of the map js object as attribute since we will need to retrieve it
-    map_html = map_html.replace(
-        '<iframe srcdoc=',
-        f'<iframe id="map-iframe" data-map-name="{folium_map.get_name()}" srcdoc='
-    )
-
-    # Hack 3: we add a class to force map to be a squared on mobile in CSS
-    map_html = map_html.replace(
-        '<div style="position:relative;width:100%;height:0;padding-bottom:60%;">',
-        '<div class="map-container">'
-    )
-
-    # Hack 4: add border radius to map
-    text_to_find = ('style="position:absolute;width:100%;height:100%;left:0;top:0;'
-                    'border:none !important;')
-    map_html = map_html.replace(text_to_find, text_to_find + 'border-radius:1em;')
+    # We prepare the map, it is rendered by javascript
+    map_payload = get_map_payload(center, search_result.churches, bounds, events_by_website,
+                                  is_around_me)
 
     # Count reports for each website
     website_reports_count = {}
@@ -131,8 +100,8 @@ def render_map(request, center,
         'location': location,
         'latitude': latitude,
         'longitude': longitude,
-        'map_html': map_html,
-        'church_marker_names_json_by_website': church_marker_names_json_by_website,
+        'map_payload': map_payload.model_dump(),
+        'map_tiles_url': get_map_tiles_url(),
         'church_uuids_json_by_website': church_uuids_json_by_website,
         'websites': websites,
         'events_by_website': events_by_website,
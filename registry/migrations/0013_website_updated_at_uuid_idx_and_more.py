@@ -0,0 +1,25 @@
+# Generated by Django 5.2.13 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0012_alter_churchmoderation_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='website',
+            index=models.Index(fields=['updated_at', 'uuid'], name='website_updated_at_uuid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parish',
+            index=models.Index(fields=['updated_at', 'uuid'], name='parish_updated_at_uuid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='church',
+            index=models.Index(fields=['updated_at', 'uuid'], name='church_updated_at_uuid_idx'),
+        ),
+    ]
@@ -38,6 +38,12 @@ class Website(TimeStampMixin):
     contact_emails = ArrayField(models.CharField(max_length=100), null=True, blank=True)
     history = HistoricalRecords()
 
+    class Meta:
+        indexes = [
+            # For keyset pagination of the public api
+            models.Index(fields=['updated_at', 'uuid'], name='website_updated_at_uuid_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -68,6 +74,12 @@ class Parish(TimeStampMixin):
     diocese = models.ForeignKey('Diocese', on_delete=models.CASCADE, related_name='parishes')
     history = HistoricalRecords()
 
+    class Meta:
+        indexes = [
+            # For keyset pagination of the public api
+            models.Index(fields=['updated_at', 'uuid'], name='parish_updated_at_uuid_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -92,6 +104,8 @@ class Church(TimeStampMixin):
     class Meta:
         indexes = [
             GistIndex(fields=['location']),
+            # For keyset pagination of the public api
+            models.Index(fields=['updated_at', 'uuid'], name='church_updated_at_uuid_idx'),
         ]
 
     def get_desc(self) -> str:
@@ -0,0 +1,47 @@
+import glob
+import os
+import time
+
+from core.management.abstract_command import AbstractCommand
+from scheduling.utils.html_utils import split_lines, stringify_html
+from scheduling.workflows.pruning.extract.tag_line import get_tags_with_regex
+from scheduling.workflows.pruning.extract_v2.tag_line import get_temporal_tags_with_regex, \
+    get_event_mention_tags_with_regex
+
+
+class Command(AbstractCommand):
+    help = "Benchmark stringifying and regex tagging of lines on refined html files, " \
+           "e.g. crawling/tests/fixtures/refine/*-output.html"
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='refined html files or directories')
+        parser.add_argument('-r', '--repeat', help='number of runs', type=int, default=10)
+
+    def handle(self, *args, **options):
+        lines = []
+        for path in options['paths']:
+            file_paths = sorted(glob.glob(f'{path}/**/*.html', recursive=True)) \
+                if os.path.isdir(path) else [path]
+            for file_path in file_paths:
+                with open(file_path) as f:
+                    lines.extend(split_lines(f.read()))
+        stringified_lines = list(map(stringify_html, lines))
+        self.info(f'Benchmarking tagging on {len(stringified_lines)} lines')
+
+        self.benchmark('stringify_html', stringify_html, lines, options['repeat'])
+        for name, func in [
+            ('get_tags_with_regex', get_tags_with_regex),
+            ('get_temporal_tags_with_regex', get_temporal_tags_with_regex),
+            ('get_event_mention_tags_with_regex', get_event_mention_tags_with_regex),
+        ]:
+            self.benchmark(name, func, stringified_lines, options['repeat'])
+
+        self.success('Benchmark done')
+
+    def benchmark(self, name: str, func, lines: list[str], repeat: int):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for line in lines:
+                func(line)
+        duration = (time.perf_counter() - start) / repeat
+        self.info(f'{name}: {duration * 1000:.1f}ms, {len(lines) / duration:.0f} lines/s')
@@ -1,11 +1,16 @@
+import time
+
 from core.management.abstract_command import AbstractCommand
-from scheduling.models.pruning_models import Classifier
-from scheduling.services.pruning.classify_sentence_service import get_ml_label
+from scheduling.models.pruning_models import Classifier, Sentence
+from scheduling.services.pruning.classify_sentence_service import get_ml_labels, \
+    iter_sentence_batches
+from scheduling.services.pruning.similar_sentence_service import get_knn_label
 from scheduling.services.pruning.sentence_outliers_service import add_sentence_moderation, \
-    remove_sentence_not_validated_moderation, add_sentence_v2_moderation, \
-    remove_sentence_not_validated_v2_moderation
+    remove_sentences_not_validated_moderation, add_sentence_v2_moderation, \
+    remove_sentences_not_validated_v2_moderation
 from scheduling.services.pruning.train_classifier_service import build_sentence_dataset, \
     extract_label
+from scheduling.utils.enum_utils import StringEnum
 from scheduling.workflows.pruning.extract.models import Action
 
 
@@ -16,6 +21,9 @@ class Command(AbstractCommand):
     def add_arguments(self, parser):
         parser.add_argument('-t', '--target', type=Classifier.Target,
                             choices=list(Classifier.Target), help='Target of the classifier')
+        parser.add_argument('--knn', action="store_true",
+                            help='compare human labels to the ones of the nearest human '
+                                 'labelled sentences, instead of the classifier prediction')
 
     def handle(self, *args, **options):
         target = options['target']
@@ -25,42 +33,83 @@ class Command(AbstractCommand):
             targets = [Classifier.Target.ACTION, Classifier.Target.CONFESSION]
 
         for target in targets:
-            self.handle_for_target(target)
+            self.handle_for_target(target, options['knn'])
+
+    @staticmethod
+    def get_other_labels(sentences: list[Sentence], target: Classifier.Target,
+                         use_knn: bool) -> list[StringEnum]:
+        knn_labels = [get_knn_label(sentence, target) if use_knn else None
+                      for sentence in sentences]
+
+        # Without human labelled neighbour, we fall back on the classifier
+        ml_labels = iter(get_ml_labels([sentence for sentence, knn_label
+                                        in zip(sentences, knn_labels) if knn_label is None],
+                                       target))
+
+        return [knn_label if knn_label is not None else next(ml_labels)
+                for knn_label in knn_labels]
 
-    def handle_for_target(self, target: Classifier.Target):
+    def handle_for_target(self, target: Classifier.Target, use_knn: bool):
         self.info(f'Finding sentence outliers for target {target}...')
         sentence_dataset = build_sentence_dataset(target)
-        if not sentence_dataset:
+        dataset_size = sentence_dataset.count()
+        if not dataset_size:
             self.warning(f'No sentence found')
             return
 
-        self.info(f'Got {len(sentence_dataset)} sentences for target {target}')
+        self.info(f'Got {dataset_size} sentences for target {target}')
 
         nb_sentence_outliers = 0
-        for sentence in sentence_dataset:
+        counter = 0
+        start = time.perf_counter()
+        for sentence_batch in iter_sentence_batches(sentence_dataset):
             if target == Classifier.Target.ACTION:
-                human_label = extract_label(sentence, target)
-                ml_label = get_ml_label(sentence, target)
-                if ml_label != human_label:
-                    self.warning(f'Got {ml_label} vs human label {human_label} '
-                                 f'on line "{sentence.line}"')
-                    nb_sentence_outliers += 1
-                    assert isinstance(ml_label, Action)
-                    add_sentence_moderation(sentence, other_action=ml_label)
-                else:
-                    remove_sentence_not_validated_moderation(sentence)
+                nb_sentence_outliers += self.handle_action_batch(sentence_batch, use_knn)
             else:
-                human_confession = extract_label(sentence, Classifier.Target.CONFESSION)
-                human_temporal = extract_label(sentence, Classifier.Target.TEMPORAL)
+                nb_sentence_outliers += self.handle_v2_batch(sentence_batch, use_knn)
+            counter += len(sentence_batch)
+            self.info(f'Checked {counter} sentences '
+                      f'({counter / (time.perf_counter() - start):.0f} rows/s)')
 
-                ml_confession = get_ml_label(sentence, Classifier.Target.CONFESSION)
-                ml_temporal = get_ml_label(sentence, Classifier.Target.TEMPORAL)
+        self.success(f'Done! Got {nb_sentence_outliers} sentence outliers '
+                     f'({nb_sentence_outliers / dataset_size * 100:.2f} %)')
 
-                if human_confession != ml_confession or human_temporal != ml_temporal:
-                    nb_sentence_outliers += 1
-                    add_sentence_v2_moderation(sentence)
-                else:
-                    remove_sentence_not_validated_v2_moderation(sentence)
+    def handle_action_batch(self, sentences: list[Sentence], use_knn: bool) -> int:
+        target = Classifier.Target.ACTION
+        ml_labels = self.get_other_labels(sentences, target, use_knn)
 
-        self.success(f'Done! Got {nb_sentence_outliers} sentence outliers '
-                     f'({nb_sentence_outliers / len(sentence_dataset) * 100:.2f} %)')
+        nb_sentence_outliers = 0
+        sentences_without_outlier = []
+        for sentence, ml_label in zip(sentences, ml_labels):
+            human_label = extract_label(sentence, target)
+            if ml_label != human_label:
+                self.warning(f'Got {ml_label} vs human label {human_label} '
+                             f'on line "{sentence.line}"')
+                nb_sentence_outliers += 1
+                assert isinstance(ml_label, Action)
+                add_sentence_moderation(sentence, other_action=ml_label)
+            else:
+                sentences_without_outlier.append(sentence)
+        remove_sentences_not_validated_moderation(sentences_without_outlier)
+
+        return nb_sentence_outliers
+
+    def handle_v2_batch(self, sentences: list[Sentence], use_knn: bool) -> int:
+        ml_confessions = self.get_other_labels(sentences, Classifier.Target.CONFESSION, use_knn)
+        ml_temporals = self.get_other_labels(sentences, Classifier.Target.TEMPORAL, use_knn)
+
+        nb_sentence_outliers = 0
+        sentences_without_outlier = []
+        for sentence, ml_confession, ml_temporal in zip(sentences, ml_confessions,
+                                                        ml_temporals):
+            human_confession = extract_label(sentence, Classifier.Target.CONFESSION)
+            human_temporal = extract_label(sentence, Classifier.Target.TEMPORAL)
+
+            if human_confession != ml_confession or human_temporal != ml_temporal:
+                nb_sentence_outliers += 1
+                add_sentence_v2_moderation(sentence)
+            else:
+                sentences_without_outlier.append(sentence)
+        remove_sentences_not_validated_v2_moderation(sentences_without_outlier)
+
+        return nb_sentence_outliers
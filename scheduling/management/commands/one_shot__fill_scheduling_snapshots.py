@@ -0,0 +1,21 @@
+from core.management.abstract_command import AbstractCommand
+from scheduling.models import Scheduling
+from scheduling.services.scheduling.scheduling_snapshot_service import refresh_public_snapshot
+
+
+class Command(AbstractCommand):
+    help = "One shot command to fill public snapshot of schedulings indexed before it existed."
+
+    def handle(self, *args, **options):
+        self.info('Starting one shot command to fill public snapshot of schedulings.')
+
+        counter = 0
+        for scheduling in Scheduling.objects.filter(status=Scheduling.Status.INDEXED,
+                                                    public_snapshot__isnull=True).all():
+            refresh_public_snapshot(scheduling)
+            # updated_at is kept, the public data has not changed
+            Scheduling.objects.filter(uuid=scheduling.uuid)\
+                .update(public_snapshot=scheduling.public_snapshot)
+            counter += 1
+
+        self.success(f'Successfully filled public snapshot of {counter} schedulings.')
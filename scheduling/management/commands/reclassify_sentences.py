@@ -1,12 +1,10 @@
-from tqdm import tqdm
+import time
 
 from core.management.abstract_command import AbstractCommand
 from scheduling.models.pruning_models import Classifier
 from scheduling.services.pruning.classify_sentence_service import \
-    get_sentences_with_wrong_classifier, \
-    classify_existing_sentences
-from scheduling.services.pruning.train_classifier_service import set_label
-from scheduling.utils.list_utils import chunk_list
+    get_sentences_with_wrong_classifier, iter_sentence_batches, reclassify_sentences, \
+    SENTENCE_BATCH_SIZE
 
 
 class Command(AbstractCommand):
@@ -15,6 +13,8 @@ class Command(AbstractCommand):
     def add_arguments(self, parser):
         parser.add_argument('-t', '--target', type=Classifier.Target,
                             choices=list(Classifier.Target), help='Target of the classifier')
+        parser.add_argument('-b', '--batch-size', type=int, default=SENTENCE_BATCH_SIZE,
+                            help='number of sentences predicted and saved at once')
 
     def handle(self, *args, **options):
         target = options['target']
@@ -24,18 +24,17 @@ class Command(AbstractCommand):
             targets = [t for t in Classifier.Target]
 
         for target in targets:
-            self.reclassify_for_target(target)
+            self.reclassify_for_target(target, options['batch_size'])
 
-    def reclassify_for_target(self, target: Classifier.Target):
+    def reclassify_for_target(self, target: Classifier.Target, batch_size: int):
         self.info(f'Reclassifying all sentences with the latest model for target {target}')
         sentences = get_sentences_with_wrong_classifier(target)
         counter = 0
-        for sentence_chunk in tqdm(list(chunk_list(sentences, 100))):
-            ml_labels, classifier = classify_existing_sentences(sentence_chunk, target)
-            assert len(ml_labels) == len(sentence_chunk)
-            for i, ml_label in enumerate(ml_labels):
-                sentence = sentence_chunk[i]
-                set_label(sentence, ml_label, classifier)
-                sentence.save()
-                counter += 1
-        self.success(f'Finished reclassifying {counter} sentences for target {target}')
+        start = time.perf_counter()
+        for sentence_batch in iter_sentence_batches(sentences, batch_size):
+            reclassify_sentences(sentence_batch, target)
+            counter += len(sentence_batch)
+            self.info(f'Reclassified {counter} sentences '
+                      f'({counter / (time.perf_counter() - start):.0f} rows/s)')
+        self.success(f'Finished reclassifying {counter} sentences for target {target} '
+                     f'in {time.perf_counter() - start:.1f}s')
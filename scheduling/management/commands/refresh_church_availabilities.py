@@ -0,0 +1,12 @@
+from core.management.abstract_command import AbstractCommand
+from scheduling.services.scheduling.church_availability_service import \
+    refresh_church_availabilities
+
+
+class Command(AbstractCommand):
+    help = "Recompute the availability of all churches from their index events"
+
+    def handle(self, *args, **options):
+        self.info('Starting refreshing church availabilities')
+        refresh_church_availabilities()
+        self.success('Successfully refreshed church availabilities')
@@ -0,0 +1,62 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django import db
+
+from core.management.abstract_command import AbstractCommand
+from core.utils.log_utils import log_stack_trace
+from scheduling.models import Scheduling
+from scheduling.services.scheduling.church_availability_service import \
+    refresh_over_next_events
+from scheduling.services.scheduling.scheduling_process_service import roll_forward_scheduling
+
+
+def roll_forward_scheduling_by_uuid(scheduling_uuid: str) -> tuple[str, bool | None]:
+    try:
+        scheduling = Scheduling.objects.get(uuid=scheduling_uuid)
+    except Scheduling.DoesNotExist:
+        return scheduling_uuid, False
+
+    try:
+        return scheduling_uuid, roll_forward_scheduling(scheduling)
+    except Exception:
+        log_stack_trace()
+        return scheduling_uuid, None
+
+
+class Command(AbstractCommand):
+    help = "Move index events of indexed schedulings forward to today, without re-scheduling"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--name', help='name of website to roll forward')
+        parser.add_argument('-p', '--processes', help='number of processes', type=int,
+                            default=4)
+
+    def handle(self, *args, **options):
+        schedulings = Scheduling.objects.filter(status=Scheduling.Status.INDEXED,
+                                                website__is_active=True)
+        if options['name']:
+            schedulings = schedulings.filter(website__name__contains=options['name'])
+        scheduling_uuids = [str(uuid) for uuid in schedulings.values_list('uuid', flat=True)]
+        self.info(f'Starting roll forward of {len(scheduling_uuids)} schedulings '
+                  f'with {options["processes"]} processes')
+
+        # Forked processes must open their own database connection
+        db.connections.close_all()
+        changed_count = 0
+        failed_count = 0
+        with ProcessPoolExecutor(max_workers=options['processes'],
+                                 mp_context=multiprocessing.get_context('fork')) as executor:
+            for scheduling_uuid, has_changed in executor.map(roll_forward_scheduling_by_uuid,
+                                                             scheduling_uuids, chunksize=10):
+                if has_changed is None:
+                    self.error(f'Failed to roll forward scheduling {scheduling_uuid}')
+                    failed_count += 1
+                elif has_changed:
+                    changed_count += 1
+
+        self.info('Refreshing next events that are over')
+        refresh_over_next_events()
+
+        self.success(f'Finished roll forward, {changed_count} schedulings changed, '
+                     f'{failed_count} failed')
@@ -0,0 +1,20 @@
+from core.management.abstract_command import AbstractCommand
+from scheduling.workflows.pruning.embedding_service import MicroBatchTransformer, \
+    serve_embeddings
+from scheduling.workflows.pruning.transform_sentence import CamembertTransformer, \
+    CachedTransformer
+
+
+class Command(AbstractCommand):
+    help = "Serve sentence embeddings to workers, so that they share a single loaded model"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', help='host to listen on', default='127.0.0.1')
+        parser.add_argument('-p', '--port', help='port to listen on', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        self.info('Loading transformer')
+        transformer = CachedTransformer(MicroBatchTransformer(CamembertTransformer()))
+
+        self.info(f'Starting embedding service on {options["host"]}:{options["port"]}')
+        serve_embeddings(transformer, options['host'], options['port'])
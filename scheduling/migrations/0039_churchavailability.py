@@ -0,0 +1,47 @@
+# Generated by Django 5.2.13 on 2026-10-18 17:20
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import uuid
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def fill_church_availabilities(apps, schema_editor):
+    IndexEvent = apps.get_model('scheduling', 'IndexEvent')
+    ChurchAvailability = apps.get_model('scheduling', 'ChurchAvailability')
+
+    rows = IndexEvent.objects.values('church_id').annotate(
+        event_days=ArrayAgg('day', distinct=True, ordering='day'),
+        last_indexed_end_tz_datetime=Max('indexed_end_tz_datetime'),
+    )
+    ChurchAvailability.objects.bulk_create([ChurchAvailability(**row) for row in rows],
+                                           batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0012_alter_churchmoderation_status_and_more'),
+        ('scheduling', '0038_alter_historicalschedulingmoderation_category_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChurchAvailability',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event_days', django.contrib.postgres.fields.ArrayField(base_field=models.DateField(), size=None)),
+                ('last_indexed_end_tz_datetime', models.DateTimeField(db_index=True)),
+                ('church', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='availability', to='registry.church')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['event_days'], name='church_availability_days_idx')],
+            },
+        ),
+        migrations.RunPython(fill_church_availabilities, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.13 on 2026-10-18 18:05
+
+import pgvector.django.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0039_churchavailability'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sentence',
+            index=pgvector.django.indexes.HnswIndex(ef_construction=64, fields=['embedding'], m=16, name='sentence_embedding_hnsw_idx', opclasses=['vector_cosine_ops']),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.13 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0040_sentence_sentence_embedding_hnsw_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scheduling',
+            index=models.Index(fields=['status', 'updated_at', 'uuid'], name='scheduling_status_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.13 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0041_scheduling_scheduling_status_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduling',
+            name='public_snapshot',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
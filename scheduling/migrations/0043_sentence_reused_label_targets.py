@@ -0,0 +1,24 @@
+# Generated by Django 5.2.13 on 2026-10-19 09:20
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0042_scheduling_public_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalsentence',
+            name='reused_label_targets',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=10), blank=True, default=list, size=None),
+        ),
+        migrations.AddField(
+            model_name='sentence',
+            name='reused_label_targets',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=10), blank=True, default=list, size=None),
+        ),
+    ]
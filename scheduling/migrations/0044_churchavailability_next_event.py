@@ -0,0 +1,54 @@
+# Generated by Django 5.2.13 on 2026-10-19 09:45
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_next_events(apps, schema_editor):
+    IndexEvent = apps.get_model('scheduling', 'IndexEvent')
+    ChurchAvailability = apps.get_model('scheduling', 'ChurchAvailability')
+
+    next_events = IndexEvent.objects \
+        .filter(indexed_end_tz_datetime__gte=timezone.now()) \
+        .order_by('church_id', 'day', 'start_time') \
+        .distinct('church_id') \
+        .values('church_id', 'uuid', 'start_tz_datetime', 'indexed_end_tz_datetime')
+    next_event_by_church_id = {next_event['church_id']: next_event for next_event in next_events}
+
+    availabilities = list(ChurchAvailability.objects.filter(
+        church_id__in=next_event_by_church_id.keys()))
+    for availability in availabilities:
+        next_event = next_event_by_church_id[availability.church_id]
+        availability.next_event_uuid = next_event['uuid']
+        availability.next_event_start_tz_datetime = next_event['start_tz_datetime']
+        availability.next_event_indexed_end_tz_datetime = next_event['indexed_end_tz_datetime']
+    ChurchAvailability.objects.bulk_update(availabilities,
+                                           ['next_event_uuid', 'next_event_start_tz_datetime',
+                                            'next_event_indexed_end_tz_datetime'],
+                                           batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0043_sentence_reused_label_targets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='churchavailability',
+            name='next_event_indexed_end_tz_datetime',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='churchavailability',
+            name='next_event_start_tz_datetime',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='churchavailability',
+            name='next_event_uuid',
+            field=models.UUIDField(null=True),
+        ),
+        migrations.RunPython(fill_next_events, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 from core.models.base_models import TimeStampMixin
@@ -25,3 +26,21 @@ class IndexEvent(TimeStampMixin):
     def __lt__(self, other: 'IndexEvent'):
         return (self.day, self.start_time, self.church_color) < \
             (other.day, other.start_time, other.church_color)
+
+
+class ChurchAvailability(TimeStampMixin):
+    """Summary of the IndexEvent of a church, refreshed when a website is (de)indexed,
+    so that searches can filter churches without scanning their events"""
+    church = models.OneToOneField('registry.Church', on_delete=models.CASCADE,
+                                  related_name='availability')
+    event_days = ArrayField(models.DateField())
+    last_indexed_end_tz_datetime = models.DateTimeField(db_index=True)
+    # First event not over at refresh time, it can be over by now
+    next_event_uuid = models.UUIDField(null=True)
+    next_event_start_tz_datetime = models.DateTimeField(null=True)
+    next_event_indexed_end_tz_datetime = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['event_days'], name='church_availability_days_idx'),
+        ]
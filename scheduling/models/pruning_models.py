@@ -1,6 +1,6 @@
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
-from pgvector.django import VectorField
+from pgvector.django import VectorField, HnswIndex
 from simple_history.models import HistoricalRecords
 
 from core.models.base_models import TimeStampMixin
@@ -58,8 +58,18 @@ class Sentence(TimeStampMixin):
     confession_new_classifier = models.ForeignKey('Classifier', on_delete=models.SET_NULL,
                                                   related_name='confession_new_sentences',
                                                   null=True)
+    # Targets whose label was copied from an almost identical human labelled sentence,
+    # they must not be overwritten by reclassification
+    reused_label_targets = ArrayField(models.CharField(max_length=10), default=list, blank=True)
     history = HistoricalRecords()
 
+    class Meta:
+        indexes = [
+            # Approximate nearest neighbours search, see similar_sentence_service
+            HnswIndex(fields=['embedding'], name='sentence_embedding_hnsw_idx',
+                      m=16, ef_construction=64, opclasses=['vector_cosine_ops']),
+        ]
+
 
 class Classifier(TimeStampMixin):
     class Status(models.TextChoices):
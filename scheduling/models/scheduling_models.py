@@ -18,6 +18,15 @@ class Scheduling(TimeStampMixin):
 
     sourced_schedules_list = models.JSONField(null=True, blank=True)
     church_uuid_by_id = models.JSONField(null=True, blank=True)
+    # compressed json of schedules and events for the public api, built when indexing
+    public_snapshot = models.BinaryField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # For keyset pagination of the public api
+            models.Index(fields=['status', 'updated_at', 'uuid'],
+                         name='scheduling_status_updated_idx'),
+        ]
 
 
 class SchedulingHistoricalChurch(TimeStampMixin):
@@ -7,6 +7,7 @@ from scheduling.services.parsing.parsing_service import has_schedules
 from scheduling.services.pruning.prune_scraping_service import create_pruning, \
     remove_pruning_moderation_if_orphan
 from scheduling.services.scheduling.scheduling_process_service import init_scheduling
+from scheduling.services.scheduling.scheduling_snapshot_service import load_public_snapshot
 from scheduling.services.scheduling.scheduling_service import get_websites_of_prunings, \
     get_websites_of_parsing, get_indexed_scheduling, SchedulingSources, get_scheduling_sources, \
     SchedulingPrimarySources, get_scheduling_primary_sources
@@ -79,6 +80,10 @@ def scheduling_retrieve_scheduling_elements(scheduling: Scheduling) -> Schedulin
     return retrieve_scheduling_elements(scheduling)
 
 
+def scheduling_load_public_snapshot(scheduling: Scheduling) -> dict | None:
+    return load_public_snapshot(scheduling)
+
+
 def scheduling_get_scheduling_sources(scheduling: Scheduling | None) -> SchedulingSources:
     return get_scheduling_sources(scheduling)
 
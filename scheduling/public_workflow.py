@@ -1,3 +1,6 @@
+from datetime import date
+
+from scheduling.workflows.parsing.liturgical import get_season_start_dates
 from scheduling.workflows.pruning.extract_and_join import extract_refined_content, \
     extract_v2_refined_content
 
@@ -12,3 +15,11 @@ def scheduling_extract_refined_content(refined_content: str) -> list[str] | None
 
 def scheduling_extract_v2_refined_content(refined_content: str) -> list[str] | None:
     return extract_v2_refined_content(refined_content)
+
+
+##############
+# LITURGICAL #
+##############
+
+def scheduling_get_season_start_dates(year: int) -> list[date]:
+    return get_season_start_dates(year)
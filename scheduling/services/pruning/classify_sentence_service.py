@@ -1,6 +1,10 @@
 import threading
+from typing import Iterator
 
-from django.db import transaction, IntegrityError
+import numpy as np
+from django.db.models import QuerySet
+from django.utils import timezone
+from simple_history.utils import bulk_update_with_history
 
 from scheduling.models.pruning_models import Classifier, Sentence, Pruning
 from scheduling.workflows.pruning.extract_v2.models import Temporal, EventMention
@@ -9,14 +13,20 @@ from scheduling.workflows.pruning.train_and_predict import TensorFlowModel
 from scheduling.workflows.pruning.transform_sentence import get_transformer, TransformerInterface, \
     TRANSFORMER_NAME
 from scheduling.services.pruning.classifier_target_service import get_target_enum
+from scheduling.services.pruning.similar_sentence_service import \
+    get_reusable_human_labels_batch, LABELLED_TARGETS
 from scheduling.services.pruning.train_classifier_service import set_label
 from scheduling.utils.enum_utils import StringEnum
+from scheduling.utils.list_utils import chunk_iterable
 
 _classifier = {}
 _classifier_lock = threading.Lock()
 _model = {}
 _model_lock = threading.Lock()
 
+# Sentences are streamed and predicted by batches of this size, to keep memory bounded
+SENTENCE_BATCH_SIZE = 2000
+
 
 def get_classifier(target: Classifier.Target
                    ) -> Classifier:
@@ -79,33 +89,47 @@ def classify_existing_sentence(sentence: Sentence, target: Classifier.Target
     return labels[0], classifier
 
 
+def predict_labels(embeddings: list, target: Classifier.Target
+                   ) -> tuple[list[StringEnum], Classifier]:
+    # 1. Get classifier
+    classifier = get_classifier(target)
+    model = get_model(classifier)
+
+    # 2. Predict labels, in a single pass
+    labels = model.predict(np.asarray(embeddings, dtype=np.float32))
+
+    return labels, classifier
+
+
 def classify_existing_sentences(sentences: list[Sentence], target: Classifier.Target
                                 ) -> tuple[list[StringEnum], Classifier]:
     # 1. Get transformer
     transformer = get_transformer()
+    lines_to_transform = [sentence.line for sentence in sentences
+                          if sentence.transformer_name != transformer.get_name()]
+    new_embedding_by_line = dict(zip(lines_to_transform,
+                                     transformer.transform_batch(lines_to_transform)
+                                     if lines_to_transform else []))
     embeddings = []
     for sentence in sentences:
         if sentence.transformer_name != transformer.get_name():
-            embeddings.append(transformer.transform(sentence.line))
+            embeddings.append(new_embedding_by_line[sentence.line])
         else:
             embeddings.append(sentence.embedding)
 
-    # 2. Get classifier
-    classifier = get_classifier(target)
-    model = get_model(classifier)
-
-    # 3. Predict label
-    labels = model.predict(embeddings)
-
-    return labels, classifier
+    # 2. Predict labels
+    return predict_labels(embeddings, target)
 
 
-def get_ml_label(sentence: Sentence, target: Classifier.Target) -> StringEnum:
-    classifier = get_classifier(target)
-
+def get_current_ml_label(sentence: Sentence, target: Classifier.Target,
+                         classifier: Classifier) -> StringEnum | None:
+    """Label of sentence if it has been predicted by given classifier"""
     assert target == classifier.target, \
         f"Target {target} does not match classifier target {classifier.target}"
 
+    if target in sentence.reused_label_targets:
+        return get_reused_label(sentence, target)
+
     if target == Classifier.Target.ACTION:
         if sentence.source == Source.ML and sentence.classifier_id == classifier.uuid:
             return Action(sentence.action)
@@ -118,6 +142,16 @@ def get_ml_label(sentence: Sentence, target: Classifier.Target) -> StringEnum:
     else:
         raise NotImplementedError(f'Target {target} is not supported for label extraction')
 
+    return None
+
+
+def get_ml_label(sentence: Sentence, target: Classifier.Target) -> StringEnum:
+    classifier = get_classifier(target)
+
+    current_ml_label = get_current_ml_label(sentence, target, classifier)
+    if current_ml_label is not None:
+        return current_ml_label
+
     ml_label, _ = classify_existing_sentence(sentence, target)
     if not (target == Classifier.Target.ACTION and sentence.source == Source.HUMAN):
         set_label(sentence, ml_label, classifier)
@@ -126,6 +160,71 @@ def get_ml_label(sentence: Sentence, target: Classifier.Target) -> StringEnum:
     return ml_label
 
 
+#####################
+# BATCH PREDICTIONS #
+#####################
+
+def iter_sentence_batches(sentence_query: QuerySet[Sentence],
+                          batch_size: int = SENTENCE_BATCH_SIZE) -> Iterator[list[Sentence]]:
+    """Rows are read with a server-side cursor, only one batch is in memory at a time"""
+    return chunk_iterable(sentence_query.iterator(chunk_size=batch_size), batch_size)
+
+
+def get_label_fields(target: Classifier.Target) -> list[str]:
+    if target == Classifier.Target.ACTION:
+        return ['action', 'classifier']
+    if target == Classifier.Target.TEMPORAL:
+        return ['ml_temporal', 'temporal_classifier']
+    if target == Classifier.Target.CONFESSION:
+        return ['ml_confession', 'confession_new_classifier']
+
+    raise NotImplementedError(f'Target {target} is not supported for label saving')
+
+
+def save_labels(sentences: list[Sentence], target: Classifier.Target):
+    if not sentences:
+        return
+
+    # Unlike save, bulk_update does not set auto_now fields
+    now = timezone.now()
+    for sentence in sentences:
+        sentence.updated_at = now
+    bulk_update_with_history(sentences, Sentence, get_label_fields(target) + ['updated_at'],
+                             batch_size=SENTENCE_BATCH_SIZE, default_date=now)
+
+
+def reclassify_sentences(sentences: list[Sentence], target: Classifier.Target):
+    ml_labels, classifier = classify_existing_sentences(sentences, target)
+    assert len(ml_labels) == len(sentences)
+    for sentence, ml_label in zip(sentences, ml_labels):
+        set_label(sentence, ml_label, classifier)
+
+    save_labels(sentences, target)
+
+
+def get_ml_labels(sentences: list[Sentence], target: Classifier.Target) -> list[StringEnum]:
+    """Same as get_ml_label, with a single prediction and a single update for all sentences"""
+    classifier = get_classifier(target)
+
+    ml_labels = [get_current_ml_label(sentence, target, classifier) for sentence in sentences]
+    indices_to_predict = [i for i, ml_label in enumerate(ml_labels) if ml_label is None]
+    if not indices_to_predict:
+        return ml_labels
+
+    new_labels, _ = classify_existing_sentences([sentences[i] for i in indices_to_predict],
+                                                target)
+    sentences_to_save = []
+    for i, ml_label in zip(indices_to_predict, new_labels):
+        ml_labels[i] = ml_label
+        sentence = sentences[i]
+        if not (target == Classifier.Target.ACTION and sentence.source == Source.HUMAN):
+            set_label(sentence, ml_label, classifier)
+            sentences_to_save.append(sentence)
+    save_labels(sentences_to_save, target)
+
+    return ml_labels
+
+
 def get_sentences_with_wrong_classifier(target: Classifier.Target) -> list[Sentence]:
     classifier = get_classifier(target)
 
@@ -138,43 +237,93 @@ def get_sentences_with_wrong_classifier(target: Classifier.Target) -> list[Sente
     if target == Classifier.Target.CONFESSION:
         sentence_query = sentence_query.exclude(confession_new_classifier=classifier)
 
+    # Reused human labels are kept
+    sentence_query = sentence_query.exclude(reused_label_targets__contains=[target])
+
     return sentence_query.all()
 
 
+def get_reused_label(sentence: Sentence, target: Classifier.Target) -> StringEnum:
+    if target == Classifier.Target.ACTION:
+        return Action(sentence.action)
+    if target == Classifier.Target.TEMPORAL:
+        return Temporal(sentence.ml_temporal)
+    if target == Classifier.Target.CONFESSION:
+        return EventMention(sentence.ml_confession)
+
+    raise NotImplementedError(f'Target {target} is not supported for label reuse')
+
+
+def set_reused_label(sentence: Sentence, label: StringEnum, target: Classifier.Target):
+    """Label taken from a similar sentence, no classifier has been involved"""
+    sentence.reused_label_targets = sentence.reused_label_targets + [target.value]
+    if target == Classifier.Target.ACTION:
+        sentence.action = label
+        sentence.classifier = None
+    elif target == Classifier.Target.TEMPORAL:
+        sentence.ml_temporal = label
+        sentence.temporal_classifier = None
+    elif target == Classifier.Target.CONFESSION:
+        sentence.ml_confession = label
+        sentence.confession_new_classifier = None
+    else:
+        raise NotImplementedError(f'Target {target} is not supported for label reuse')
+
+
+def classify_and_create_sentences(stringified_lines: list[str],
+                                  pruning: Pruning) -> dict[str, Sentence]:
+    stringified_lines = list(dict.fromkeys(stringified_lines))
+    if not stringified_lines:
+        return {}
+
+    # Embed all lines at once
+    transformer = get_transformer()
+    embeddings = transformer.transform_batch(stringified_lines)
+
+    sentences = []
+    for stringified_line, embedding in zip(stringified_lines, embeddings):
+        sentences.append(Sentence(
+            line=stringified_line,
+            source=Source.ML,
+            updated_on_pruning=pruning,
+            updated_by=None,
+            embedding=embedding,
+            transformer_name=transformer.get_name(),
+        ))
+
+    # Almost identical sentences labelled by a human give their labels, without classifier
+    reused_labels_list = get_reusable_human_labels_batch(embeddings, transformer.get_name())
+
+    # v1 and v2 labels
+    for target in LABELLED_TARGETS:
+        indices_to_predict = []
+        for i, (sentence, reused_labels) in enumerate(zip(sentences, reused_labels_list)):
+            if target in reused_labels:
+                set_reused_label(sentence, reused_labels[target], target)
+            else:
+                indices_to_predict.append(i)
+
+        if not indices_to_predict:
+            continue
+
+        labels, target_classifier = predict_labels([embeddings[i] for i in indices_to_predict],
+                                                   target)
+        for i, label in zip(indices_to_predict, labels):
+            set_label(sentences[i], label, target_classifier)
+
+    # In the meantime, sentences with the same lines could have been created
+    Sentence.objects.bulk_create(sentences, ignore_conflicts=True)
+
+    new_uuids = {sentence.uuid for sentence in sentences}
+    sentence_by_line = {sentence.line: sentence for sentence
+                        in Sentence.objects.filter(line__in=stringified_lines)}
+    # bulk_create does not trigger the history of created sentences
+    Sentence.history.bulk_history_create([sentence for sentence in sentence_by_line.values()
+                                          if sentence.uuid in new_uuids])
+
+    return sentence_by_line
+
+
 def classify_and_create_sentence(stringified_line: str,
                                  pruning: Pruning) -> Sentence:
-    # Classify line
-    action, classifier, embedding, transformer = classify_line(stringified_line,
-                                                               Classifier.Target.ACTION)
-
-    # Init sentence with v1 labels
-    sentence = Sentence(
-        line=stringified_line,
-        action=action,
-        source=Source.ML,
-        updated_on_pruning=pruning,
-        updated_by=None,
-        classifier=classifier,
-        embedding=embedding,
-        transformer_name=transformer.get_name(),
-    )
-
-    # V2 labels
-    ml_temporal, temporal_classifier = classify_existing_sentence(sentence,
-                                                                  Classifier.Target.TEMPORAL)
-    set_label(sentence, ml_temporal, temporal_classifier)
-    ml_confession, confession_classifier = classify_existing_sentence(
-        sentence, Classifier.Target.CONFESSION)
-    set_label(sentence, ml_confession, confession_classifier)
-
-    try:
-        # In the meantime, a sentence with the same line could have been created
-        return Sentence.objects.get(line=stringified_line)
-    except Sentence.DoesNotExist:
-        try:
-            with transaction.atomic():
-                sentence.save()
-
-            return sentence
-        except IntegrityError:
-            return Sentence.objects.get(line=stringified_line)
+    return classify_and_create_sentences([stringified_line], pruning)[stringified_line]
@@ -6,7 +6,8 @@ from django.db import IntegrityError, transaction
 from core.utils.log_utils import info
 from registry.models.base_moderation_models import ModerationStatus
 from scheduling.models.pruning_models import PruningModeration, Pruning, Sentence
-from scheduling.services.pruning.classify_sentence_service import classify_and_create_sentence
+from scheduling.services.pruning.classify_sentence_service import classify_and_create_sentence, \
+    classify_and_create_sentences
 from scheduling.workflows.pruning.extract.action_interfaces import BaseActionInterface
 from scheduling.workflows.pruning.extract.extract_content import \
     extract_paragraphs_lines_and_indices
@@ -18,6 +19,29 @@ from scheduling.workflows.pruning.extract_v2.qualify_line_interfaces import Base
 from scheduling.workflows.pruning.extract.models import Action, Source
 
 
+###########################
+# BATCH SENTENCE FETCHING #
+###########################
+
+def get_sentence_by_line(stringified_lines: list[str],
+                         pruning: Pruning | None) -> dict[str, Sentence]:
+    stringified_lines = list(dict.fromkeys(stringified_lines))
+    sentence_by_line = {sentence.line: sentence for sentence
+                        in Sentence.objects.filter(line__in=stringified_lines)}
+
+    if pruning is None:
+        return sentence_by_line
+
+    unknown_lines = [line for line in stringified_lines if line not in sentence_by_line]
+    if unknown_lines:
+        info(f'classifying {len(unknown_lines)} new sentences for pruning {pruning.uuid}')
+        sentence_by_line |= classify_and_create_sentences(unknown_lines, pruning)
+
+    pruning.sentences.add(*sentence_by_line.values())
+
+    return sentence_by_line
+
+
 ######################
 # TAGGING WITH DB V1 #
 ######################
@@ -25,18 +49,27 @@ from scheduling.workflows.pruning.extract.models import Action, Source
 class SentenceFromDbActionInterface(BaseActionInterface):
     def __init__(self, pruning: Pruning):
         self.pruning = pruning
+        self.prefetched_sentence_by_line = {}
+
+    def prefetch(self, stringified_lines: list[str]):
+        self.prefetched_sentence_by_line = get_sentence_by_line(stringified_lines, self.pruning)
 
     def get_action(self, stringified_line: str) -> tuple[Action, Source, UUID]:
         sentence = self.get_sentence(stringified_line)
-        sentence.prunings.add(self.pruning)
 
         return Action(sentence.action), Source(sentence.source), sentence.uuid
 
     def get_sentence(self, stringified_line: str) -> Sentence:
+        if stringified_line in self.prefetched_sentence_by_line:
+            return self.prefetched_sentence_by_line[stringified_line]
+
         try:
-            return Sentence.objects.get(line=stringified_line)
+            sentence = Sentence.objects.get(line=stringified_line)
         except Sentence.DoesNotExist:
-            return classify_and_create_sentence(stringified_line, self.pruning)
+            sentence = classify_and_create_sentence(stringified_line, self.pruning)
+        sentence.prunings.add(self.pruning)
+
+        return sentence
 
 
 ######################
@@ -46,12 +79,14 @@ class SentenceFromDbActionInterface(BaseActionInterface):
 class SentenceQualifyLineInterface(BaseQualifyLineInterface):
     def __init__(self, pruning: Pruning | None = None):
         self.pruning = pruning
+        self.prefetched_sentence_by_line = {}
+
+    def prefetch(self, stringified_lines: list[str]):
+        self.prefetched_sentence_by_line = get_sentence_by_line(stringified_lines, self.pruning)
 
     def get_temporal_and_event_mention_tags(
             self, stringified_line: str) -> tuple[set[Temporal], set[EventMention], UUID | None]:
         sentence = self.get_sentence(stringified_line)
-        if self.pruning:
-            sentence.prunings.add(self.pruning)
 
         if sentence.human_temporal is not None or sentence.ml_temporal is not None:
             temporal_tags = {Temporal(sentence.human_temporal or sentence.ml_temporal)}
@@ -68,20 +103,25 @@ class SentenceQualifyLineInterface(BaseQualifyLineInterface):
         return temporal_tags, event_mention_tags, sentence.uuid
 
     def get_sentence(self, stringified_line: str) -> Sentence:
+        if stringified_line in self.prefetched_sentence_by_line:
+            return self.prefetched_sentence_by_line[stringified_line]
+
         try:
-            return Sentence.objects.get(line=stringified_line)
+            sentence = Sentence.objects.get(line=stringified_line)
         except Sentence.DoesNotExist:
             if not self.pruning:
                 raise ValueError(f'Sentence does not exist for line {stringified_line}')
-            return classify_and_create_sentence(stringified_line, self.pruning)
+            sentence = classify_and_create_sentence(stringified_line, self.pruning)
+        if self.pruning:
+            sentence.prunings.add(self.pruning)
+
+        return sentence
 
 
 class MLSentenceQualifyLineInterface(SentenceQualifyLineInterface):
     def get_temporal_and_event_mention_tags(
             self, stringified_line: str) -> tuple[set[Temporal], set[EventMention], UUID | None]:
         sentence = self.get_sentence(stringified_line)
-        if self.pruning:
-            sentence.prunings.add(self.pruning)
 
         if sentence.ml_temporal is not None:
             temporal_tags = {Temporal(sentence.ml_temporal)}
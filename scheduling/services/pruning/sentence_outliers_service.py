@@ -23,10 +23,10 @@ def add_sentence_moderation(sentence: Sentence, other_action: Action):
     sentence_moderation.save()
 
 
-def remove_sentence_not_validated_moderation(sentence: Sentence):
+def remove_sentences_not_validated_moderation(sentences: list[Sentence]):
     category = SentenceModeration.Category.ML_MISMATCH
     SentenceModeration.objects.filter(
-        sentence=sentence, category=category,
+        sentence__in=sentences, category=category,
     ).exclude(status=ModerationStatus.VALIDATED).delete()
 
 
@@ -48,6 +48,6 @@ def add_sentence_v2_moderation(sentence: Sentence):
     sentence_moderation.save()
 
 
-def remove_sentence_not_validated_v2_moderation(sentence: Sentence):
+def remove_sentences_not_validated_v2_moderation(sentences: list[Sentence]):
     category = SentenceModeration.Category.CONFESSION_OUTLIER
-    SentenceModeration.objects.filter(sentence=sentence, category=category).delete()
+    SentenceModeration.objects.filter(sentence__in=sentences, category=category).delete()
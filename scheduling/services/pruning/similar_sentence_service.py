@@ -0,0 +1,147 @@
+from collections import Counter
+from uuid import UUID
+
+from django.db import connection, transaction
+from django.db.models import Q
+from pgvector.django import CosineDistance
+
+from scheduling.models.pruning_models import Classifier, Sentence
+from scheduling.utils.enum_utils import StringEnum
+from scheduling.workflows.pruning.extract.models import Action, Source
+from scheduling.workflows.pruning.extract_v2.models import Temporal, EventMention
+
+SIMILAR_SENTENCES_COUNT = 10
+# Below this cosine distance, lines are almost identical (e.g. only a date or a punctuation
+# differs), and we trust the human labels of one for the other
+LABEL_REUSE_MAX_DISTANCE = 0.02
+# Human labelled sentences are filtered after the hnsw scan, which only returns ef_search
+# candidates by default. With iterative scan (pgvector >= 0.8), the index is scanned further
+# until enough sentences pass the filter.
+FILTERED_SCAN_EF_SEARCH = 200
+LABELLED_TARGETS = [
+    Classifier.Target.ACTION,
+    Classifier.Target.TEMPORAL,
+    Classifier.Target.CONFESSION,
+]
+
+
+################
+# HUMAN LABELS #
+################
+
+def get_human_label_filter(target: Classifier.Target) -> Q:
+    if target == Classifier.Target.ACTION:
+        return Q(source=Source.HUMAN)
+    if target == Classifier.Target.TEMPORAL:
+        return Q(human_temporal__isnull=False)
+    if target == Classifier.Target.CONFESSION:
+        return Q(human_confession__isnull=False)
+
+    raise NotImplementedError(f'Target {target} is not supported for human labels')
+
+
+def get_human_label(sentence: Sentence, target: Classifier.Target) -> StringEnum | None:
+    if target == Classifier.Target.ACTION:
+        return Action(sentence.action) if sentence.source == Source.HUMAN else None
+    if target == Classifier.Target.TEMPORAL:
+        return Temporal(sentence.human_temporal) if sentence.human_temporal else None
+    if target == Classifier.Target.CONFESSION:
+        return EventMention(sentence.human_confession) if sentence.human_confession else None
+
+    raise NotImplementedError(f'Target {target} is not supported for human labels')
+
+
+######################
+# NEAREST NEIGHBOURS #
+######################
+
+def get_similar_sentences(embedding, transformer_name: str,
+                          count: int = SIMILAR_SENTENCES_COUNT,
+                          exclude_uuid: UUID | None = None,
+                          human_target: Classifier.Target | None = None) -> list[Sentence]:
+    """Nearest sentences by cosine distance, using the hnsw index on embedding.
+    Each sentence is annotated with its distance."""
+    sentence_query = Sentence.objects.filter(transformer_name=transformer_name)
+    if exclude_uuid is not None:
+        sentence_query = sentence_query.exclude(uuid=exclude_uuid)
+    sentence_query = sentence_query \
+        .annotate(distance=CosineDistance('embedding', embedding)) \
+        .order_by('distance')
+    if human_target is None:
+        return list(sentence_query[:count])
+
+    sentence_query = sentence_query.filter(get_human_label_filter(human_target))
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # SET LOCAL only applies to the current transaction
+            cursor.execute("SET LOCAL hnsw.iterative_scan = strict_order")
+            cursor.execute(f"SET LOCAL hnsw.ef_search = {FILTERED_SCAN_EF_SEARCH}")
+
+        return list(sentence_query[:count])
+
+
+def get_similar_sentences_batch(embeddings: list, transformer_name: str,
+                                count: int = SIMILAR_SENTENCES_COUNT) -> list[list[Sentence]]:
+    """Same as get_similar_sentences for several embeddings, in a single query.
+    Each embedding is looked up in the hnsw index by a lateral subquery."""
+    if not len(embeddings):
+        return []
+
+    table = Sentence._meta.db_table
+    query = f"""
+        SELECT neighbour.*, batch.embedding_position
+        FROM unnest(%s::text[]) WITH ORDINALITY AS batch (embedding, embedding_position)
+        CROSS JOIN LATERAL (
+            SELECT sentence.*, sentence.embedding <=> batch.embedding::vector AS distance
+            FROM {table} AS sentence
+            WHERE sentence.transformer_name = %s
+            ORDER BY sentence.embedding <=> batch.embedding::vector
+            LIMIT %s
+        ) AS neighbour
+        ORDER BY batch.embedding_position, neighbour.distance
+    """
+    embedding_texts = [f"[{','.join(map(str, embedding))}]" for embedding in embeddings]
+
+    similar_sentences_list = [[] for _ in embeddings]
+    for sentence in Sentence.objects.raw(query, [embedding_texts, transformer_name, count]):
+        similar_sentences_list[sentence.embedding_position - 1].append(sentence)
+
+    return similar_sentences_list
+
+
+def get_reusable_human_labels(similar_sentences: list[Sentence]
+                              ) -> dict[Classifier.Target, StringEnum]:
+    """Human labels of the closest almost identical sentences, by target"""
+    label_by_target = {}
+    for sentence in similar_sentences:
+        if sentence.distance > LABEL_REUSE_MAX_DISTANCE:
+            break
+
+        for target in LABELLED_TARGETS:
+            if target not in label_by_target:
+                human_label = get_human_label(sentence, target)
+                if human_label is not None:
+                    label_by_target[target] = human_label
+
+    return label_by_target
+
+
+def get_reusable_human_labels_batch(embeddings: list, transformer_name: str
+                                    ) -> list[dict[Classifier.Target, StringEnum]]:
+    return [get_reusable_human_labels(similar_sentences) for similar_sentences
+            in get_similar_sentences_batch(embeddings, transformer_name)]
+
+
+def get_knn_label(sentence: Sentence, target: Classifier.Target) -> StringEnum | None:
+    """Most frequent human label among the nearest human labelled sentences"""
+    similar_sentences = get_similar_sentences(sentence.embedding, sentence.transformer_name,
+                                              exclude_uuid=sentence.uuid, human_target=target)
+    if not similar_sentences:
+        print(f'No human labelled neighbour found for sentence {sentence.uuid} '
+              f'and target {target}')
+        return None
+
+    label_counter = Counter(get_human_label(similar_sentence, target)
+                            for similar_sentence in similar_sentences)
+
+    return label_counter.most_common(1)[0][0]
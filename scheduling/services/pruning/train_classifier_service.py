@@ -1,4 +1,4 @@
-from django.db.models import Q
+from django.db.models import Q, QuerySet
 from sklearn.model_selection import train_test_split
 
 from scheduling.models.pruning_models import Classifier, Sentence
@@ -11,15 +11,17 @@ from scheduling.utils.enum_utils import StringEnum
 MIN_DATASET_SIZE = 300
 
 
-def build_sentence_dataset(target: Classifier.Target) -> list[Sentence]:
+def build_sentence_dataset(target: Classifier.Target) -> QuerySet[Sentence]:
     if target == Classifier.Target.ACTION:
         return Sentence.objects.filter(source=Source.HUMAN).all()
     if target == Classifier.Target.TEMPORAL:
         human_qualified_dataset = Sentence.objects.filter(human_temporal__isnull=False).all()
-        if len(human_qualified_dataset) >= MIN_DATASET_SIZE:
+        # count does not load the sentences in memory
+        human_qualified_count = human_qualified_dataset.count()
+        if human_qualified_count >= MIN_DATASET_SIZE:
             return human_qualified_dataset
 
-        print(f"Not enough human temporal sentences ({len(human_qualified_dataset)}), "
+        print(f"Not enough human temporal sentences ({human_qualified_count}), "
               f"using ML temporal sentences instead")
         return Sentence.objects.filter(Q(human_temporal__isnull=False)
                                        | Q(ml_temporal__isnull=False)).all()
@@ -27,10 +29,11 @@ def build_sentence_dataset(target: Classifier.Target) -> list[Sentence]:
     if target == Classifier.Target.CONFESSION:
         human_qualified_dataset = Sentence.objects.filter(
             human_confession__isnull=False).all()
-        if len(human_qualified_dataset) >= MIN_DATASET_SIZE:
+        human_qualified_count = human_qualified_dataset.count()
+        if human_qualified_count >= MIN_DATASET_SIZE:
             return human_qualified_dataset
 
-        print(f"Not enough human confession sentences ({len(human_qualified_dataset)}), "
+        print(f"Not enough human confession sentences ({human_qualified_count}), "
               f"using ML confession sentences instead")
         return Sentence.objects.filter(Q(human_confession__isnull=False)
                                        | Q(ml_confession__isnull=False)).all()
@@ -0,0 +1,71 @@
+from uuid import UUID
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Max
+from django.utils import timezone
+
+from core.utils.log_utils import info
+from scheduling.models import IndexEvent, ChurchAvailability
+
+
+def get_indexed_church_ids(schedulings) -> set[UUID]:
+    return set(IndexEvent.objects.filter(scheduling__in=schedulings)
+               .values_list('church_id', flat=True).distinct())
+
+
+def get_next_event_by_church_id(event_query) -> dict[UUID, dict]:
+    next_events = event_query \
+        .filter(indexed_end_tz_datetime__gte=timezone.now()) \
+        .order_by('church_id', 'day', 'start_time') \
+        .distinct('church_id') \
+        .values('church_id', 'uuid', 'start_tz_datetime', 'indexed_end_tz_datetime')
+
+    return {next_event['church_id']: {
+        'next_event_uuid': next_event['uuid'],
+        'next_event_start_tz_datetime': next_event['start_tz_datetime'],
+        'next_event_indexed_end_tz_datetime': next_event['indexed_end_tz_datetime'],
+    } for next_event in next_events}
+
+
+def refresh_church_availabilities(church_ids: set[UUID] | None = None):
+    """Recompute ChurchAvailability from IndexEvent, for given churches or for all of them.
+    A church can have events from several schedulings, so we always aggregate all its events."""
+    event_query = IndexEvent.objects.all()
+    availability_query = ChurchAvailability.objects.all()
+    if church_ids is not None:
+        if not church_ids:
+            return
+
+        event_query = event_query.filter(church_id__in=church_ids)
+        availability_query = availability_query.filter(church_id__in=church_ids)
+
+    rows = list(event_query.values('church_id').annotate(
+        event_days=ArrayAgg('day', distinct=True, ordering='day'),
+        last_indexed_end_tz_datetime=Max('indexed_end_tz_datetime'),
+    ))
+    next_event_by_church_id = get_next_event_by_church_id(event_query)
+    for row in rows:
+        row |= next_event_by_church_id.get(row['church_id'], {})
+
+    # Churches without any event anymore
+    availability_query.exclude(church_id__in=event_query.values('church_id')).delete()
+
+    ChurchAvailability.objects.bulk_create(
+        [ChurchAvailability(**row) for row in rows],
+        update_conflicts=True,
+        unique_fields=['church'],
+        update_fields=['event_days', 'last_indexed_end_tz_datetime', 'next_event_uuid',
+                       'next_event_start_tz_datetime', 'next_event_indexed_end_tz_datetime',
+                       'updated_at'],
+        batch_size=1000,
+    )
+    info(f'Refreshed availability of {len(rows)} churches')
+
+
+def refresh_over_next_events():
+    """Stored next events end during the day, while churches are only refreshed when their
+    website is (re)indexed or rolled forward"""
+    church_ids = set(ChurchAvailability.objects
+                     .filter(next_event_indexed_end_tz_datetime__lt=timezone.now())
+                     .values_list('church_id', flat=True))
+    refresh_church_availabilities(church_ids)
@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+
+from django.db.models import Model
+
+from scheduling.models import Scheduling
+
+
+@dataclass
+class HistoryResolver:
+    """Resolves instances from their history_id, with a single query per model.
+    Historical rows never change, so resolved instances are kept for later calls."""
+    instance_by_history_id: dict[tuple[type[Model], int], Model] = field(default_factory=dict)
+
+    def get_instances(self, model: type[Model], history_ids: list[int]) -> list:
+        missing_history_ids = {history_id for history_id in history_ids
+                               if (model, history_id) not in self.instance_by_history_id}
+        if missing_history_ids:
+            for historical_instance in model.history.filter(history_id__in=missing_history_ids):
+                self.instance_by_history_id[(model, historical_instance.history_id)] = \
+                    historical_instance.instance
+
+        instances = []
+        for history_id in history_ids:
+            if (model, history_id) not in self.instance_by_history_id:
+                raise model.history.model.DoesNotExist(
+                    f'{model.__name__} with history_id {history_id} does not exist')
+
+            instances.append(self.instance_by_history_id[(model, history_id)])
+
+        return instances
+
+    def get_instance(self, model: type[Model], history_id: int):
+        return self.get_instances(model, [history_id])[0]
+
+
+def get_scheduling_history_resolver(scheduling: Scheduling) -> HistoryResolver:
+    """The resolver is kept on the scheduling object, so that a request displaying several
+    sources of the same scheduling does not resolve them twice"""
+    if not hasattr(scheduling, '_history_resolver'):
+        scheduling._history_resolver = HistoryResolver()
+
+    return scheduling._history_resolver
+
+
+def get_historical_instances(model: type[Model], history_ids: list[int]) -> list:
+    return HistoryResolver().get_instances(model, history_ids)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from uuid import UUID
 
 from scheduling.models import Parsing
 from scheduling.models import Scheduling, IndexEvent
@@ -6,10 +7,17 @@ from scheduling.public_model import SourcedSchedulesList
 from scheduling.services.merging.index_events_service import \
     build_sourced_schedules_and_index_events
 from scheduling.services.merging.validated_schedules_service import check_schedules_match
-from scheduling.services.merging.sourced_schedules_service import build_scheduling_elements
+from scheduling.services.merging.sourced_schedules_service import build_scheduling_elements, \
+    retrieve_scheduling_elements, SchedulingElements
 from scheduling.services.parsing.parse_pruning_service import remove_useless_moderation_for_parsing
 from scheduling.services.scheduling.scheduling_service import build_resources_hash
 
+# A website with dozens of churches has thousands of events, inserted while holding the lock
+# on its scheduling
+INDEX_EVENTS_BATCH_SIZE = 1000
+INDEX_EVENT_UPDATE_FIELDS = ['indexed_end_time', 'start_tz_datetime', 'indexed_end_tz_datetime',
+                             'schedules_indices', 'has_been_moderated', 'church_color']
+
 
 @dataclass
 class SchedulingIndexingObjects:
@@ -24,8 +32,7 @@ def do_index_scheduling(scheduling: Scheduling) -> SchedulingIndexingObjects:
     # Build scheduling elements
     scheduling_elements = build_scheduling_elements(scheduling.website, scheduling)
 
-    church_uuid_by_id = {church_id: str(church.uuid) for church_id, church
-                         in scheduling_elements.church_by_id.items()}
+    church_uuid_by_id = get_church_uuid_by_id(scheduling_elements)
 
     # We check if schedules differs from validated schedules for website
     schedules_match_with_validated = check_schedules_match(
@@ -50,6 +57,95 @@ def do_index_scheduling(scheduling: Scheduling) -> SchedulingIndexingObjects:
     )
 
 
+def bulk_create_scheduling_indexing_objects(
+        indexing_objects: SchedulingIndexingObjects,
+        batch_size: int = INDEX_EVENTS_BATCH_SIZE):
+    IndexEvent.objects.bulk_create(indexing_objects.index_events, batch_size=batch_size)
+
+
+def get_church_uuid_by_id(scheduling_elements: SchedulingElements) -> dict[int, str]:
+    return {church_id: str(church.uuid) for church_id, church
+            in scheduling_elements.church_by_id.items()}
+
+
+################
+# ROLL FORWARD #
+################
+
+@dataclass
+class SchedulingRollForwardObjects:
+    index_events_to_create: list[IndexEvent]
+    index_events_to_update: list[IndexEvent]
+    index_event_uuids_to_delete: list[UUID]
+    church_ids: set[UUID]
+    resources_hash: str
+
+    def is_empty(self) -> bool:
+        return not self.index_events_to_create and not self.index_events_to_update \
+            and not self.index_event_uuids_to_delete
+
+
+def get_index_event_key(index_event: IndexEvent) -> tuple:
+    return (index_event.church_id, index_event.day, index_event.start_time,
+            index_event.displayed_end_time)
+
+
+def do_roll_forward_scheduling(scheduling: Scheduling) -> SchedulingRollForwardObjects:
+    """Recompute index events of an indexed scheduling for today, from its stored sourced
+    schedules, without pruning, parsing nor matching again"""
+    scheduling_elements = retrieve_scheduling_elements(scheduling)
+    schedules_match_with_validated = check_schedules_match(
+        scheduling.website, scheduling_elements.sourced_schedules_list)
+    index_events = build_sourced_schedules_and_index_events(scheduling.website, scheduling,
+                                                            scheduling_elements,
+                                                            schedules_match_with_validated)
+
+    existing_event_by_key = {get_index_event_key(index_event): index_event
+                             for index_event in scheduling.index_events.all()}
+    index_events_to_create = []
+    index_events_to_update = []
+    for index_event in index_events:
+        existing_event = existing_event_by_key.pop(get_index_event_key(index_event), None)
+        if existing_event is None:
+            index_events_to_create.append(index_event)
+            continue
+
+        if any(getattr(existing_event, field_name) != getattr(index_event, field_name)
+               for field_name in INDEX_EVENT_UPDATE_FIELDS):
+            for field_name in INDEX_EVENT_UPDATE_FIELDS:
+                setattr(existing_event, field_name, getattr(index_event, field_name))
+            index_events_to_update.append(existing_event)
+
+    # Remaining events are over, or not in the indexed period anymore
+    index_events_to_delete = list(existing_event_by_key.values())
+
+    resources_hash = build_resources_hash(scheduling, scheduling_elements.sourced_schedules_list,
+                                          get_church_uuid_by_id(scheduling_elements),
+                                          index_events, schedules_match_with_validated)
+
+    return SchedulingRollForwardObjects(
+        index_events_to_create=index_events_to_create,
+        index_events_to_update=index_events_to_update,
+        index_event_uuids_to_delete=[index_event.uuid for index_event in index_events_to_delete],
+        church_ids={index_event.church_id for index_event
+                    in index_events_to_create + index_events_to_update + index_events_to_delete},
+        resources_hash=resources_hash,
+    )
+
+
+def bulk_save_scheduling_roll_forward_objects(
+        scheduling: Scheduling,
+        roll_forward_objects: SchedulingRollForwardObjects,
+        batch_size: int = INDEX_EVENTS_BATCH_SIZE):
+    scheduling.index_events.filter(uuid__in=roll_forward_objects.index_event_uuids_to_delete)\
+        .delete()
+    IndexEvent.objects.bulk_create(roll_forward_objects.index_events_to_create,
+                                   batch_size=batch_size)
+    IndexEvent.objects.bulk_update(roll_forward_objects.index_events_to_update,
+                                   INDEX_EVENT_UPDATE_FIELDS,
+                                   batch_size=batch_size)
+
+
 def clean_parsings_moderations(parsing_history_ids: list[int]):
     for parsing_history_id in parsing_history_ids:
         historical_parsing = Parsing.history.get(history_id=parsing_history_id)
@@ -4,6 +4,7 @@ from fetching.models import OClocherLocation
 from fetching.public_service import fetching_match_churches_and_locations
 from registry.models import Church
 from scheduling.models import Scheduling, SchedulingHistoricalOClocherMatching
+from scheduling.services.scheduling.history_service import get_historical_instances
 
 
 @dataclass
@@ -12,22 +13,18 @@ class SchedulingMatchingObjects:
 
 
 def do_match_scheduling(scheduling: Scheduling) -> SchedulingMatchingObjects:
-    locations = []
-    for scheduling_historical_location in scheduling.historical_oclocher_locations.all():
-        location_history_id = scheduling_historical_location.oclocher_location_history_id
-        historical_location = OClocherLocation.history.get(history_id=location_history_id)
-        locations.append(historical_location.instance)
+    locations = get_historical_instances(OClocherLocation, [
+        scheduling_historical_location.oclocher_location_history_id
+        for scheduling_historical_location in scheduling.historical_oclocher_locations.all()])
 
     if not locations:
         return SchedulingMatchingObjects(
             oclocher_matching_history_ids=[],
         )
 
-    churches = []
-    for scheduling_historical_church in scheduling.historical_churches.all():
-        church_history_id = scheduling_historical_church.church_history_id
-        historical_church = Church.history.get(history_id=church_history_id)
-        churches.append(historical_church.instance)
+    churches = get_historical_instances(Church, [
+        scheduling_historical_church.church_history_id
+        for scheduling_historical_church in scheduling.historical_churches.all()])
 
     if not churches:
         return SchedulingMatchingObjects(
@@ -4,6 +4,7 @@ from registry.models import Church
 from scheduling.models import Scheduling, PruningParsing
 from scheduling.models.pruning_models import Pruning
 from scheduling.services.parsing.parse_pruning_service import do_parse_pruning_for_website
+from scheduling.services.scheduling.history_service import get_historical_instances
 
 
 @dataclass
@@ -12,11 +13,9 @@ class SchedulingParsingObjects:
 
 
 def do_parse_scheduling(scheduling: Scheduling) -> SchedulingParsingObjects:
-    churches = []
-    for scheduling_historical_church in scheduling.historical_churches.all():
-        church_history_id = scheduling_historical_church.church_history_id
-        historical_church = Church.history.get(history_id=church_history_id)
-        churches.append(historical_church.instance)
+    churches = get_historical_instances(Church, [
+        scheduling_historical_church.church_history_id
+        for scheduling_historical_church in scheduling.historical_churches.all()])
 
     all_pruning_history_ids = []
     for scraping_pruning in scheduling.scraping_prunings.all():
@@ -25,11 +24,10 @@ def do_parse_scheduling(scheduling: Scheduling) -> SchedulingParsingObjects:
     for image_pruning in scheduling.image_prunings.all():
         all_pruning_history_ids.append(image_pruning.pruning_history_id)
 
-    pruning_parsing_history_ids = set()
-    for pruning_history_id in all_pruning_history_ids:
-        historical_pruning = Pruning.history.get(history_id=pruning_history_id)
-        pruning = historical_pruning.instance
+    prunings = get_historical_instances(Pruning, all_pruning_history_ids)
 
+    pruning_parsing_history_ids = set()
+    for pruning_history_id, pruning in zip(all_pruning_history_ids, prunings):
         parsing = do_parse_pruning_for_website(pruning, churches)
         if parsing is None:
             continue
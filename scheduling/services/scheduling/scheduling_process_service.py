@@ -1,10 +1,14 @@
 from django.db import transaction
 
 from core.utils.log_utils import info
+from front.public_service import front_invalidate_website_responses
 from registry.models import Website
 from scheduling.models import Scheduling, PruningParsing
+from scheduling.services.scheduling.church_availability_service import \
+    refresh_church_availabilities, get_indexed_church_ids
 from scheduling.services.scheduling.index_scheduling_service import do_index_scheduling, \
-    clean_parsings_moderations
+    clean_parsings_moderations, bulk_create_scheduling_indexing_objects, \
+    do_roll_forward_scheduling, bulk_save_scheduling_roll_forward_objects
 from scheduling.services.scheduling.init_scheduling_service import build_scheduling, \
     bulk_create_scheduling_related_objects
 from scheduling.services.scheduling.match_scheduling_service import \
@@ -16,6 +20,8 @@ from scheduling.services.scheduling.prune_scheduling_service import do_prune_sch
     bulk_create_scheduling_pruning_objects
 from scheduling.services.scheduling.scheduling_moderation_service import \
     add_necessary_scheduling_moderation
+from scheduling.services.scheduling.scheduling_snapshot_service import build_public_snapshot, \
+    refresh_public_snapshot
 from scheduling.tasks import worker_prune_scheduling, worker_parse_scheduling
 
 
@@ -36,10 +42,13 @@ def init_scheduling(website: Website, instant_deindex: bool = False) -> Scheduli
         ).delete()
 
         if instant_deindex:
-            Scheduling.objects.filter(
+            indexed_schedulings = Scheduling.objects.filter(
                 website=website,
                 status=Scheduling.Status.INDEXED,
-            ).delete()
+            )
+            deindexed_church_ids = get_indexed_church_ids(indexed_schedulings)
+            indexed_schedulings.delete()
+            refresh_church_availabilities(deindexed_church_ids)
 
         # Save new Scheduling
         new_scheduling.save()
@@ -47,6 +56,9 @@ def init_scheduling(website: Website, instant_deindex: bool = False) -> Scheduli
         # Bulk create related objects
         bulk_create_scheduling_related_objects(new_scheduling, scheduling_related_objects)
 
+    if instant_deindex:
+        front_invalidate_website_responses(website.uuid)
+
     # trigger prune_scheduling in background
     worker_prune_scheduling(str(new_scheduling.uuid))
 
@@ -176,19 +188,71 @@ def index_scheduling(scheduling: Scheduling):
         # we save parsing_history_ids to later clean up moderations
         parsing_history_ids = PruningParsing.objects.filter(scheduling__in=indexed_schedulings)\
             .values_list('parsing_history_id', flat=True).distinct()
+        deindexed_church_ids = get_indexed_church_ids(indexed_schedulings)
         indexed_schedulings.delete()
 
         # 3. Save index events
-        for index_event in indexing_objects.index_events:
-            index_event.save()
+        bulk_create_scheduling_indexing_objects(indexing_objects)
+
+        # 4. Refresh availability of churches that have lost or gained events
+        refresh_church_availabilities(
+            deindexed_church_ids
+            | {index_event.church_id for index_event in indexing_objects.index_events})
 
-        # 4. Mark scheduling as INDEXED
+        # 5. Mark scheduling as INDEXED
         scheduling.status = Scheduling.Status.INDEXED
         scheduling.sourced_schedules_list = \
             indexing_objects.sourced_schedules_list.model_dump(mode='json')
         scheduling.church_uuid_by_id = indexing_objects.church_uuid_by_id
         scheduling.resources_hash = indexing_objects.resources_hash
+        scheduling.public_snapshot = build_public_snapshot(
+            indexing_objects.sourced_schedules_list, indexing_objects.church_uuid_by_id,
+            indexing_objects.index_events)
         scheduling.save()
 
+    front_invalidate_website_responses(scheduling.website.uuid)
     add_necessary_scheduling_moderation(scheduling, indexing_objects)
     clean_parsings_moderations(list(parsing_history_ids))
+
+
+def roll_forward_scheduling(scheduling: Scheduling) -> bool:
+    """Returns whether index events have changed"""
+    info("Rolling forward scheduling.")
+
+    if scheduling.status != Scheduling.Status.INDEXED:
+        info(f"Scheduling is in status {scheduling.status}; skipping roll forward.")
+        return False
+
+    roll_forward_objects = do_roll_forward_scheduling(scheduling)
+    if roll_forward_objects.is_empty():
+        info("Index events are up to date.")
+        return False
+
+    with transaction.atomic():
+        # 1. Verify the scheduling is still in INDEXED status
+        try:
+            scheduling = Scheduling.objects.select_for_update().get(
+                uuid=scheduling.uuid,
+                status=Scheduling.Status.INDEXED
+            )
+        except Scheduling.DoesNotExist:
+            info("Aborting: Scheduling not found or status changed.")
+            return False
+
+        # 2. Save index events
+        bulk_save_scheduling_roll_forward_objects(scheduling, roll_forward_objects)
+
+        # 3. Refresh availability of churches that have lost or gained events
+        refresh_church_availabilities(roll_forward_objects.church_ids)
+
+        # 4. Save new resources hash, to detect identical schedulings as in index_scheduling
+        scheduling.resources_hash = roll_forward_objects.resources_hash
+        refresh_public_snapshot(scheduling)
+        scheduling.save()
+
+    front_invalidate_website_responses(scheduling.website.uuid)
+    info(f"Created {len(roll_forward_objects.index_events_to_create)}, "
+         f"updated {len(roll_forward_objects.index_events_to_update)} and "
+         f"deleted {len(roll_forward_objects.index_event_uuids_to_delete)} index events.")
+
+    return True
@@ -12,6 +12,7 @@ from scheduling.models import ParsingModeration, Parsing, IndexEvent
 from scheduling.models import Scheduling, SchedulingHistoricalOClocherMatching
 from scheduling.models.pruning_models import Pruning
 from scheduling.public_model import SourcedSchedulesList
+from scheduling.services.scheduling.history_service import get_scheduling_history_resolver
 from scheduling.utils.hash_utils import hash_string_to_hex
 
 
@@ -36,42 +37,28 @@ def get_scheduling_sources(scheduling: Scheduling | None) -> SchedulingSources:
     if scheduling is None:
         return SchedulingSources()
 
-    all_churches = []
-    for scheduling_church in scheduling.historical_churches.all():
-        church_history_id = scheduling_church.church_history_id
-        historical_church = Church.history.get(history_id=church_history_id)
-        church = historical_church.instance
-        all_churches.append(church)
-
-    all_parsings = []
-    for pruning_parsing in scheduling.pruning_parsings.all():
-        parsing_history_id = pruning_parsing.parsing_history_id
-        historical_parsing = Parsing.history.get(history_id=parsing_history_id)
-        parsing = historical_parsing.instance
-        all_parsings.append(parsing)
-
-    all_oclocher_locations = []
-    for scheduling_oclocher_location in scheduling.historical_oclocher_locations.all():
-        oclocher_location_history_id = scheduling_oclocher_location.oclocher_location_history_id
-        historical_oclocher_location = OClocherLocation.history.get(
-            history_id=oclocher_location_history_id)
-        oclocher_location = historical_oclocher_location.instance
-        all_oclocher_locations.append(oclocher_location)
-
-    all_oclocher_schedules = []
-    for scheduling_oclocher_schedule in scheduling.historical_oclocher_schedules.all():
-        oclocher_schedule_history_id = scheduling_oclocher_schedule.oclocher_schedule_history_id
-        historical_oclocher_schedule = OClocherSchedule.history.get(
-            history_id=oclocher_schedule_history_id)
-        oclocher_schedule = historical_oclocher_schedule.instance
-        all_oclocher_schedules.append(oclocher_schedule)
+    history_resolver = get_scheduling_history_resolver(scheduling)
+
+    all_churches = history_resolver.get_instances(Church, [
+        scheduling_church.church_history_id
+        for scheduling_church in scheduling.historical_churches.all()])
+
+    all_parsings = history_resolver.get_instances(Parsing, [
+        pruning_parsing.parsing_history_id
+        for pruning_parsing in scheduling.pruning_parsings.all()])
+
+    all_oclocher_locations = history_resolver.get_instances(OClocherLocation, [
+        scheduling_oclocher_location.oclocher_location_history_id
+        for scheduling_oclocher_location in scheduling.historical_oclocher_locations.all()])
+
+    all_oclocher_schedules = history_resolver.get_instances(OClocherSchedule, [
+        scheduling_oclocher_schedule.oclocher_schedule_history_id
+        for scheduling_oclocher_schedule in scheduling.historical_oclocher_schedules.all()])
 
     try:
         scheduling_oclocher_matching = scheduling.historical_oclocher_matching
-        oclocher_matching_history_id = scheduling_oclocher_matching.oclocher_matching_history_id
-        historical_oclocher_matching = OClocherMatching.history.get(
-            history_id=oclocher_matching_history_id)
-        oclocher_matching = historical_oclocher_matching.instance
+        oclocher_matching = history_resolver.get_instance(
+            OClocherMatching, scheduling_oclocher_matching.oclocher_matching_history_id)
     except SchedulingHistoricalOClocherMatching.DoesNotExist:
         oclocher_matching = None
 
@@ -97,67 +84,44 @@ class SchedulingPrimarySources:
     parsing_by_pruning_uuid: dict[UUID, Parsing] = field(default_factory=dict)
 
 
-def get_pruning_by_history_id(pruning_history_id: int,
-                              pruning_by_history_id: dict[int, Pruning]) -> Pruning:
-    if pruning_history_id in pruning_by_history_id:
-        return pruning_by_history_id[pruning_history_id]
-
-    historical_pruning = Pruning.history.get(history_id=pruning_history_id)
-    pruning = historical_pruning.instance
-    pruning_by_history_id[pruning_history_id] = pruning
-    return pruning
-
-
 def get_scheduling_primary_sources(scheduling: Scheduling | None
                                    ) -> SchedulingPrimarySources:
     if scheduling is None:
         return SchedulingPrimarySources()
 
-    pruning_by_history_id = {}
+    history_resolver = get_scheduling_history_resolver(scheduling)
+    pruning_parsings = list(scheduling.pruning_parsings.all())
+    historical_scrapings = list(scheduling.historical_scrapings.all())
+    scraping_prunings = list(scheduling.scraping_prunings.all())
+    historical_images = list(scheduling.historical_images.all())
+    image_prunings = list(scheduling.image_prunings.all())
+
+    # All prunings are resolved at once
+    history_resolver.get_instances(Pruning, [
+        pruning_link.pruning_history_id
+        for pruning_link in pruning_parsings + scraping_prunings + image_prunings])
 
+    parsings = history_resolver.get_instances(Parsing, [
+        pruning_parsing.parsing_history_id for pruning_parsing in pruning_parsings])
     parsing_by_pruning_uuid = {}
-    for pruning_parsing in scheduling.pruning_parsings.all():
-        parsing_history_id = pruning_parsing.parsing_history_id
-        historical_parsing = Parsing.history.get(history_id=parsing_history_id)
-        parsing = historical_parsing.instance
-        pruning = get_pruning_by_history_id(pruning_parsing.pruning_history_id,
-                                            pruning_by_history_id)
+    for pruning_parsing, parsing in zip(pruning_parsings, parsings):
+        pruning = history_resolver.get_instance(Pruning, pruning_parsing.pruning_history_id)
         parsing_by_pruning_uuid[pruning.uuid] = parsing
 
-    scrapings = []
-    scraping_by_history_id = {}
-    prunings_by_scraping_uuid = {}
-    for scheduling_scraping in scheduling.historical_scrapings.all():
-        scraping_history_id = scheduling_scraping.scraping_history_id
-        historical_scraping = Scraping.history.get(history_id=scraping_history_id)
-        scraping = historical_scraping.instance
-        scraping_by_history_id[scraping_history_id] = scraping
-        scrapings.append(scraping)
-        prunings_by_scraping_uuid[scraping.uuid] = []
-
-    for scraping_pruning in scheduling.scraping_prunings.all():
-        scraping_history_id = scraping_pruning.scraping_history_id
-        scraping = scraping_by_history_id[scraping_history_id]
-        pruning = get_pruning_by_history_id(scraping_pruning.pruning_history_id,
-                                            pruning_by_history_id)
+    scrapings = history_resolver.get_instances(Scraping, [
+        scheduling_scraping.scraping_history_id for scheduling_scraping in historical_scrapings])
+    prunings_by_scraping_uuid = {scraping.uuid: [] for scraping in scrapings}
+    for scraping_pruning in scraping_prunings:
+        scraping = history_resolver.get_instance(Scraping, scraping_pruning.scraping_history_id)
+        pruning = history_resolver.get_instance(Pruning, scraping_pruning.pruning_history_id)
         prunings_by_scraping_uuid[scraping.uuid].append(pruning)
 
-    images = []
-    image_by_history_id = {}
-    prunings_by_image_uuid = {}
-    for scheduling_image in scheduling.historical_images.all():
-        image_history_id = scheduling_image.image_history_id
-        historical_image = Image.history.get(history_id=image_history_id)
-        image = historical_image.instance
-        image_by_history_id[image_history_id] = image
-        images.append(image)
-        prunings_by_image_uuid[image.uuid] = []
-
-    for image_pruning in scheduling.image_prunings.all():
-        image_history_id = image_pruning.image_history_id
-        image = image_by_history_id[image_history_id]
-        pruning = get_pruning_by_history_id(image_pruning.pruning_history_id,
-                                            pruning_by_history_id)
+    images = history_resolver.get_instances(Image, [
+        scheduling_image.image_history_id for scheduling_image in historical_images])
+    prunings_by_image_uuid = {image.uuid: [] for image in images}
+    for image_pruning in image_prunings:
+        image = history_resolver.get_instance(Image, image_pruning.image_history_id)
+        pruning = history_resolver.get_instance(Pruning, image_pruning.pruning_history_id)
         prunings_by_image_uuid[image.uuid].append(pruning)
 
     return SchedulingPrimarySources(
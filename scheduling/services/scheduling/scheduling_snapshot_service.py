@@ -0,0 +1,82 @@
+import json
+import zlib
+from datetime import datetime
+
+from scheduling.models import Scheduling, IndexEvent
+from scheduling.public_model import SourcedSchedulesList
+
+
+#########
+# BUILD #
+#########
+
+def get_schedules_by_churches(sourced_schedules_list: SourcedSchedulesList,
+                              church_uuid_by_id: dict[str, str]) -> list[dict]:
+    schedules_by_churches = []
+    for schedules_of_church in sourced_schedules_list.sourced_schedules_of_churches:
+        church_uuid = church_uuid_by_id.get(str(schedules_of_church.church_id), None)
+        if church_uuid is None:
+            continue
+
+        if not schedules_of_church.sourced_schedules:
+            continue
+
+        schedules_by_churches.append({
+            'church_uuid': church_uuid,
+            'schedules': [{'explanation': sourced_schedule.explanation}
+                          for sourced_schedule in schedules_of_church.sourced_schedules],
+        })
+
+    return schedules_by_churches
+
+
+def get_events_by_churches(index_events: list[IndexEvent]) -> list[dict]:
+    events_by_church_uuid = {}
+    for index_event in index_events:
+        start = datetime.combine(index_event.day, index_event.start_time)
+        end = datetime.combine(index_event.day, index_event.displayed_end_time) \
+            if index_event.displayed_end_time else None
+        events_by_church_uuid.setdefault(str(index_event.church_id), []).append({
+            'start': start.isoformat(),
+            'end': end.isoformat() if end else None,
+        })
+
+    return [{'church_uuid': church_uuid, 'events': events}
+            for church_uuid, events in events_by_church_uuid.items()]
+
+
+def build_public_snapshot(sourced_schedules_list: SourcedSchedulesList,
+                          church_uuid_by_id: dict[int, str] | dict[str, str],
+                          index_events: list[IndexEvent]) -> bytes:
+    """Schedules and events of an indexed scheduling as exposed by the public api,
+    serialized and compressed once instead of at each api call"""
+    church_uuid_by_id = {str(church_id): church_uuid
+                         for church_id, church_uuid in church_uuid_by_id.items()}
+    public_snapshot = {
+        'schedules_by_churches': get_schedules_by_churches(sourced_schedules_list,
+                                                           church_uuid_by_id),
+        'events_by_churches': get_events_by_churches(index_events),
+    }
+
+    return zlib.compress(json.dumps(public_snapshot, separators=(',', ':')).encode())
+
+
+def refresh_public_snapshot(scheduling: Scheduling):
+    """Must be called when index events of an indexed scheduling have changed"""
+    scheduling.public_snapshot = build_public_snapshot(
+        SourcedSchedulesList(**scheduling.sourced_schedules_list),
+        scheduling.church_uuid_by_id,
+        list(scheduling.index_events.all()),
+    )
+
+
+########
+# LOAD #
+########
+
+def load_public_snapshot(scheduling: Scheduling) -> dict | None:
+    if scheduling.public_snapshot is None:
+        # scheduling has been indexed before snapshots existed
+        return None
+
+    return json.loads(zlib.decompress(scheduling.public_snapshot))
@@ -0,0 +1,142 @@
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import requests
+
+from scheduling.workflows.pruning.embedding_service import MicroBatchTransformer, \
+    build_request_handler
+from scheduling.workflows.pruning.transform_sentence import TransformerInterface, \
+    CachedTransformer, RemoteTransformer
+
+
+class LengthTransformer(TransformerInterface):
+    def __init__(self):
+        self.batches = []
+
+    def transform(self, sentence: str) -> list:
+        return self.transform_batch([sentence])[0]
+
+    def transform_batch(self, sentences: list[str]) -> list:
+        self.batches.append(sentences)
+        return [np.array([len(sentence), 1.], dtype=np.float32) for sentence in sentences]
+
+    def get_name(self) -> str:
+        return 'length'
+
+
+class FailingTransformer(LengthTransformer):
+    def transform_batch(self, sentences: list[str]) -> list:
+        raise ValueError('model is broken')
+
+
+class EmbeddingServiceTests(unittest.TestCase):
+    @staticmethod
+    def start_server(transformer: TransformerInterface) -> ThreadingHTTPServer:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), build_request_handler(transformer))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        return server
+
+    def test_cached_transformer(self):
+        transformer = LengthTransformer()
+        cached_transformer = CachedTransformer(transformer, max_size=2)
+
+        embeddings = cached_transformer.transform_batch(['a', 'bb', 'a'])
+        self.assertEqual([e[0] for e in embeddings], [1, 2, 1])
+        self.assertEqual(transformer.batches, [['a', 'bb']])
+
+        cached_transformer.transform_batch(['bb', 'ccc'])
+        self.assertEqual(transformer.batches, [['a', 'bb'], ['ccc']])
+
+        # 'a' is the least recently used sentence, it has been evicted
+        cached_transformer.transform('a')
+        self.assertEqual(transformer.batches, [['a', 'bb'], ['ccc'], ['a']])
+
+    def test_micro_batch_transformer(self):
+        transformer = LengthTransformer()
+        micro_batch_transformer = MicroBatchTransformer(transformer, max_wait_seconds=0.2)
+
+        results = {}
+
+        def transform(sentence: str):
+            results[sentence] = micro_batch_transformer.transform(sentence)[0]
+
+        threads = [threading.Thread(target=transform, args=(sentence,))
+                   for sentence in ['a', 'bb', 'ccc']]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {'a': 1, 'bb': 2, 'ccc': 3})
+        self.assertEqual(len(transformer.batches), 1)
+
+    def test_remote_transformer(self):
+        server = self.start_server(LengthTransformer())
+        try:
+            remote_transformer = RemoteTransformer(f'http://127.0.0.1:{server.server_port}')
+            embeddings = remote_transformer.transform_batch(['a', 'bb'])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertIsNone(remote_transformer.fallback_transformer)
+        self.assertEqual([list(e) for e in embeddings], [[1, 1], [2, 1]])
+
+    def test_remote_transformer_error(self):
+        server = self.start_server(FailingTransformer())
+        try:
+            response = requests.post(f'http://127.0.0.1:{server.server_port}/embed',
+                                     json={'sentences': ['a']})
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(response.status_code, 500)
+
+    def test_remote_transformer_fallback(self):
+        server = self.start_server(LengthTransformer())
+        port = server.server_port
+        server.shutdown()
+        server.server_close()
+
+        fallback_transformers = []
+
+        def build_fallback_transformer():
+            fallback_transformers.append(LengthTransformer())
+            return fallback_transformers[-1]
+
+        remote_transformer = RemoteTransformer(f'http://127.0.0.1:{port}',
+                                               retry_delays=[0.01], down_seconds=0.2,
+                                               fallback_factory=build_fallback_transformer)
+        threads = [threading.Thread(target=remote_transformer.transform_batch, args=(['a'],))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Fallback model is loaded once, and used while the service is down
+        self.assertEqual(len(fallback_transformers), 1)
+        self.assertEqual(len(fallback_transformers[0].batches), 5)
+
+        # Service is back
+        server = ThreadingHTTPServer(('127.0.0.1', port),
+                                     build_request_handler(LengthTransformer()))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            time.sleep(0.2)
+            embeddings = remote_transformer.transform_batch(['bb'])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual([list(e) for e in embeddings], [[2, 1]])
+        self.assertEqual(len(fallback_transformers[0].batches), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
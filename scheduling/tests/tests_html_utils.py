@@ -0,0 +1,65 @@
+import glob
+import os
+import random
+import unittest
+import warnings
+
+from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
+
+from scheduling.utils.html_utils import get_html_text, split_lines, stringify_html, \
+    remove_spaces
+
+
+class TestHtmlUtils(unittest.TestCase):
+    @staticmethod
+    def get_tricky_html_list():
+        return [
+            '',
+            ' \n ',
+            '<pre>  a\t </pre>\t\t<b>x</b>',
+            'a &amp; b &foo c &#147; &#x41; &#129; &#0; &#99999999;',
+            '<br>\t</br>\t',
+            '<br/>\t<br>a</br>\t<br/>',
+            '<script>x<b>y</b></script>z',
+            '<rt>a<b>b</rt>c',
+            '<!-- c -->a<!DOCTYPE html>b<![CDATA[ c ]]>d<?pi?>',
+            '<style>a',
+            'a < b',
+            '<a href="x">l</a>&nbsp;&eacute',
+            '<textarea> \n </textarea> \n ',
+            '<template><p>t</p></template>u',
+            '<pre><b>  </b></pre>  ',
+            '</p>  </p>',
+        ]
+
+    @staticmethod
+    def get_fuzzed_html_list(count: int):
+        pieces = ['<b>', '</b>', '<br>', '</br>', '<br/>', '<pre>', '</pre>', '<script>',
+                  '</script>', ' ', '\t', '\n', '&amp;', '&#150;', '&x', '<!--c-->',
+                  '<![CDATA[q]]>', 'a', 'é', '<p>', '</p>', '<img src=x>', '&', '<', '>']
+        rnd = random.Random(0)
+        return [''.join(rnd.choice(pieces) for _ in range(rnd.randint(1, 15)))
+                for _ in range(count)]
+
+    @staticmethod
+    def get_fixture_lines():
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+        lines = []
+        for file_path in glob.glob(f'{root_dir}/*/tests/fixtures/**/*.html', recursive=True):
+            with open(file_path) as f:
+                lines.extend(split_lines(f.read()))
+
+        return lines
+
+    def test_get_html_text(self):
+        warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
+        for html in self.get_tricky_html_list() + self.get_fuzzed_html_list(2000) \
+                + self.get_fixture_lines():
+            with self.subTest():
+                expected_text = BeautifulSoup(html, 'html.parser').text
+                self.assertEqual(expected_text, get_html_text(html), repr(html))
+                self.assertEqual(remove_spaces(expected_text), stringify_html(html), repr(html))
+
+
+if __name__ == '__main__':
+    unittest.main()
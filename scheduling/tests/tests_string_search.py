@@ -0,0 +1,88 @@
+import json
+import os
+import re
+import string
+import unittest
+
+from scheduling.utils.string_search import LexicalMatcher, normalize_content, \
+    get_punctuation_except, get_consecutive_words
+from scheduling.workflows.pruning.extract import tag_line
+
+
+def get_words_by_replacing(content, punctuation=None):
+    for char in (punctuation or string.punctuation):
+        content = content.replace(char, ' ')
+
+    return content.split()
+
+
+def has_any_of_words_by_windows(content: str, lexical_list, expr_list=None, regex_list=None):
+    """Straightforward implementation, LexicalMatcher must give the same answers"""
+    normalized_content = normalize_content(content)
+
+    if lexical_list:
+        words_set = set(get_words_by_replacing(normalized_content))
+        for mention in lexical_list:
+            if mention in words_set:
+                return True
+
+    if expr_list:
+        for expr in expr_list:
+            if expr in normalized_content:
+                return True
+
+    if regex_list:
+        punctuation = get_punctuation_except(regex_list)
+        words = get_words_by_replacing(normalized_content, punctuation)
+        for regex in regex_list:
+            k = len(regex.split())
+            for w in get_consecutive_words(words, k):
+                if re.fullmatch(regex, w):
+                    return True
+
+    return False
+
+
+class TestStringSearch(unittest.TestCase):
+    @staticmethod
+    def get_word_lists():
+        return [
+            (tag_line.CONFESSIONS_MENTIONS, None, None),
+            (tag_line.SCHEDULES_MENTIONS, tag_line.SCHEDULES_EXPR, tag_line.SCHEDULES_REGEX),
+            (tag_line.DATES_MENTIONS, tag_line.DATES_EXPR, tag_line.DATES_REGEX),
+            (tag_line.PERIOD_MENTIONS, None, None),
+            (None, None, tag_line.SCHEDULES_REGEX + tag_line.DATES_REGEX),
+        ]
+
+    @staticmethod
+    def get_stringified_lines() -> list[str]:
+        tests_dir = os.path.dirname(os.path.realpath(__file__))
+        stringified_lines = [
+            'Confessions : le samedi 12/04 de 10h à 11h30',
+            'Permanence du 1er au 15 mars, 9 h 30 - 12:00',
+            'Rendez-vous au 06.12.34.56.78, à l\'issue de la messe',
+            'Pénitence : 20 déc. 2024, 2024/2025',
+            '',
+        ]
+        for file_name in os.listdir(f'{tests_dir}/fixtures/prune'):
+            if file_name.endswith('.json'):
+                with open(f'{tests_dir}/fixtures/prune/{file_name}') as f:
+                    stringified_lines.extend(line[1] for line in json.load(f))
+
+        return stringified_lines
+
+    def test_lexical_matcher(self):
+        stringified_lines = self.get_stringified_lines()
+        for lexical_list, expr_list, regex_list in self.get_word_lists():
+            matcher = LexicalMatcher(lexical_list, expr_list, regex_list)
+            for stringified_line in stringified_lines:
+                with self.subTest():
+                    self.assertEqual(
+                        has_any_of_words_by_windows(stringified_line, lexical_list, expr_list,
+                                                    regex_list),
+                        matcher.matches(stringified_line),
+                        stringified_line)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import base64
+import json
+import pickle
+import unittest
+
+import numpy as np
+
+from scheduling.workflows.pruning.extract_v2.models import Temporal
+from scheduling.workflows.pruning.train_and_predict import TensorFlowModel
+
+
+class TestTrainAndPredict(unittest.TestCase):
+    @staticmethod
+    def get_keras_model_json(nb_neurones: int, nb_labels: int) -> str:
+        """Same structure as the json of the keras.Sequential model built in fit"""
+        return json.dumps({
+            'module': 'keras',
+            'class_name': 'Sequential',
+            'config': {
+                'name': 'sequential',
+                'layers': [
+                    {'class_name': 'InputLayer', 'config': {'batch_shape': [None, 8]}},
+                    {'class_name': 'Dense', 'config': {'units': nb_neurones,
+                                                       'activation': 'relu',
+                                                       'use_bias': True}},
+                    {'class_name': 'Dense', 'config': {'units': nb_neurones,
+                                                       'activation': 'relu',
+                                                       'use_bias': True}},
+                    {'class_name': 'Dense', 'config': {'units': nb_labels,
+                                                       'activation': 'softmax',
+                                                       'use_bias': True}},
+                ],
+            },
+        })
+
+    def test_predict_from_pickle(self):
+        different_labels = Temporal.list_items()
+        rng = np.random.default_rng(0)
+        shapes = [(8, 6), (6,), (6, 6), (6,), (6, len(different_labels)),
+                  (len(different_labels),)]
+        model_weights = [rng.normal(size=shape).astype(np.float32) for shape in shapes]
+        model_data = {
+            'model_json': self.get_keras_model_json(6, len(different_labels)),
+            'model_weights': model_weights,
+        }
+        pickle_as_str = base64.b64encode(pickle.dumps(model_data)).decode('utf-8')
+
+        model = TensorFlowModel[Temporal](different_labels)
+        model.from_pickle(pickle_as_str)
+        vectors = rng.normal(size=(50, 8)).astype(np.float32)
+        labels = model.predict(vectors)
+
+        w1, b1, w2, b2, w3, b3 = model_weights
+        hidden = np.maximum(np.maximum(vectors @ w1 + b1, 0) @ w2 + b2, 0)
+        expected_indices = np.argmax(hidden @ w3 + b3, axis=1)
+        self.assertListEqual(labels, [different_labels[i] for i in expected_indices])
+
+        # The pickle can be saved again without tensorflow
+        self.assertEqual(pickle_as_str, model.to_pickle())
+
+
+if __name__ == '__main__':
+    unittest.main()
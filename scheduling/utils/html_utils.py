@@ -1,27 +1,195 @@
 import re
 import warnings
+from html.parser import HTMLParser
 
 from bs4 import MarkupResemblesLocatorWarning, BeautifulSoup
+from bs4.builder import HTMLParserTreeBuilder
+from bs4.dammit import EntitySubstitution
+
+LEADING_SPACES_REGEX = re.compile(r'^\s*')
+MULTIPLE_SPACES_REGEX = re.compile(r'( )+')
+SPACE_AFTER_LINE_BREAK_REGEX = re.compile(r'\n ')
+SPACE_BEFORE_LINE_BREAK_REGEX = re.compile(r' \n')
+MULTIPLE_LINE_BREAKS_REGEX = re.compile(r'(\n)+')
+TRAILING_SPACES_REGEX = re.compile(r'\s*$')
+
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+HTML_TREE_BUILDER = HTMLParserTreeBuilder()
 
 
 def split_lines(refined_content: str) -> list[str]:
     return refined_content.split('<br>\n')
 
 
-def stringify_html(html: str) -> str:
-    # https://stackoverflow.com/a/41496131
-    warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
+################
+# HTML TO TEXT #
+################
+
+class HtmlTextParser(HTMLParser):
+    """Collects the same text as BeautifulSoup(html, 'html.parser').text, without building
+    the tree: same tokenizer, same entity conversion, same whitespace-only strings collapsing,
+    and strings of <script>, <style>... or comments are left out the same way."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.texts = []
+        self.current_data = []
+        self.open_tags = []
+        self.preserve_whitespace_depths = []
+        self.string_container_depths = []
+        self.already_closed_empty_elements = []
+
+    def end_data(self, is_main_content: bool | None = None):
+        """is_main_content is None for regular strings, that are main content unless they are
+        in a string container tag (<script>, <style>...)"""
+        if not self.current_data:
+            return
+
+        data = ''.join(self.current_data)
+        self.current_data = []
+        if not self.preserve_whitespace_depths and not data.strip(ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+
+        if is_main_content is None:
+            is_main_content = not self.string_container_depths
+        if is_main_content:
+            self.texts.append(data)
+
+    def push_tag(self, name: str):
+        if name in HTML_TREE_BUILDER.preserve_whitespace_tags:
+            self.preserve_whitespace_depths.append(len(self.open_tags))
+        if name in HTML_TREE_BUILDER.string_containers:
+            self.string_container_depths.append(len(self.open_tags))
+        self.open_tags.append(name)
+
+    def pop_tag(self) -> str:
+        name = self.open_tags.pop()
+        depth = len(self.open_tags)
+        if self.preserve_whitespace_depths and self.preserve_whitespace_depths[-1] == depth:
+            self.preserve_whitespace_depths.pop()
+        if self.string_container_depths and self.string_container_depths[-1] == depth:
+            self.string_container_depths.pop()
+
+        return name
+
+    def pop_to_tag(self, name: str):
+        if name not in self.open_tags:
+            return
+
+        while self.pop_tag() != name:
+            pass
+
+    def start_tag(self, tag: str, handle_empty_element: bool):
+        self.end_data()
+        self.push_tag(tag)
+        if handle_empty_element and tag in HTML_TREE_BUILDER.empty_element_tags:
+            # html.parser does not send end events for void elements (<br>, <img>...)
+            self.end_tag(tag, check_already_closed=False)
+            self.already_closed_empty_elements.append(tag)
+
+    def end_tag(self, tag: str, check_already_closed: bool = True):
+        if check_already_closed and tag in self.already_closed_empty_elements:
+            self.already_closed_empty_elements.remove(tag)
+            return
+
+        self.end_data()
+        self.pop_to_tag(tag)
+
+    def handle_starttag(self, tag, attrs):
+        self.start_tag(tag, handle_empty_element=True)
+
+    def handle_startendtag(self, tag, attrs):
+        self.start_tag(tag, handle_empty_element=False)
+        self.end_tag(tag)
+
+    def handle_endtag(self, tag):
+        self.end_tag(tag)
+
+    def handle_data(self, data):
+        self.current_data.append(data)
 
-    return remove_spaces(BeautifulSoup(html, 'html.parser').text)
+    def handle_charref(self, name):
+        if name.startswith(('x', 'X')):
+            code_point = int(name.lstrip(name[0]), 16)
+        else:
+            code_point = int(name)
+
+        data = None
+        if code_point < 256:
+            # Like BeautifulSoup, &#147; is understood as windows-1252
+            try:
+                data = bytearray([code_point]).decode('windows-1252')
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(code_point)
+            except (ValueError, OverflowError):
+                pass
+        self.handle_data(data or '\N{REPLACEMENT CHARACTER}')
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f'&{name}')
+
+    def handle_special_string(self, data: str, is_main_content: bool):
+        self.end_data()
+        self.handle_data(data)
+        self.end_data(is_main_content)
+
+    def handle_comment(self, data):
+        self.handle_special_string(data, is_main_content=False)
+
+    def handle_decl(self, decl):
+        self.handle_special_string(decl[len('DOCTYPE '):], is_main_content=False)
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self.handle_special_string(data[len('CDATA['):], is_main_content=True)
+        else:
+            self.handle_special_string(data, is_main_content=False)
+
+    def handle_pi(self, data):
+        self.handle_special_string(data, is_main_content=False)
+
+    def get_text(self) -> str:
+        self.end_data()
+
+        return ''.join(self.texts)
+
+
+def get_html_text(html: str) -> str:
+    if '<' not in html and '&' not in html:
+        # Plain text is a single string
+        if not html or html.strip(ASCII_SPACES):
+            return html
+
+        return '\n' if '\n' in html else ' '
+
+    parser = HtmlTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except AssertionError:
+        # html.parser rejects this markup, we let BeautifulSoup handle it
+        # https://stackoverflow.com/a/41496131
+        warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
+        return BeautifulSoup(html, 'html.parser').text
+
+    return parser.get_text()
+
+
+def stringify_html(html: str) -> str:
+    return remove_spaces(get_html_text(html))
 
 
 def remove_spaces(text: str):
-    text = re.sub(r'^\s*', '', text)
-    text = re.sub(r'( )+', r' ', text)
-    text = re.sub(r'\n ', r'\n', text)
-    text = re.sub(r' \n', r'\n', text)
-    text = re.sub(r'(\n)+', r'\n', text)
-    text = re.sub(r'\s*$', '', text)
+    text = LEADING_SPACES_REGEX.sub('', text)
+    text = MULTIPLE_SPACES_REGEX.sub(r' ', text)
+    text = SPACE_AFTER_LINE_BREAK_REGEX.sub(r'\n', text)
+    text = SPACE_BEFORE_LINE_BREAK_REGEX.sub(r'\n', text)
+    text = MULTIPLE_LINE_BREAKS_REGEX.sub(r'\n', text)
+    text = TRAILING_SPACES_REGEX.sub('', text)
     text = text.strip()
 
     return text
@@ -59,3 +59,16 @@ def round_robin(lst, n):
 def chunk_list(lst, n):
     for i in range(0, len(lst), n):
         yield lst[i:i + n]
+
+
+def chunk_iterable(iterable, n):
+    """Same as chunk_list, without loading the whole iterable in memory"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == n:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
@@ -1,5 +1,7 @@
 import re
 import string
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 from unidecode import unidecode
 
@@ -12,11 +14,17 @@ def unhyphen_content(content):
     return content.replace('-', ' ')
 
 
+def build_punctuation_table(punctuation: str) -> dict[int, str]:
+    return str.maketrans(punctuation, ' ' * len(punctuation))
+
+
+PUNCTUATION_TABLE = build_punctuation_table(string.punctuation)
+
+
 def get_words(content, punctuation=None):
-    for char in (punctuation or string.punctuation):
-        content = content.replace(char, ' ')
+    table = build_punctuation_table(punctuation) if punctuation else PUNCTUATION_TABLE
 
-    return content.split()
+    return content.translate(table).split()
 
 
 def get_punctuation_except(regex_list):
@@ -32,27 +40,75 @@ def get_consecutive_words(words, k):
     return [" ".join([words[i + j] for j in range(k)]) for i in range(len(words) + 1 - k)]
 
 
-def has_any_of_words(content: str, lexical_list, expr_list=None, regex_list=None):
-    normalized_content = normalize_content(content)
-
-    if lexical_list:
-        words_set = set(get_words(normalized_content))
-        for mention in lexical_list:
-            if mention in words_set:
-                return True
-
-    if expr_list:
-        for expr in expr_list:
-            if expr in normalized_content:
-                return True
-
-    if regex_list:
-        punctuation = get_punctuation_except(regex_list)
-        words = get_words(normalized_content, punctuation)
-        for regex in regex_list:
+@dataclass
+class LexicalMatcher:
+    """Compiled version of has_any_of_words for given lists, meant to be built once:
+    - lexical_list contains words that must be found among the words of the content
+    - expr_list contains expressions that must be found anywhere in the content
+    - regex_list contains regex that must fully match consecutive words of the content
+    """
+    lexical_list: list[str] | None = None
+    expr_list: list[str] | None = None
+    regex_list: list[str] | None = None
+    mentions: frozenset[str] = field(init=False)
+    expr_regex: re.Pattern | None = field(init=False)
+    regex_punctuation_table: dict[int, str] = field(init=False)
+    regex_by_nb_words: dict[int, re.Pattern] = field(init=False)
+
+    def __post_init__(self):
+        self.mentions = frozenset(self.lexical_list or [])
+        self.expr_regex = re.compile('|'.join(map(re.escape, self.expr_list))) \
+            if self.expr_list else None
+        regex_punctuation = get_punctuation_except(self.regex_list or [])
+        self.regex_punctuation_table = build_punctuation_table(regex_punctuation) \
+            if regex_punctuation else PUNCTUATION_TABLE
+
+        # One alternation per number of words, instead of one fullmatch per regex
+        regex_list_by_nb_words = {}
+        for regex in self.regex_list or []:
             k = len(regex.split())  # number of words in regex
-            for w in get_consecutive_words(words, k):
-                if re.fullmatch(regex, w):
-                    return True
+            regex_list_by_nb_words.setdefault(k, []).append(regex)
+        self.regex_by_nb_words = {
+            k: re.compile('|'.join(f'(?:{regex})' for regex in regex_list))
+            for k, regex_list in regex_list_by_nb_words.items()
+        }
+
+    def matches_normalized(self, normalized_content: str) -> bool:
+        if self.mentions \
+                and not self.mentions.isdisjoint(
+                    normalized_content.translate(PUNCTUATION_TABLE).split()):
+            return True
+
+        if self.expr_regex is not None and self.expr_regex.search(normalized_content):
+            return True
+
+        if self.regex_by_nb_words:
+            words = normalized_content.translate(self.regex_punctuation_table).split()
+            for k, regex in self.regex_by_nb_words.items():
+                for w in get_consecutive_words(words, k):
+                    if regex.fullmatch(w):
+                        return True
+
+        return False
+
+    def matches(self, content: str) -> bool:
+        return self.matches_normalized(normalize_content(content))
+
+
+@lru_cache(maxsize=100)
+def get_lexical_matcher(lexical_list: tuple[str, ...] | None,
+                        expr_list: tuple[str, ...] | None,
+                        regex_list: tuple[str, ...] | None) -> LexicalMatcher:
+    return LexicalMatcher(
+        lexical_list=list(lexical_list) if lexical_list else None,
+        expr_list=list(expr_list) if expr_list else None,
+        regex_list=list(regex_list) if regex_list else None,
+    )
+
+
+def has_any_of_words(content: str, lexical_list, expr_list=None, regex_list=None):
+    matcher = get_lexical_matcher(tuple(lexical_list) if lexical_list else None,
+                                  tuple(expr_list) if expr_list else None,
+                                  tuple(regex_list) if regex_list else None)
 
-    return False
+    return matcher.matches(content)
@@ -27,6 +27,7 @@ from scheduling.services.pruning.edit_pruning_service import get_single_line_col
 from scheduling.services.pruning.edit_pruning_service import set_v2_indices_as_human
 from scheduling.services.pruning.prune_scraping_service import SentenceQualifyLineInterface, \
     MLSentenceQualifyLineInterface
+from scheduling.services.pruning.similar_sentence_service import get_similar_sentences
 from scheduling.services.scheduling.scheduling_process_service import init_scheduling
 from scheduling.services.scheduling.scheduling_service import get_parsing_moderation_of_pruning, \
     get_indexed_scheduling
@@ -113,8 +114,13 @@ def create_sentence_moderation_context(moderation: SentenceModeration) -> dict:
     colored_piece_ml = get_single_line_colored_piece(
         line_and_tag_ml, Source.ML, i=2, do_show=True)
 
+    similar_sentences = get_similar_sentences(moderation.sentence.embedding,
+                                              moderation.sentence.transformer_name,
+                                              exclude_uuid=moderation.sentence.uuid)
+
     return {
         'sentence': moderation.sentence,
+        'similar_sentences': similar_sentences,
         'colored_pieces': [colored_piece_human, colored_piece_ml],
         'temporal_colors': TEMPORAL_COLORS,
         'event_mention_colors': EVENT_MENTION_COLORS,
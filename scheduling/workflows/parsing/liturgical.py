@@ -130,3 +130,11 @@ def get_advent_dates(year: int) -> tuple[date, date]:
     # Find the fourth Sunday before Christmas
     advent_start = christmas - timedelta(days=christmas.weekday() + 22)
     return advent_start, christmas
+
+
+def get_season_start_dates(year: int) -> list[date]:
+    """Start of Lent and Advent, when confession schedules are usually updated"""
+    return [
+        get_liturgical_date(LiturgicalDayEnum.ASH_WEDNESDAY, year),
+        get_advent_dates(year)[0],
+    ]
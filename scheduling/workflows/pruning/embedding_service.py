@@ -0,0 +1,140 @@
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from scheduling.workflows.pruning.transform_sentence import TransformerInterface
+
+MAX_BATCH_SIZE = 128
+MAX_WAIT_SECONDS = 0.02
+
+
+###############
+# MICRO BATCH #
+###############
+
+@dataclass
+class PendingRequest:
+    sentences: list[str]
+    done: threading.Event = field(default_factory=threading.Event)
+    embeddings: list | None = None
+    error: Exception | None = None
+
+
+@dataclass
+class MicroBatchTransformer(TransformerInterface):
+    """Coalesces sentences of concurrent requests into a single transform_batch call.
+    A request waits at most max_wait_seconds for other requests to join its batch."""
+    transformer: TransformerInterface
+    max_batch_size: int = MAX_BATCH_SIZE
+    max_wait_seconds: float = MAX_WAIT_SECONDS
+    pending_requests: queue.Queue = field(default_factory=queue.Queue)
+
+    def __post_init__(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def transform(self, sentence: str) -> list:
+        return self.transform_batch([sentence])[0]
+
+    def transform_batch(self, sentences: list[str]) -> list:
+        if not sentences:
+            return []
+
+        request = PendingRequest(sentences=sentences)
+        self.pending_requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+
+        return request.embeddings
+
+    def get_name(self) -> str:
+        return self.transformer.get_name()
+
+    def run(self):
+        while True:
+            requests = [self.pending_requests.get()]
+            sentence_count = len(requests[0].sentences)
+            deadline = time.monotonic() + self.max_wait_seconds
+            while sentence_count < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    request = self.pending_requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                requests.append(request)
+                sentence_count += len(request.sentences)
+
+            self.process(requests)
+
+    def process(self, requests: list[PendingRequest]):
+        sentences = [sentence for request in requests for sentence in request.sentences]
+        try:
+            embeddings = self.transformer.transform_batch(sentences)
+        except Exception as e:
+            embeddings = None
+            for request in requests:
+                request.error = e
+
+        start = 0
+        for request in requests:
+            if embeddings is not None:
+                request.embeddings = embeddings[start:start + len(request.sentences)]
+                start += len(request.sentences)
+            request.done.set()
+
+
+##########
+# SERVER #
+##########
+
+def build_request_handler(transformer: TransformerInterface) -> type[BaseHTTPRequestHandler]:
+    class EmbeddingRequestHandler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            if self.path != '/embed':
+                self.send_error(404)
+                return
+
+            content_length = int(self.headers.get('Content-Length', 0))
+            try:
+                sentences = json.loads(self.rfile.read(content_length))['sentences']
+            except (ValueError, KeyError):
+                self.send_error(400, 'expected {"sentences": [...]}')
+                return
+
+            try:
+                # Embeddings are sent as raw float32, with one row per sentence
+                embeddings = np.asarray(transformer.transform_batch(sentences),
+                                        dtype=np.float32)
+            except Exception as e:
+                print(f'error while embedding sentences: {e}')
+                self.send_error(500, 'error while embedding sentences')
+                return
+
+            body = embeddings.tobytes()
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Each pruning sends a request, we do not want to log them all
+            pass
+
+    return EmbeddingRequestHandler
+
+
+def serve_embeddings(transformer: TransformerInterface, host: str, port: int):
+    server = ThreadingHTTPServer((host, port), build_request_handler(transformer))
+    print(f'embedding service listening on {host}:{port}')
+    server.serve_forever()
@@ -5,6 +5,10 @@ from scheduling.workflows.pruning.extract.models import Action, Source
 
 
 class BaseActionInterface:
+    def prefetch(self, stringified_lines: list[str]):
+        """Called with all the lines of a content before get_action is called on each of them"""
+        pass
+
     @abstractmethod
     def get_action(self, stringified_line: str) -> tuple[Action, Source | None, UUID | None]:
         pass
@@ -22,9 +22,11 @@ def split_and_tag(refined_content: str, action_interface: BaseActionInterface
     results = []
 
     # Split into lines (or <table>)
-    for line in split_lines(refined_content):
-        stringified_line = stringify_html(line)
+    lines = split_lines(refined_content)
+    stringified_lines = list(map(stringify_html, lines))
+    action_interface.prefetch(stringified_lines)
 
+    for line, stringified_line in zip(lines, stringified_lines):
         tags = get_tags_with_regex(stringified_line)
         action, source, sentence_uuid = action_interface.get_action(stringified_line)
         results.append(LineAndTag(
@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Set
 
-from scheduling.utils.string_search import has_any_of_words
+from scheduling.utils.string_search import LexicalMatcher, normalize_content
 
 ##################
 # LEXICAL SEARCH #
@@ -144,20 +144,26 @@ PERIOD_MENTIONS = [
 ]
 
 
+CONFESSIONS_MATCHER = LexicalMatcher(CONFESSIONS_MENTIONS)
+SCHEDULES_MATCHER = LexicalMatcher(SCHEDULES_MENTIONS, SCHEDULES_EXPR, SCHEDULES_REGEX)
+DATES_MATCHER = LexicalMatcher(DATES_MENTIONS, DATES_EXPR, DATES_REGEX)
+PERIOD_MATCHER = LexicalMatcher(PERIOD_MENTIONS)
+
+
 def is_confession_mentions(content: str):
-    return has_any_of_words(content, CONFESSIONS_MENTIONS)
+    return CONFESSIONS_MATCHER.matches(content)
 
 
 def is_schedule_description(content: str):
-    return has_any_of_words(content, SCHEDULES_MENTIONS, SCHEDULES_EXPR, SCHEDULES_REGEX)
+    return SCHEDULES_MATCHER.matches(content)
 
 
 def is_date_description(content: str):
-    return has_any_of_words(content, DATES_MENTIONS, DATES_EXPR, DATES_REGEX)
+    return DATES_MATCHER.matches(content)
 
 
 def is_period_description(content: str):
-    return has_any_of_words(content, PERIOD_MENTIONS)
+    return PERIOD_MATCHER.matches(content)
 
 
 ########
@@ -176,17 +182,20 @@ class Tag(str, Enum):
 ########
 
 def get_tags_with_regex(stringified_line: str) -> Set[Tag]:
+    # line is normalized once for all matchers
+    normalized_line = normalize_content(stringified_line)
+
     tags = set()
-    if is_confession_mentions(stringified_line):
+    if CONFESSIONS_MATCHER.matches_normalized(normalized_line):
         tags.add(Tag.CONFESSION)
 
-    if is_schedule_description(stringified_line):
+    if SCHEDULES_MATCHER.matches_normalized(normalized_line):
         tags.add(Tag.SCHEDULE)
 
-    if is_date_description(stringified_line):
+    if DATES_MATCHER.matches_normalized(normalized_line):
         tags.add(Tag.DATE)
 
-    if is_period_description(stringified_line):
+    if PERIOD_MATCHER.matches_normalized(normalized_line):
         tags.add(Tag.PERIOD)
 
     return tags
@@ -7,6 +7,11 @@ from scheduling.workflows.pruning.extract_v2.tag_line import get_temporal_tags_w
 
 
 class BaseQualifyLineInterface:
+    def prefetch(self, stringified_lines: list[str]):
+        """Called with all the lines of a content before get_temporal_and_event_mention_tags
+        is called on each of them"""
+        pass
+
     @abstractmethod
     def get_temporal_and_event_mention_tags(
             self, stringified_line: str) -> tuple[set[Temporal], set[EventMention], UUID | None]:
@@ -20,15 +20,20 @@ def split_and_tag_v2(refined_content: str, qualify_line_interface: BaseQualifyLi
     results = []
 
     # Split into lines (or <table>)
-    for line in split_lines(refined_content):
-        results.append(create_line_and_tag_v2(line, qualify_line_interface))
+    lines = split_lines(refined_content)
+    stringified_lines = list(map(stringify_html, lines))
+    qualify_line_interface.prefetch(stringified_lines)
+
+    for line, stringified_line in zip(lines, stringified_lines):
+        results.append(create_line_and_tag_v2(line, qualify_line_interface, stringified_line))
 
     return results
 
 
-def create_line_and_tag_v2(line: str, qualify_line_interface: BaseQualifyLineInterface
-                           ) -> LineAndTagV2:
-    stringified_line = stringify_html(line)
+def create_line_and_tag_v2(line: str, qualify_line_interface: BaseQualifyLineInterface,
+                           stringified_line: str | None = None) -> LineAndTagV2:
+    if stringified_line is None:
+        stringified_line = stringify_html(line)
 
     temporal_tags, event_mention_tags, sentence_uuid = \
         qualify_line_interface.get_temporal_and_event_mention_tags(stringified_line)
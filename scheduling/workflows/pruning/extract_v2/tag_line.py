@@ -1,7 +1,7 @@
 from typing import Set
 
 from scheduling.workflows.pruning.extract_v2.models import Temporal, EventMention
-from scheduling.utils.string_search import has_any_of_words
+from scheduling.utils.string_search import LexicalMatcher, normalize_content
 
 ##################
 # LEXICAL SEARCH #
@@ -144,8 +144,14 @@ PERIOD_MENTIONS = [
 ]
 
 
+CONFESSIONS_MATCHER = LexicalMatcher(CONFESSIONS_MENTIONS)
+SCHEDULES_MATCHER = LexicalMatcher(SCHEDULES_MENTIONS, SCHEDULES_EXPR, SCHEDULES_REGEX)
+DATES_MATCHER = LexicalMatcher(DATES_MENTIONS, DATES_EXPR, DATES_REGEX)
+PERIOD_MATCHER = LexicalMatcher(PERIOD_MENTIONS)
+
+
 def is_confession_mentions(content: str):
-    return has_any_of_words(content, CONFESSIONS_MENTIONS)
+    return CONFESSIONS_MATCHER.matches(content)
 
 
 def is_confession_hold_mentions(content: str):
@@ -153,15 +159,15 @@ def is_confession_hold_mentions(content: str):
 
 
 def is_schedule_description(content: str):
-    return has_any_of_words(content, SCHEDULES_MENTIONS, SCHEDULES_EXPR, SCHEDULES_REGEX)
+    return SCHEDULES_MATCHER.matches(content)
 
 
 def is_date_description(content: str):
-    return has_any_of_words(content, DATES_MENTIONS, DATES_EXPR, DATES_REGEX)
+    return DATES_MATCHER.matches(content)
 
 
 def is_period_description(content: str):
-    return has_any_of_words(content, PERIOD_MENTIONS)
+    return PERIOD_MATCHER.matches(content)
 
 
 ########
@@ -169,14 +175,15 @@ def is_period_description(content: str):
 ########
 
 def get_temporal_tags_with_regex(stringified_line: str) -> Set[Temporal]:
+    # line is normalized once for all matchers
+    normalized_line = normalize_content(stringified_line)
+
     temporal_tags = set()
-    if is_schedule_description(stringified_line):
+    if SCHEDULES_MATCHER.matches_normalized(normalized_line):
         temporal_tags.add(Temporal.SCHED)
 
-    if is_date_description(stringified_line):
-        temporal_tags.add(Temporal.SPEC)
-
-    if is_period_description(stringified_line):
+    if DATES_MATCHER.matches_normalized(normalized_line) \
+            or PERIOD_MATCHER.matches_normalized(normalized_line):
         temporal_tags.add(Temporal.SPEC)
 
     return temporal_tags
@@ -1,6 +1,8 @@
 import base64
+import json
 import pickle
 from abc import abstractmethod
+from dataclasses import dataclass
 from typing import TypeVar, Generic
 
 import numpy as np
@@ -55,10 +57,85 @@ def evaluate(model: MachineLearningInterface, vectors_test, labels_test):
     return accuracy_score(list(map(str, labels_test)), list(map(str, labels_pred)))
 
 
+###################
+# NUMPY INFERENCE #
+###################
+
+def softmax(x: np.ndarray) -> np.ndarray:
+    exp_x = np.exp(x - np.max(x, axis=1, keepdims=True))
+    return exp_x / np.sum(exp_x, axis=1, keepdims=True)
+
+
+DENSE_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'softmax': softmax,
+}
+
+
+@dataclass
+class DenseLayer:
+    kernel: np.ndarray
+    bias: np.ndarray | None
+    activation: str
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        x = x @ self.kernel
+        if self.bias is not None:
+            x += self.bias
+
+        return DENSE_ACTIVATIONS[self.activation](x)
+
+
+def build_dense_layers(model_json: str, model_weights: list[np.ndarray]) -> list[DenseLayer]:
+    """Reads the Dense layers of a keras Sequential model, from its json and its weights,
+    so that predicting does not need tensorflow"""
+    model_config = json.loads(model_json)['config']
+    layer_configs = model_config['layers'] if isinstance(model_config, dict) else model_config
+
+    weights = iter(model_weights)
+    dense_layers = []
+    for layer_config in layer_configs:
+        if layer_config['class_name'] == 'InputLayer':
+            continue
+
+        if layer_config['class_name'] != 'Dense':
+            raise NotImplementedError(f'Layer {layer_config["class_name"]} is not supported')
+
+        activation = layer_config['config'].get('activation') or 'linear'
+        if activation not in DENSE_ACTIVATIONS:
+            raise NotImplementedError(f'Activation {activation} is not supported')
+
+        kernel = np.asarray(next(weights), dtype=np.float32)
+        bias = np.asarray(next(weights), dtype=np.float32) \
+            if layer_config['config'].get('use_bias', True) else None
+        dense_layers.append(DenseLayer(kernel=kernel, bias=bias, activation=activation))
+
+    assert next(weights, None) is None, "Some weights do not belong to any Dense layer"
+
+    return dense_layers
+
+
+def predict_with_dense_layers(dense_layers: list[DenseLayer], vectors) -> np.ndarray:
+    x = np.asarray(vectors, dtype=np.float32)
+    for dense_layer in dense_layers:
+        x = dense_layer.forward(x)
+
+    return x
+
+
+##############
+# TENSORFLOW #
+##############
+
 class TensorFlowModel(MachineLearningInterface[E], Generic[E]):
+    """Trained with tensorflow, but predictions are computed with numpy only"""
+
     def __init__(self, different_labels: list[E], epochs=90, max_neurones=240, optimizer='adam',
                  loss='sparse_categorical_crossentropy'):
         self.model = None
+        self.model_data = None
+        self.dense_layers = None
         self.different_labels = different_labels
         self.epochs = epochs
         self.max_neurones = max_neurones
@@ -94,11 +171,21 @@ class TensorFlowModel(MachineLearningInterface[E], Generic[E]):
                        tf.convert_to_tensor(pd.DataFrame(labels_indices)),
                        epochs=self.epochs,
                        verbose=False)
+        self.model_data = {
+            'model_json': self.model.to_json(),
+            'model_weights': self.model.get_weights(),
+        }
+        self.dense_layers = None
+
+    def get_dense_layers(self) -> list[DenseLayer]:
+        if self.dense_layers is None:
+            self.dense_layers = build_dense_layers(self.model_data['model_json'],
+                                                   self.model_data['model_weights'])
+
+        return self.dense_layers
 
     def predict(self, vectors) -> list[E]:
-        import pandas as pd
-        predictions = self.model.predict(pd.DataFrame(vectors),
-                                         verbose=False)
+        predictions = predict_with_dense_layers(self.get_dense_layers(), vectors)
 
         # Convert probability distributions to class indices
         predicted_classes = np.argmax(predictions, axis=1)
@@ -107,25 +194,12 @@ class TensorFlowModel(MachineLearningInterface[E], Generic[E]):
         return [self.different_labels[class_idx] for class_idx in predicted_classes]
 
     def to_pickle(self) -> str:
-        model_json = self.model.to_json()
-        model_weights = self.model.get_weights()
-
-        model_data = {
-            'model_json': model_json,
-            'model_weights': model_weights
-        }
-
-        byte_string = pickle.dumps(model_data)
+        byte_string = pickle.dumps(self.model_data)
         encoded_string = base64.b64encode(byte_string).decode('utf-8')
 
         return encoded_string
 
     def from_pickle(self, pickle_as_str: str):
-        print('import keras.src.models.model')
-        from keras.src.models.model import model_from_json
-        print('loading model')
         byte_string = base64.b64decode(pickle_as_str)
-        model_data = pickle.loads(byte_string)
-
-        self.model = model_from_json(model_data['model_json'])
-        self.model.set_weights(model_data['model_weights'])
+        self.model_data = pickle.loads(byte_string)
+        self.dense_layers = None
@@ -1,7 +1,26 @@
+import os
 import threading
+import time
 from abc import abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import requests
+
+from scheduling.utils.hash_utils import hash_string_to_hex
 
 TRANSFORMER_NAME = "dangvantuan/sentence-camembert-base"
+# e.g. http://127.0.0.1:8765, see scheduling/workflows/pruning/embedding_service.py
+EMBEDDING_SERVICE_URL_ENV = 'EMBEDDING_SERVICE_URL'
+EMBEDDING_SERVICE_TIMEOUT = 120
+# The service only listens once its model is loaded, e.g. a minute after a deploy
+EMBEDDING_SERVICE_RETRY_DELAYS = [1, 2, 4, 8, 16, 32]
+# When the service is down, the in-process model is used during this delay before retrying
+EMBEDDING_SERVICE_DOWN_SECONDS = 5 * 60
+# An embedding takes 3kB
+EMBEDDING_CACHE_SIZE = 10000
 
 
 class TransformerInterface:
@@ -10,6 +29,11 @@ class TransformerInterface:
         """Transform a sentence into a vector"""
         pass
 
+    @abstractmethod
+    def transform_batch(self, sentences: list[str]) -> list:
+        """Transform sentences into vectors, in a single forward pass"""
+        pass
+
     @abstractmethod
     def get_name(self) -> str:
         """Get the name of the transformer"""
@@ -25,12 +49,123 @@ class CamembertTransformer(TransformerInterface):
         self.model = SentenceTransformer(self.name)
 
     def transform(self, sentence: str) -> list:
-        return self.model.encode([sentence])[0]
+        return self.transform_batch([sentence])[0]
+
+    def transform_batch(self, sentences: list[str]) -> list:
+        return list(self.model.encode(sentences))
 
     def get_name(self) -> str:
         return self.name
 
 
+class RemoteTransformer(TransformerInterface):
+    """Calls the embedding service shared by all workers. The service is retried with a
+    backoff, and the model is only loaded in process while the service is down."""
+    def __init__(self, url: str,
+                 retry_delays: list[float] | None = None,
+                 down_seconds: float = EMBEDDING_SERVICE_DOWN_SECONDS,
+                 fallback_factory: Callable[[], TransformerInterface] = CamembertTransformer):
+        self.url = url
+        self.retry_delays = EMBEDDING_SERVICE_RETRY_DELAYS if retry_delays is None \
+            else retry_delays
+        self.down_seconds = down_seconds
+        self.fallback_factory = fallback_factory
+        self.fallback_transformer = None
+        self.fallback_lock = threading.Lock()
+        self.service_down_until = 0.
+
+    def transform(self, sentence: str) -> list:
+        return self.transform_batch([sentence])[0]
+
+    def transform_batch(self, sentences: list[str]) -> list:
+        if not sentences:
+            return []
+
+        if time.monotonic() >= self.service_down_until:
+            try:
+                return self.request_embeddings(sentences)
+            except requests.RequestException as e:
+                print(f'embedding service is not available, using in-process model for '
+                      f'{self.down_seconds}s: {e}')
+                self.service_down_until = time.monotonic() + self.down_seconds
+
+        return self.get_fallback_transformer().transform_batch(sentences)
+
+    def request_embeddings(self, sentences: list[str]) -> list:
+        for delay in self.retry_delays + [None]:
+            try:
+                return self.post_sentences(sentences)
+            except requests.Timeout:
+                # the service is overloaded, waiting longer would not help
+                raise
+            except requests.RequestException as e:
+                if delay is None:
+                    raise
+
+                print(f'embedding service is not available, retrying in {delay}s: {e}')
+                time.sleep(delay)
+
+    def post_sentences(self, sentences: list[str]) -> list:
+        response = requests.post(f'{self.url}/embed', json={'sentences': sentences},
+                                 timeout=EMBEDDING_SERVICE_TIMEOUT)
+        response.raise_for_status()
+        embeddings = np.frombuffer(response.content, dtype=np.float32)\
+            .reshape(len(sentences), -1).copy()
+
+        return list(embeddings)
+
+    def get_fallback_transformer(self) -> TransformerInterface:
+        if self.fallback_transformer is None:
+            with self.fallback_lock:
+                if self.fallback_transformer is None:
+                    self.fallback_transformer = self.fallback_factory()
+
+        return self.fallback_transformer
+
+    def get_name(self) -> str:
+        return TRANSFORMER_NAME
+
+
+@dataclass
+class CachedTransformer(TransformerInterface):
+    """Keeps embeddings of recent sentences, e.g. lines shared by many pages of a website"""
+    transformer: TransformerInterface
+    max_size: int = EMBEDDING_CACHE_SIZE
+    embedding_by_hash: OrderedDict = field(default_factory=OrderedDict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def transform(self, sentence: str) -> list:
+        return self.transform_batch([sentence])[0]
+
+    def transform_batch(self, sentences: list[str]) -> list:
+        sentence_hashes = [hash_string_to_hex(sentence) for sentence in sentences]
+
+        embedding_by_hash = {}
+        with self.lock:
+            for sentence_hash in sentence_hashes:
+                if sentence_hash in self.embedding_by_hash:
+                    self.embedding_by_hash.move_to_end(sentence_hash)
+                    embedding_by_hash[sentence_hash] = self.embedding_by_hash[sentence_hash]
+
+        missing_sentence_by_hash = {
+            sentence_hash: sentence for sentence_hash, sentence in zip(sentence_hashes, sentences)
+            if sentence_hash not in embedding_by_hash}
+        if missing_sentence_by_hash:
+            embeddings = self.transformer.transform_batch(list(missing_sentence_by_hash.values()))
+            embedding_by_hash |= dict(zip(missing_sentence_by_hash.keys(), embeddings))
+
+            with self.lock:
+                for sentence_hash in missing_sentence_by_hash:
+                    self.embedding_by_hash[sentence_hash] = embedding_by_hash[sentence_hash]
+                while len(self.embedding_by_hash) > self.max_size:
+                    self.embedding_by_hash.popitem(last=False)
+
+        return [embedding_by_hash[sentence_hash] for sentence_hash in sentence_hashes]
+
+    def get_name(self) -> str:
+        return self.transformer.get_name()
+
+
 _transformer = None
 _transformer_lock = threading.Lock()
 
@@ -40,6 +175,11 @@ def get_transformer() -> TransformerInterface:
     if _transformer is None:
         with _transformer_lock:
             if _transformer is None:
-                _transformer = CamembertTransformer()
+                embedding_service_url = os.getenv(EMBEDDING_SERVICE_URL_ENV)
+                if embedding_service_url:
+                    transformer = RemoteTransformer(embedding_service_url)
+                else:
+                    transformer = CamembertTransformer()
+                _transformer = CachedTransformer(transformer)
 
     return _transformer
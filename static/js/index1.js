@@ -3,8 +3,8 @@
  *
  * Does not require JQuery.
  */
-function popupChurch(markerName){
-    document.getElementById("map-iframe").contentWindow[markerName].openPopup();
+function popupChurch(churchUuid){
+    markersByChurchUuid[churchUuid].openPopup();
 }
 
 /*
@@ -136,44 +136,21 @@ function toggleDisplayFilters(element) {
 /*
  * Watch map movement.
  *
- * Requires JQuery (to wait for the iframe to be loaded).
+ * Requires JQuery and the search map.
  */
 $(document).ready(function () {
-  let $mapIframe = $('#map-iframe');
-
-  async function getMap() {
-    let mapObjectName = $mapIframe.attr('data-map-name');
-    let map;
-    while (!map) {
-      await new Promise(resolve => setTimeout(resolve, 200));
-      map = document.getElementById("map-iframe").contentWindow[mapObjectName];
-    }
-    return map;
-  }
-
-  async function handleIframeLoaded() {
-    const map = await getMap();
-
-    map.on('moveend', function (evt) {
-      let bounds = map.getBounds();
-      $("#min-lat-input").val(bounds._southWest.lat);
-      $("#min-lng-input").val(bounds._southWest.lng);
-      $("#max-lat-input").val(bounds._northEast.lat);
-      $("#max-lng-input").val(bounds._northEast.lng);
-      $("#search-in-this-area-col").removeClass('d-none');
-    });
+  if (!searchMap) {
+    return;
   }
 
-  // Check if the iframe is already loaded
-  if ($mapIframe.get(0).contentWindow.document.readyState === 'complete') {
-    console.log('iframe already loaded');
-    handleIframeLoaded();
-  } else {
-    // Wait for the iframe to be loaded
-    $mapIframe.load(function () {
-      handleIframeLoaded();
-    });
-  }
+  searchMap.on('moveend', function (evt) {
+    let bounds = searchMap.getBounds();
+    $("#min-lat-input").val(bounds._southWest.lat);
+    $("#min-lng-input").val(bounds._southWest.lng);
+    $("#max-lat-input").val(bounds._northEast.lat);
+    $("#max-lng-input").val(bounds._northEast.lng);
+    $("#search-in-this-area-col").removeClass('d-none');
+  });
 });
 
 /**
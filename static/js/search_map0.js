@@ -0,0 +1,70 @@
+/*
+ * Search map, rendered from the JSON payload of the page.
+ *
+ * Requires Leaflet and Leaflet.awesome-markers.
+ */
+const DEFAULT_ZOOM = 10;
+const TILES_ATTRIBUTION = '<a href="https://jawg.io" title="Tiles Courtesy of Jawg Maps" target="_blank">'
+    + '&copy; <b>Jawg</b>Maps</a> &copy; <a href="https://www.openstreetmap.org/copyright">'
+    + 'OpenStreetMap</a> contributors';
+
+let searchMap = null;
+let markersByChurchUuid = {};
+
+function buildPopupContent(popup, linkWording) {
+  let $content = document.createElement('div');
+
+  let $name = document.createElement('b');
+  $name.textContent = popup.name;
+  $content.appendChild($name);
+
+  popup.lines.forEach(line => {
+    $content.appendChild(document.createElement('br'));
+    $content.appendChild(document.createTextNode(line));
+  });
+
+  let $link = document.createElement('a');
+  $link.href = '#' + popup.website_uuid;
+  $link.textContent = linkWording;
+  $content.appendChild(document.createElement('br'));
+  $content.appendChild($link);
+
+  return $content;
+}
+
+function initSearchMap() {
+  let $mapElement = document.getElementById('search-map');
+  let $payloadElement = document.getElementById('map-payload');
+  if (!$mapElement || !$payloadElement) {
+    return;
+  }
+
+  let payload = JSON.parse($payloadElement.textContent);
+  searchMap = L.map($mapElement).setView(payload.center, DEFAULT_ZOOM);
+  L.tileLayer($mapElement.dataset.tilesUrl, {attribution: TILES_ATTRIBUTION}).addTo(searchMap);
+
+  payload.markers.forEach(markerData => {
+    let marker = L.marker([markerData.latitude, markerData.longitude], {
+      icon: L.AwesomeMarkers.icon({
+        icon: markerData.icon,
+        prefix: 'fa',
+        markerColor: markerData.color,
+        iconColor: 'white',
+      }),
+    }).bindTooltip(markerData.tooltip);
+
+    if (markerData.popup) {
+      marker.bindPopup(buildPopupContent(markerData.popup, payload.link_wording));
+    }
+    if (markerData.church_uuid) {
+      markersByChurchUuid[markerData.church_uuid] = marker;
+    }
+    marker.addTo(searchMap);
+  });
+
+  if (payload.bounds) {
+    searchMap.fitBounds(payload.bounds);
+  }
+}
+
+initSearchMap();
@@ -60,12 +60,10 @@ function activateCopyToClipboard($element) {
 
 function activateSeeChurchOnMap($element) {
     $element.find('.church-container').each(function () {
-        let churchMarkerNames = $(this).closest('.churches-container').data('church-marker-names-json');
         let churchUuid = $(this).data('church-uuid');
-        if (churchUuid in churchMarkerNames) {
-            let churchMarkerName = churchMarkerNames[churchUuid];
+        if (churchUuid in markersByChurchUuid) {
             let $span = $(this).find('.church-name');
-            let $newAnchor = $('<a href="#map" class="link-info" onclick="return popupChurch(\''+ churchMarkerName +'\');"></a>');
+            let $newAnchor = $('<a href="#map" class="link-info" onclick="return popupChurch(\''+ churchUuid +'\');"></a>');
             $span.replaceWith($newAnchor.append($span.clone()));
         }
     });